@@ -0,0 +1,280 @@
+"""JSON/HTTP conversion API over the hub_core tables and formulas.
+
+``app`` is a plain WSGI application, so any WSGI server can host it, e.g.
+``gunicorn -w 4 api:app``. Without one, ``python api.py --workers 4`` serves
+it with the standard library: the listening socket is opened once and shared
+by pre-forked worker processes, each handling requests on a thread pool.
+
+Every batch endpoint takes arrays and returns arrays in one round trip:
+
+    POST /convert            {"category", "from", "to", "values": [...]}  (any unit or affine category)
+    POST /convert/quantity   {"discipline", "section", "quantity", "from", "to", "values": [...]}
+    POST /temperature        {"from", "to", "values": [...]}
+    POST /per-unit           {"quantity", "direction": "to_pu"|"from_pu", "base_mva", "base_kv", "values": [...]}
+    POST /formula            {"discipline", "section", "kind", "name", "units": {name: unit} (optional),
+                              "values": {...} | "records": [{...}] | "columns": {var: [...]}}
+    GET  /units, GET /formulas, GET /health
+    GET  /metrics            per-endpoint latency percentiles (Prometheus text format)
+
+Latency recording is off unless ``--metrics`` (or ``HUB_METRICS=1``) is
+given; each pre-forked worker keeps its own numbers, so ``--metrics-file``
+(with ``{pid}`` in the path) dumps every worker's to its own file.
+"""
+import argparse
+import json
+import math
+import os
+import signal
+import socketserver
+import sys
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from hub_core import (
+    AFFINE_CATEGORIES,
+    ENGINEERING_DATA,
+    TEMPERATURE_UNITS,
+    UNIT_CATEGORIES,
+    base_value,
+    category_units,
+    get_conversion,
+    get_formula,
+    iter_formulas,
+    quantity_factor,
+)
+from hub_core import metrics
+from hub_core.formulas import cached_formula_source
+from hub_core.sandbox import FormulaTimeout, SandboxError, get_formula_safely
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class BadRequest(Exception):
+    """A client error reported as HTTP 400."""
+
+
+def _values(payload):
+    """Returns ``payload["values"]`` as a list of floats, accepting a single number too."""
+    values = payload.get("values", payload.get("value"))
+    if values is None:
+        raise BadRequest("'values' is required.")
+    if isinstance(values, (int, float)):
+        return [float(values)]
+    try:
+        return [float(v) for v in values]
+    except (TypeError, ValueError):
+        raise BadRequest("'values' must be a number or an array of numbers.")
+
+
+def _clean(number):
+    """Maps non-finite floats to None so the response stays valid JSON."""
+    return number if math.isfinite(number) else None
+
+
+def _scale(values, factor):
+    return [_clean(v * factor) for v in values]
+
+
+def _convert(values, conversion):
+    if conversion.is_linear:
+        return {"factor": conversion.scale, "values": _scale(values, conversion.scale)}
+    return {"values": [_clean(conversion(v)) for v in values]}
+
+
+def handle_convert(payload):
+    return _convert(_values(payload), get_conversion(payload["category"], payload["from"], payload["to"]))
+
+
+def handle_convert_quantity(payload):
+    factor = quantity_factor(payload["discipline"], payload["section"], payload["quantity"],
+                             payload["from"], payload["to"])
+    return {"factor": factor, "values": _scale(_values(payload), factor)}
+
+
+def handle_temperature(payload):
+    return {"values": _convert(_values(payload), get_conversion("Temperature", payload["from"], payload["to"]))["values"]}
+
+
+def handle_per_unit(payload):
+    base = base_value(payload["quantity"], float(payload["base_mva"]), float(payload["base_kv"]))
+    direction = payload.get("direction", "to_pu")
+    if direction not in ("to_pu", "from_pu"):
+        raise BadRequest("'direction' must be 'to_pu' or 'from_pu'.")
+    factor = 1.0 / base if direction == "to_pu" else base
+    return {"base": base, "values": _scale(_values(payload), factor)}
+
+
+def handle_formula(payload):
+    units = payload.get("units", {})
+    if not isinstance(units, dict):
+        raise BadRequest("'units' must be an object mapping names to units.")
+    compiled = get_formula_safely(payload["discipline"], payload["section"], payload["kind"], payload["name"],
+                                  tuple(sorted(units.items())))
+    if "values" in payload:
+        return {"result": compiled.result, "value": compiled.evaluate_value(payload["values"])}
+    if "records" in payload:
+        records = payload["records"]
+        columns = {var: [record[var] for record in records] for var in compiled.variables}
+    elif "columns" in payload:
+        columns = payload["columns"]
+    else:
+        raise BadRequest("One of 'values', 'records' or 'columns' is required.")
+    results = compiled.evaluate_batch(columns)
+    return {"result": compiled.result, "values": [_clean(v) for v in results.ravel().tolist()]}
+
+
+def handle_units(_payload):
+    return {
+        "categories": {name: list(category["units"]) for name, category in UNIT_CATEGORIES.items()},
+        "temperature": list(TEMPERATURE_UNITS),
+        "affine": {name: list(category_units(name)) for name in AFFINE_CATEGORIES},
+        "quantities": {
+            discipline: {
+                section: {quantity: list(q["units"]) for quantity, q in data["Physical Quantities"].items()}
+                for section, data in sections.items()
+            }
+            for discipline, sections in ENGINEERING_DATA.items()
+        },
+    }
+
+
+def handle_formulas(_payload):
+    return {"formulas": [
+        {"discipline": discipline, "section": section, "kind": kind, "name": name,
+         "formula": entry["formula"], "variables": entry.get("variables", []),
+         "quantities": dict(entry.get("quantities", {}))}
+        for (discipline, section, kind, name), entry in iter_formulas()
+    ]}
+
+
+ROUTES = {
+    ("POST", "/convert"): handle_convert,
+    ("POST", "/convert/quantity"): handle_convert_quantity,
+    ("POST", "/temperature"): handle_temperature,
+    ("POST", "/per-unit"): handle_per_unit,
+    ("POST", "/formula"): handle_formula,
+    ("GET", "/units"): handle_units,
+    ("GET", "/formulas"): handle_formulas,
+    ("GET", "/health"): lambda _payload: {"status": "ok"},
+}
+
+
+def _respond(start_response, status, body):
+    data = json.dumps(body, ensure_ascii=False, allow_nan=False).encode("utf-8")
+    start_response(status, [("Content-Type", "application/json"), ("Content-Length", str(len(data)))])
+    return [data]
+
+
+def _respond_metrics(start_response):
+    data = metrics.render_text(prefix="hub_api").encode("utf-8")
+    start_response("200 OK", [("Content-Type", "text/plain; version=0.0.4"), ("Content-Length", str(len(data)))])
+    return [data]
+
+
+def app(environ, start_response):
+    """WSGI entry point."""
+    path = environ.get("PATH_INFO", "")
+    if environ["REQUEST_METHOD"] == "GET" and path == "/metrics":
+        return _respond_metrics(start_response)
+    handler = ROUTES.get((environ["REQUEST_METHOD"], path))
+    if handler is None:
+        return _respond(start_response, "404 Not Found", {"error": "Unknown endpoint."})
+    with metrics.timed(path):
+        return _handle(handler, environ, start_response)
+
+
+def _handle(handler, environ, start_response):
+    payload = {}
+    if environ["REQUEST_METHOD"] == "POST":
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        if length > MAX_BODY_BYTES:
+            return _respond(start_response, "413 Payload Too Large", {"error": "Request body too large."})
+        try:
+            payload = json.loads(environ["wsgi.input"].read(length) or b"{}")
+        except ValueError:
+            return _respond(start_response, "400 Bad Request", {"error": "Body must be valid JSON."})
+        if not isinstance(payload, dict):
+            return _respond(start_response, "400 Bad Request", {"error": "Body must be a JSON object."})
+
+    try:
+        return _respond(start_response, "200 OK", handler(payload))
+    except KeyError as e:
+        return _respond(start_response, "400 Bad Request", {"error": f"Unknown or missing key: {e}"})
+    except (BadRequest, ValueError, TypeError, ZeroDivisionError, OverflowError) as e:
+        return _respond(start_response, "400 Bad Request", {"error": str(e)})
+    except FormulaTimeout as e:
+        return _respond(start_response, "503 Service Unavailable", {"error": str(e)})
+    except SandboxError as e:
+        return _respond(start_response, "500 Internal Server Error", {"error": str(e)})
+
+
+def warm_formula_cache():
+    """Compiles every formula up front so forked workers share them copy-on-write.
+
+    The built-in formulas are compiled in this process rather than in the
+    sandbox, so the parent starts no sandbox workers before forking.
+    """
+    for (discipline, section, kind, name), entry in iter_formulas():
+        get_formula(discipline, section, kind, name)  # caches the generated source in this process
+        if cached_formula_source(entry) is None:
+            continue  # no generated source to share; get_formula_safely would need the sandbox
+        compiled = get_formula_safely(discipline, section, kind, name)
+        compiled.evaluate_batch({var: [1.0] for var in compiled.variables})
+
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host, port, workers, metrics_file=None):
+    """Serves ``app`` from ``workers`` pre-forked processes sharing one listening socket."""
+    warm_formula_cache()
+    server = make_server(host, port, app, server_class=ThreadingWSGIServer, handler_class=QuietHandler)
+    print(f"Serving on http://{host}:{port} with {workers} worker(s)", flush=True)
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            children = None
+            break
+        children.append(pid)
+    if metrics_file:
+        metrics.start_dumping(metrics_file)
+    if children is not None:
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for pid in children or []:
+            os.kill(pid, signal.SIGTERM)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Engineering & Science Hub conversion API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--metrics", action="store_true", help="Record per-endpoint latency for GET /metrics.")
+    parser.add_argument("--metrics-file", help="Also dump the metrics to this file every 15 s ({pid} = worker pid).")
+    args = parser.parse_args(argv)
+    if args.metrics or args.metrics_file:
+        metrics.enable()
+    if args.workers > 1 and not hasattr(os, "fork"):
+        print("Pre-forked workers need os.fork; falling back to 1 worker.", file=sys.stderr)
+        args.workers = 1
+    serve(args.host, args.port, args.workers, args.metrics_file)
+
+
+if __name__ == "__main__":
+    main()
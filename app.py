@@ -1,6 +1,41 @@
 import streamlit as st
+import contextlib
+import cProfile
+import functools
+import io
+import marshal
 import math
-import sympy as sp
+import os
+import pstats
+import tempfile
+import time
+
+from hub_core import (
+    AFFINE_CATEGORIES,
+    ENGINEERING_DATA,
+    TEMPERATURE_UNITS,
+    TOOL_KINDS,
+    UNIT_CATEGORIES,
+    Link,
+    Worksheet,
+    base_current,
+    base_impedance,
+    category_units,
+    conversion_factor,
+    convert,
+    convert_temperature,
+    formula_quantities,
+    from_per_unit,
+    quantity_factor,
+    quantity_units,
+    search_units,
+    shared_unit_groups,
+    sweep_values,
+    to_per_unit,
+)
+from hub_core import metrics
+from hub_core.memory import deep_sizeof
+from hub_core.sandbox import FormulaTimeout, SandboxError, evaluate_safely, get_formula_safely
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -11,163 +46,23 @@ st.set_page_config(
 )
 
 # --- DATA & CONSTANTS ---
-UNIT_CATEGORIES = {
-    "Length": {
-        "units": {
-            "Meters (m)": 1.0, "Centimeters (cm)": 0.01, "Millimeters (mm)": 0.001,
-            "Kilometers (km)": 1000.0, "Inches (in)": 0.0254, "Feet (ft)": 0.3048,
-            "Yards (yd)": 0.9144, "Miles (mi)": 1609.34, "Micrometers (µm)": 1e-6,
-            "Nanometers (nm)": 1e-9, "Angstroms (Å)": 1e-10, "Light Years (ly)": 9.461e15
-        }, "icon": "📏"
-    },
-    "Mass": {
-        "units": {
-            "Kilograms (kg)": 1.0, "Grams (g)": 0.001, "Milligrams (mg)": 1e-6,
-            "Tonnes (t)": 1000.0, "Pounds (lb)": 0.453592, "Ounces (oz)": 0.0283495,
-            "Carats (ct)": 0.0002
-        }, "icon": "⚖️"
-    },
-    "Area": {
-        "units": {
-            "Square Meters (m²)": 1.0, "Square Centimeters (cm²)": 1e-4, "Square Kilometers (km²)": 1e6,
-            "Hectares (ha)": 10000.0, "Square Feet (ft²)": 0.092903, "Acres (ac)": 4046.86,
-            "Square Miles (mi²)": 2.59e6
-        }, "icon": "📐"
-    },
-    "Volume": {
-        "units": {
-            "Cubic Meters (m³)": 1.0, "Liters (L)": 0.001, "Milliliters (mL)": 1e-6,
-            "Cubic Centimeters (cm³)": 1e-6, "Cubic Feet (ft³)": 0.0283168,
-            "US Gallons (gal)": 0.00378541, "US Quarts (qt)": 0.000946353
-        }, "icon": "🧊"
-    },
-    "Data": {
-        "units": {
-            "Bits (b)": 1.0, "Bytes (B)": 8.0, "Kilobits (kb)": 1000.0,
-            "Kilobytes (kB)": 8000.0, "Megabits (Mb)": 1e6, "Megabytes (MB)": 8e6,
-            "Gigabits (Gb)": 1e9, "Gigabytes (GB)": 8e9, "Terabits (Tb)": 1e12,
-            "Terabytes (TB)": 8e12
-        }, "icon": "💾"
-    },
-    "Force": {
-        "units": {
-            "Newtons (N)": 1.0, "Kilonewtons (kN)": 1000.0, "Pounds-force (lbf)": 4.44822,
-            "Dynes (dyn)": 1e-5, "Kilogram-force (kgf)": 9.80665
-        }, "icon": "💪"
-    },
-    "Pressure": {
-        "units": {
-            "Pascals (Pa)": 1.0, "Kilopascals (kPa)": 1000.0, "Bar": 100000.0,
-            "Atmospheres (atm)": 101325.0, "Millimeters of Mercury (mmHg)": 133.322,
-            "Pounds per Square Inch (psi)": 6894.76
-        }, "icon": "🎚️"
-    },
-    "Energy": {
-        "units": {
-            "Joules (J)": 1.0, "Kilojoules (kJ)": 1000.0, "Calories (cal)": 4.184,
-            "Kilocalories (kcal)": 4184.0, "Watt-hours (Wh)": 3600.0,
-            "Kilowatt-hours (kWh)": 3.6e6, "Electronvolts (eV)": 1.60218e-19,
-            "British Thermal Unit (BTU)": 1055.06
-        }, "icon": "🔋"
-    },
-    "Power": {
-        "units": {
-            "Watts (W)": 1.0, "Kilowatts (kW)": 1000.0, "Megawatts (MW)": 1e6,
-            "Horsepower (hp)": 745.7, "BTU/hour": 0.293071
-        }, "icon": "⚡"
-    },
-    "Voltage": {
-        "units": { "Volts (V)": 1.0, "Millivolts (mV)": 0.001, "Kilovolts (kV)": 1000.0 },
-        "icon": "⚡"
-    },
-    "Electric Current": {
-        "units": { "Amperes (A)": 1.0, "Milliamperes (mA)": 0.001, "Kiloamperes (kA)": 1000.0 },
-        "icon": "🔌"
-    },
-    "Resistance": {
-        "units": { "Ohms (Ω)": 1.0, "Kiloohms (kΩ)": 1000.0, "Megaohms (MΩ)": 1e6 },
-        "icon": "🔩"
-    },
-    "Frequency": {
-        "units": { "Hertz (Hz)": 1.0, "Kilohertz (kHz)": 1000.0, "Megahertz (MHz)": 1e6, "Gigahertz (GHz)": 1e9 },
-        "icon": "🎵"
-    },
-}
-
-# --- ENGINEERING DATA WITH UNITS AND DYNAMIC FORMULAS ---
-ENGINEERING_DATA = {
-    "Chemical": {
-        "Heat Transfer": {
-            "Physical Quantities": {
-                "Heat Flux": {"units": {"W/m²": 1.0, "cal/cm²·s": 0.0239, "Btu/ft²·h": 0.3171}, "icon": "🔥"},
-                "Heat Transfer Rate": {"units": {"W": 1.0, "cal/s": 0.2388, "Btu/h": 3.412}, "icon": "🔥"},
-                "Thermal Conductivity": {"units": {"W/m·K": 1.0, "cal/cm·s·K": 0.0002388, "Btu/ft·h·F": 0.5778}, "icon": "🌡️"},
-                "Specific Heat Capacity": {"units": {"J/kg·K": 1.0, "cal/g·K": 0.239, "Btu/lb·F": 0.239}, "icon": "🌡️"},
-                "Thermal Diffusivity": {"units": {"m²/s": 1.0, "cm²/s": 1e4, "ft²/h": 1.076e-4}, "icon": "🌡️"},
-                "Temperature Gradient": {"units": {"K/m": 1.0, "C/cm": 100.0, "F/ft": 1.8}, "icon": "🌡️"},
-                "Convection Coefficient": {"units": {"W/m²·K": 1.0, "cal/cm²·s·C": 0.0239, "Btu/ft²·h·F": 0.3171}, "icon": "🌡️"},
-                "Emissivity": {"units": {"-": 1.0}, "icon": "🌡️"},
-                "Area": {"units": {"m²": 1.0, "cm²": 1e4, "ft²": 10.764}, "icon": "📐"},
-                "Mass Flow Rate": {"units": {"kg/s": 1.0, "g/s": 1000.0, "lb/h": 7936.64}, "icon": "⚗️"},
-                "Latent Heat": {"units": {"kJ/kg": 1.0, "cal/g": 0.239, "Btu/lb": 0.4299}, "icon": "🔥"},
-                "Temperature Difference": {"units": {"K": 1.0, "C": 1.0, "F": 1.8}, "icon": "🌡️"}
-            },
-            "Laws": {
-                "Fourier's Law": {"formula": "q = -k * A * dT_dx", "unit": "W", "variables": ["k", "A", "dT_dx"], "description": "Describes heat conduction."},
-                "Newton's Law of Cooling": {"formula": "Q = h * A * (Ts - T_inf)", "unit": "W", "variables": ["h", "A", "Ts", "T_inf"], "description": "Describes heat transfer by convection."},
-                "Stefan-Boltzmann Law": {"formula": "P = ε * σ * A * T**4", "unit": "W", "variables": ["ε", "σ", "A", "T"], "description": "Describes heat radiation. σ is the Stefan-Boltzmann constant (5.67e-8 W/m²K⁴)."},
-                "LMTD": {"formula": "LMTD = (deltaT1 - deltaT2) / log(deltaT1 / deltaT2)", "unit": "K", "variables": ["deltaT1", "deltaT2"], "description": "Log Mean Temperature Difference for heat exchangers."}
-            },
-            "Dimensionless Numbers": {
-                "Nusselt Number": {"formula": "h * L / k", "variables": ["h", "L", "k"]},
-                "Biot Number": {"formula": "h * Lc / k", "variables": ["h", "Lc", "k"]},
-                "Prandtl Number": {"formula": "ν / α", "variables": ["ν", "α"]},
-            }
-        },
-        "Mass Transfer": {
-            "Physical Quantities": {
-                "Mass Flux": {"units": {"kg/m²·s": 1.0, "g/cm²·s": 0.1, "lb/ft²·s": 0.2048}, "icon": "⚗️"},
-                "Diffusion Coefficient": {"units": {"m²/s": 1.0, "cm²/s": 1e4, "ft²/h": 1.076e-4}, "icon": "⚗️"},
-                "Concentration Gradient": {"units": {"kg/m³·m": 1.0, "g/cm³·cm": 0.001, "lb/ft³·ft": 0.0624}, "icon": "⚗️"},
-                "Mass Transfer Coefficient": {"units": {"m/s": 1.0, "cm/s": 100.0, "ft/h": 1.076}, "icon": "⚗️"},
-                "Concentration": {"units": {"kg/m³": 1.0, "g/cm³": 0.001, "lb/ft³": 0.0624}, "icon": "⚗️"},
-                "Density": {"units": {"kg/m³": 1.0, "g/cm³": 0.001, "lb/ft³": 0.0624}, "icon": "⚗️"},
-            },
-            "Laws": {
-                "Fick's First Law": {"formula": "J = -D * dC_dx", "unit": "kg/m²·s", "variables": ["D", "dC_dx"], "description": "Describes molecular diffusion."},
-                "Henry's Law": {"formula": "p = H * xA", "unit": "Pa", "variables": ["H", "xA"], "description": "Relates partial pressure to mole fraction in a liquid."}
-            },
-            "Dimensionless Numbers": {
-                "Sherwood Number": {"formula": "k * L / D", "variables": ["k", "L", "D"]},
-                "Schmidt Number": {"formula": "ν / D", "variables": ["ν", "D"]},
-                "Peclet Number": {"formula": "V * L / D", "variables": ["V", "L", "D"]},
-            }
-        },
-    },
-    "Electrical": {
-        "Circuit": {
-            "Physical Quantities": {
-                "Voltage": {"units": {"V": 1.0, "mV": 0.001, "kV": 1000.0}, "icon": "⚡"},
-                "Current": {"units": {"A": 1.0, "mA": 0.001, "kA": 1000.0}, "icon": "⚡"},
-                "Resistance": {"units": {"Ω": 1.0, "kΩ": 1000.0, "MΩ": 1e6}, "icon": "⚡"},
-                "Power": {"units": {"W": 1.0, "kW": 1000.0, "MW": 1e6}, "icon": "⚡"},
-                "Energy": {"units": {"J": 1.0, "kWh": 3.6e6, "cal": 4.184}, "icon": "⚡"},
-                "Capacitance": {"units": {"F": 1.0, "µF": 1e-6, "pF": 1e-12}, "icon": "⚡"},
-                "Inductance": {"units": {"H": 1.0, "mH": 0.001, "µH": 1e-6}, "icon": "⚡"},
-                "Frequency": {"units": {"Hz": 1.0, "kHz": 1000.0, "MHz": 1e6}, "icon": "⚡"}
-            },
-            "Laws": {
-                "Ohm's Law": {"formula": "V = I * R", "unit": "V", "variables": ["I", "R"], "description": "Relates voltage, current, and resistance."},
-                "Power Law": {"formula": "P = V * I", "unit": "W", "variables": ["V", "I"], "description": "Calculates power in a DC circuit."},
-                "Capacitor Energy": {"formula": "E = 0.5 * C * V**2", "unit": "J", "variables": ["C", "V"], "description": "Energy stored in a capacitor."},
-                "Inductor Energy": {"formula": "E = 0.5 * L * I**2", "unit": "J", "variables": ["L", "I"], "description": "Energy stored in an inductor."}
-            },
-            "Dimensionless Numbers": {
-                "Quality Factor (Q)": {"formula": "ω * L / R", "variables": ["ω", "L", "R"]},
-                "Power Factor": {"formula": "cos(phi)", "variables": ["phi"]},
-            }
-        }
-    }
+MAX_SWEEP_POINTS = 20_000_000
+MAX_MC_SAMPLES = 20_000_000
+MAX_TABLE_CELLS = 2_000_000
+SWEEP_CHART_POINTS = 2000
+SWEEP_CHART_SERIES = 8
+PROFILE_TOP_FUNCTIONS = 30
+SEARCH_RESULTS = 8
+# Server-side files for the bulk converter; the mode is off unless this root is configured.
+BULK_ROOT = os.path.realpath(os.environ["HUB_BULK_ROOT"]) if os.environ.get("HUB_BULK_ROOT") else None
+# The sidebar performance panel (metrics, rerun profiler) is for operators only.
+DEBUG_PANEL = os.environ.get("HUB_DEBUG", "") not in ("", "0")
+SESSION_MEMORY_BUDGET = int(float(os.environ.get("HUB_SESSION_BUDGET_MB", 16)) * 1024 * 1024)
+# Session state that can be rebuilt on a later rerun, with its companion keys;
+# dropped (largest first) when a session goes over SESSION_MEMORY_BUDGET.
+EVICTABLE_STATE = {
+    "profile_stats": ("profile_stats", "profile_summary"),
+    "pu_network": ("pu_network", "pu_network_key"),
 }
 
 # --- STYLES ---
@@ -220,11 +115,129 @@ def load_css():
     </style>
     """, unsafe_allow_html=True)
 
+# --- INSTRUMENTATION ---
+def instrumented(name):
+    """Records each call of the decorated renderer under metric ``name``, fragment-only reruns included."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics.timed(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def metric_name(label):
+    """ASCII, snake_case metric name for a UI label such as an ``app_mode``."""
+    return label.encode("ascii", "ignore").decode().strip().replace(" ", "_").lower()
+
+
+def render_debug_panel(session_bytes):
+    """Renders the sidebar performance panel: live percentiles, session size and the rerun profiler.
+
+    Metrics recording is process-wide, so it is only reported here and set
+    with ``HUB_METRICS`` at startup, never from a session's widget.
+    """
+    with st.sidebar.expander("🛠️ Performance", expanded=True):
+        st.caption(f"Session state: {session_bytes / 1024:,.0f} KiB of {SESSION_MEMORY_BUDGET / 1024:,.0f} KiB")
+        stats = metrics.snapshot()
+        if not metrics.is_enabled():
+            st.caption("Metrics recording is off (start with HUB_METRICS=1).")
+        elif stats:
+            st.dataframe(metrics_rows(stats), hide_index=True)
+        else:
+            st.caption("No samples yet.")
+
+        st.button("Profile Next Rerun", key="perf_profile",
+                  on_click=lambda: st.session_state.update(profile_next_rerun=True))
+        if "profile_stats" in st.session_state:
+            st.code(st.session_state["profile_summary"], language=None)
+            st.download_button("Download Profile (.prof)", st.session_state["profile_stats"],
+                               file_name="rerun.prof", mime="application/octet-stream",
+                               on_click="ignore", key="perf_profile_dl")
+
+
+def metrics_rows(stats):
+    """Percentile table rows in milliseconds for :func:`render_debug_panel`."""
+    return [{"metric": name, "count": entry["count"],
+             **{q: round(entry[q] * 1000, 3) for q in ("p50", "p90", "p99")}}
+            for name, entry in stats.items()]
+
+
+def store_profile(profiler):
+    """Keeps a finished rerun profile in the session: raw stats for download plus a text summary."""
+    profiler.create_stats()
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+    st.session_state["profile_stats"] = marshal.dumps(profiler.stats)
+    st.session_state["profile_summary"] = summary.getvalue()
+
+
+def enforce_session_budget():
+    """Keeps this session's own state under ``SESSION_MEMORY_BUDGET``; returns its size in bytes.
+
+    Unit tables and compiled formulas are shared by the process and not
+    counted. Rebuildable entries (``EVICTABLE_STATE``) are dropped largest
+    first until the session fits.
+    """
+    state = st.session_state
+    sizes = {key: deep_sizeof(state[key]) for key in list(state.keys())}
+    total = sum(sizes.values())
+    for key in sorted((key for key in EVICTABLE_STATE if key in sizes), key=sizes.get, reverse=True):
+        if total <= SESSION_MEMORY_BUDGET:
+            break
+        for dropped in EVICTABLE_STATE[key]:
+            total -= sizes.get(dropped, 0)
+            state.pop(dropped, None)
+    if total > SESSION_MEMORY_BUDGET:
+        st.sidebar.warning(f"This session holds {total / 2**20:.1f} MiB (budget {SESSION_MEMORY_BUDGET / 2**20:.0f} MiB); "
+                           "clear the worksheet or reload the page to free memory.")
+    return total
+
+
+# --- UNIT SEARCH ---
+def jump_to(hit):
+    """Button callback: points the navigation widgets at the converter holding ``hit``."""
+    state = st.session_state
+    if hit.kind in ("category", "unit"):
+        state["app_mode"] = "General Unit Converter"
+        state["unit_category"] = hit.path[0]
+        if hit.kind == "unit":
+            state[f"from_{hit.path[0]}"] = hit.unit
+    elif hit.kind == "temperature":
+        state["app_mode"] = "🌡️ Temperature"
+        state["from_temp"] = hit.unit
+    else:
+        discipline, section, quantity = hit.path[:3]
+        state["app_mode"] = "🧪⚡ Engineering Calculators"
+        state["eng_discipline"] = discipline
+        state[f"eng_section_{discipline}"] = section
+        state["eng_tool_type"] = "Physical Quantity"
+        state[f"eng_quantity_{discipline}_{section}"] = quantity
+        if hit.kind == "quantity_unit":
+            state[f"eng_from_{discipline}_{section}_{quantity}"] = hit.unit
+
+
+def render_unit_search():
+    """Renders the sidebar search box; each result is a button that opens its converter."""
+    query = st.sidebar.text_input("🔍 Find a Unit", key="unit_search", placeholder="psi, btu/h, W/m²K ...")
+    if not query:
+        return
+    hits = search_units(query, limit=SEARCH_RESULTS)
+    if not hits:
+        st.sidebar.caption("No matching unit or quantity.")
+    for i, hit in enumerate(hits):
+        st.sidebar.button(hit.label, key=f"search_hit_{i}", on_click=jump_to, args=(hit,),
+                          use_container_width=True)
+
+
 # --- CONVERTER FUNCTIONS ---
 
+@st.fragment
+@instrumented("fragment.standard_converter")
 def render_standard_converter(category_name):
-    """Renders the UI for standard unit conversions."""
-    category = UNIT_CATEGORIES.get(category_name)
+    """Renders the UI for standard unit conversions, offset and level units (``AFFINE_CATEGORIES``) included."""
+    category = UNIT_CATEGORIES.get(category_name) or AFFINE_CATEGORIES.get(category_name)
     if not category:
         st.error(f"Category '{category_name}' not found.")
         return
@@ -232,7 +245,9 @@ def render_standard_converter(category_name):
     icon = category["icon"]
     st.header(f"{icon} {category_name} Converter")
 
-    units = list(category["units"].keys())
+    if "description" in category:
+        st.caption(category["description"])
+    units = category_units(category_name)
     
     col1, col2, col3 = st.columns([2, 1, 2])
 
@@ -248,8 +263,7 @@ def render_standard_converter(category_name):
     
     if from_unit and to_unit and value is not None:
         try:
-            base_value = value * category["units"][from_unit]
-            result = base_value / category["units"][to_unit]
+            result = convert(value, category_name, from_unit, to_unit)
 
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
             st.markdown(f'<p class="result-text">{value:.4f} {from_unit} = {result:.6g} {to_unit}</p>', unsafe_allow_html=True)
@@ -257,12 +271,19 @@ def render_standard_converter(category_name):
         except (ZeroDivisionError, KeyError):
             st.error("Invalid units selected.")
 
+    if category_name in UNIT_CATEGORIES:
+        from hub_core.matrix import category_matrix
 
+        render_conversion_table(category_matrix(category_name), key=metric_name(category_name))
+
+
+@st.fragment
+@instrumented("fragment.temperature_converter")
 def render_temperature_converter():
     """Renders the UI for temperature conversion."""
     st.header("🌡️ Temperature Converter")
     
-    temp_units = ["Celsius (°C)", "Fahrenheit (°F)", "Kelvin (K)"]
+    temp_units = list(TEMPERATURE_UNITS)
     
     col1, col2, col3 = st.columns([2, 1, 2])
     
@@ -276,27 +297,27 @@ def render_temperature_converter():
     with col3:
         to_unit = st.selectbox("To Unit", temp_units, index=1, key="to_temp")
 
-    if from_unit == to_unit:
-        result = value
-    else:
-        if from_unit == "Fahrenheit (°F)":
-            celsius = (value - 32) * 5.0 / 9.0
-        elif from_unit == "Kelvin (K)":
-            celsius = value - 273.15
-        else:
-            celsius = value
-        
-        if to_unit == "Fahrenheit (°F)":
-            result = (celsius * 9.0 / 5.0) + 32
-        elif to_unit == "Kelvin (K)":
-            result = celsius + 273.15
-        else:
-            result = celsius
-            
+    result = convert_temperature(value, from_unit, to_unit)
+
     st.markdown('<div class="result-box">', unsafe_allow_html=True)
     st.markdown(f'<p class="result-text">{value:.2f} {from_unit} = {result:.2f} {to_unit}</p>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+    with st.expander("Batch Conversion"):
+        text = st.text_area("Temperatures (comma- or line-separated)", key="temp_batch")
+        if text.strip():
+            import numpy as np
+            import pandas as pd
+
+            try:
+                values = np.array(text.replace(",", " ").split(), dtype=float)
+            except ValueError:
+                st.error("Enter numbers only.")
+            else:
+                st.dataframe(pd.DataFrame({f"From: {from_unit}": values,
+                                           f"To: {to_unit}": convert_temperature(values, from_unit, to_unit)}),
+                             hide_index=True)
+
 def render_bmi_calculator():
     """Renders the UI for BMI calculation."""
     st.header("🏋️ Body Mass Index (BMI) Calculator")
@@ -346,11 +367,144 @@ def render_bmi_calculator():
             st.error("Please enter valid weight and height.")
 
 
+def bulk_server_path(path):
+    """Resolves ``path`` under ``BULK_ROOT``; raises ``ValueError`` for anything outside it."""
+    resolved = os.path.realpath(os.path.join(BULK_ROOT, path))
+    if os.path.commonpath([resolved, BULK_ROOT]) != BULK_ROOT:
+        raise ValueError(f"'{path}' is outside the server file directory.")
+    return resolved
+
+
+def render_bulk_converter():
+    """Renders the UI for streaming conversion of a column in a CSV or Parquet file."""
+    from hub_core.bulk import DEFAULT_CHUNK_ROWS, convert_file, detect_format, list_columns
+
+    st.header("📂 Bulk File Converter")
+    st.info("Converts one column of a CSV or Parquet file chunk by chunk, so files of any size use bounded memory.")
+
+    table = st.radio("Unit Table", ["General Units", "Engineering Quantities"], horizontal=True, key="bulk_table")
+    if table == "General Units":
+        category = st.selectbox("Category", UNIT_CATEGORIES.names, key="bulk_category")
+        units = UNIT_CATEGORIES[category]["units"]
+    else:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            discipline = st.selectbox("Discipline", ENGINEERING_DATA.names, key="bulk_discipline")
+        with col2:
+            section = st.selectbox("Section", ENGINEERING_DATA[discipline].names, key="bulk_section")
+        with col3:
+            quantities = ENGINEERING_DATA[discipline][section]["Physical Quantities"]
+            quantity = st.selectbox("Physical Quantity", quantities.names, key="bulk_quantity")
+        units = quantities[quantity]["units"]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        from_unit = st.selectbox("From Unit", units.names, key="bulk_from")
+    with col2:
+        to_unit = st.selectbox("To Unit", units.names, index=min(1, len(units) - 1), key="bulk_to")
+
+    if table == "General Units":
+        factor = conversion_factor(category, from_unit, to_unit)
+    else:
+        factor = quantity_factor(discipline, section, quantity, from_unit, to_unit)
+    st.caption(f"1 {from_unit} = {factor:.6g} {to_unit}")
+
+    input_modes = ["Upload", "Server File Path"] if BULK_ROOT else ["Upload"]
+    input_mode = st.radio("Input", input_modes, horizontal=True, key="bulk_input")
+    if input_mode == "Upload":
+        uploaded = st.file_uploader("CSV or Parquet file", type=["csv", "parquet", "pq"], key="bulk_upload")
+        if uploaded is None:
+            return
+        source, file_format = uploaded, detect_format(uploaded.name)
+    else:
+        source = st.text_input(f"Input file path (under {BULK_ROOT})", key="bulk_src_path")
+        destination_path = st.text_input(f"Output file path (under {BULK_ROOT})", key="bulk_dst_path")
+        if not source or not destination_path:
+            return
+        try:
+            source, destination_path = bulk_server_path(source), bulk_server_path(destination_path)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        if not os.path.isfile(source):
+            st.error(f"File not found: {source}")
+            return
+        if os.path.exists(destination_path) and os.path.samefile(source, destination_path):
+            st.error("The output file must not be the input file.")
+            return
+        file_format = detect_format(source)
+
+    try:
+        columns = list_columns(source, file_format)
+    except Exception as e:
+        st.error(f"Could not read file header: {e}")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        column = st.selectbox("Column to Convert", columns, key="bulk_column")
+    with col2:
+        output_column = st.text_input("Output Column (blank = replace)", value=f"{column} [{to_unit}]",
+                                      key=f"bulk_out_col_{column}_{to_unit}")
+    with col3:
+        chunk_rows = st.number_input("Rows per Chunk", min_value=1000, value=DEFAULT_CHUNK_ROWS, step=10000, key="bulk_chunk")
+
+    if not st.button("Convert File", key="bulk_convert"):
+        return
+
+    # Written to a temporary file first; a server path is only replaced once the conversion completed.
+    suffix = ".parquet" if file_format == "Parquet" else ".csv"
+    directory = os.path.dirname(destination_path) if input_mode != "Upload" else None
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=directory, delete=False) as tmp:
+        destination = tmp.name
+
+    try:
+        progress_bar = st.progress(0.0, text="Converting...")
+        total_bytes = uploaded.size if input_mode == "Upload" else os.path.getsize(source)
+        progress = None
+        try:
+            with (open(source, "rb") if input_mode != "Upload" else contextlib.nullcontext(source)) as handle:
+                for progress in convert_file(handle, destination, file_format, column, factor,
+                                             output_column or None, int(chunk_rows)):
+                    fraction = min(handle.tell() / total_bytes, 1.0) if total_bytes else 1.0
+                    progress_bar.progress(fraction,
+                                          text=f"{progress.rows:,} rows · {progress.rows_per_sec:,.0f} rows/s")
+        except Exception as e:
+            st.error(f"Conversion failed: {e}")
+            return
+        progress_bar.progress(1.0, text="Done")
+
+        if progress is None or not progress.rows:
+            st.warning("The file has no data rows: 0 rows converted, no output written.")
+            return
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows", f"{progress.rows:,}")
+        col2.metric("Chunks", f"{progress.chunks:,}")
+        col3.metric("Rows/sec", f"{progress.rows_per_sec:,.0f}")
+
+        if input_mode == "Upload":
+            with open(destination, "rb") as f:
+                st.download_button("Download Converted File", f, file_name=f"converted_{uploaded.name}",
+                                   on_click="ignore", key="bulk_download")
+        else:
+            os.replace(destination, destination_path)
+            st.success(f"Wrote {destination_path}")
+    finally:
+        if os.path.exists(destination):
+            os.remove(destination)
+
+
+@st.fragment
+@instrumented("fragment.per_unit_calculator")
 def render_per_unit_calculator():
     """Renders the UI for Per Unit calculations in electrical engineering."""
     st.header("⚡ Per-Unit (PU) System Calculator")
     st.info("A tool for power system analysis. All calculations assume a three-phase system.")
-    
+
+    if st.radio("Mode", ["Single Value", "Network"], horizontal=True, key="pu_mode") == "Network":
+        render_per_unit_network()
+        return
+
     st.subheader("System Base Values")
     col1, col2 = st.columns(2)
     with col1:
@@ -359,8 +513,8 @@ def render_per_unit_calculator():
         base_kv = st.number_input("Base Voltage (V_base, Line-to-Line)", min_value=0.1, value=13.8, format="%.2f")
 
     if base_mva > 0 and base_kv > 0:
-        z_base = (base_kv ** 2) / base_mva
-        i_base = (base_mva * 1000) / (math.sqrt(3) * base_kv)
+        z_base = base_impedance(base_mva, base_kv)
+        i_base = base_current(base_mva, base_kv)
         
         with st.expander("Derived Base Values", expanded=True):
             st.metric(label="Base Impedance (Z_base)", value=f"{z_base:.4f} Ω")
@@ -376,17 +530,17 @@ def render_per_unit_calculator():
         
         if param_type == "Impedance (Ω)":
             actual_val = st.number_input("Actual Impedance (Z_actual) in Ω", value=z_base*0.05 if 'z_base' in locals() else 5.0, format="%.4f")
-            pu_val = actual_val / z_base if 'z_base' in locals() and z_base > 0 else 0
+            pu_val = to_per_unit(actual_val, "Impedance", base_mva, base_kv)
             st.success(f"Per-Unit Impedance = {pu_val:.6f} pu")
             
         elif param_type == "Current (A)":
             actual_val = st.number_input("Actual Current (I_actual) in A", value=i_base if 'i_base' in locals() else 10.0, format="%.4f")
-            pu_val = actual_val / i_base if 'i_base' in locals() and i_base > 0 else 0
+            pu_val = to_per_unit(actual_val, "Current", base_mva, base_kv)
             st.success(f"Per-Unit Current = {pu_val:.6f} pu")
             
         elif param_type == "Voltage (kV)":
             actual_val = st.number_input("Actual Voltage (V_actual) in kV (L-L)", value=base_kv if 'base_kv' in locals() else 13.8, format="%.4f")
-            pu_val = actual_val / base_kv if 'base_kv' in locals() and base_kv > 0 else 0
+            pu_val = to_per_unit(actual_val, "Voltage", base_mva, base_kv)
             st.success(f"Per-Unit Voltage = {pu_val:.6f} pu")
 
     else:
@@ -395,127 +549,601 @@ def render_per_unit_calculator():
 
         if param_type == "Impedance (pu)":
             pu_val = st.number_input("Per-Unit Impedance (Z_pu)", value=0.05, format="%.6f")
-            actual_val = pu_val * z_base if 'z_base' in locals() else 0
+            actual_val = from_per_unit(pu_val, "Impedance", base_mva, base_kv)
             st.success(f"Actual Impedance = {actual_val:.4f} Ω")
 
         elif param_type == "Current (pu)":
             pu_val = st.number_input("Per-Unit Current (I_pu)", value=1.0, format="%.6f")
-            actual_val = pu_val * i_base if 'i_base' in locals() else 0
+            actual_val = from_per_unit(pu_val, "Current", base_mva, base_kv)
             st.success(f"Actual Current = {actual_val:.4f} A")
 
         elif param_type == "Voltage (pu)":
             pu_val = st.number_input("Per-Unit Voltage (V_pu)", value=1.0, format="%.6f")
-            actual_val = pu_val * base_kv if 'base_kv' in locals() else 0
+            actual_val = from_per_unit(pu_val, "Voltage", base_mva, base_kv)
             st.success(f"Actual Voltage = {actual_val:.4f} kV (L-L)")
 
 
+def render_per_unit_network():
+    """Renders the network mode: per-unit conversion of whole bus and branch tables."""
+    import numpy as np
+    import pandas as pd
+
+    from hub_core.network import PerUnitNetwork
+
+    st.caption("Bus CSV: `bus`, optional `voltage_kv`/`current_a`. Branch CSV: `from_bus`, `to_bus`, "
+               "`r_ohm`, `x_ohm`, optional `current_a`, and `from_kv`/`to_kv` for transformers "
+               "(impedance referred to the from side). Blank `*_kv` marks a line.")
+    col1, col2 = st.columns(2)
+    with col1:
+        bus_file = st.file_uploader("Bus table (CSV)", type=["csv"], key="pu_bus_file")
+    with col2:
+        branch_file = st.file_uploader("Branch table (CSV)", type=["csv"], key="pu_branch_file")
+    if bus_file is None or branch_file is None:
+        return
+    buses, branches = pd.read_csv(bus_file), pd.read_csv(branch_file)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        base_mva = st.number_input("Base MVA (S_base)", min_value=0.1, value=100.0, format="%.2f", key="pu_net_mva")
+    with col2:
+        reference_bus = st.selectbox("Reference Bus", buses["bus"].tolist(), key="pu_net_ref_bus")
+    with col3:
+        reference_kv = st.number_input("Reference Base kV", min_value=0.1, value=230.0, format="%.2f",
+                                       key="pu_net_ref_kv")
+
+    # The network (zones, transformer walk, cached base arrays) survives reruns;
+    # base changes are applied to it incrementally instead of rebuilding it.
+    network_key = (bus_file.file_id, branch_file.file_id, reference_bus, reference_kv)
+    if st.session_state.get("pu_network_key") != network_key:
+        try:
+            network = PerUnitNetwork.from_tables(buses, branches, base_mva, {reference_bus: reference_kv})
+        except (KeyError, ValueError) as e:
+            st.error(f"Could not build the network: {e}")
+            return
+        st.session_state["pu_network_key"] = network_key
+        st.session_state["pu_network"] = network
+    network = st.session_state["pu_network"]
+    network.set_base_mva(base_mva)
+
+    st.subheader(f"Voltage Zones ({network.n_zones})")
+    zones = pd.DataFrame({"zone": np.arange(network.n_zones),
+                          "buses": np.bincount(network.bus_zone, minlength=network.n_zones),
+                          "base_kv": network.zone_base_kv.copy()})
+    edited = st.data_editor(zones, disabled=["zone", "buses"], hide_index=True, key="pu_net_zones")
+    edited_kv = edited["base_kv"].to_numpy(dtype=float)
+    for zone in np.flatnonzero((edited_kv != network.zone_base_kv) & (edited_kv > 0)):
+        network.set_zone_base(zone, edited_kv[zone])
+
+    direction = st.radio("Direction", ["to_pu", "from_pu"], horizontal=True, key="pu_net_direction",
+                         format_func=lambda d: "Actual → Per-Unit" if d == "to_pu" else "Per-Unit → Actual")
+    for element, table in (("bus", buses), ("branch", branches)):
+        converted = network.convert_table(table, element, direction)
+        st.markdown(f"**{element.title()} Results** ({len(converted):,} rows)")
+        st.dataframe(converted.head(1000), hide_index=True)
+        st.download_button(f"Download {element} table", converted.to_csv(index=False).encode("utf-8"),
+                           file_name=f"{element}_{direction}.csv", mime="text/csv",
+                           on_click="ignore", key=f"pu_net_dl_{element}")
+
+
+def render_formula_sweep(compiled, unit, key):
+    """Renders the sweep/batch mode for a compiled Law or Dimensionless Number.
+
+    The formula is evaluated over the whole grid of swept variables in one
+    vectorized NumPy call.
+    """
+    import numpy as np
+    import pandas as pd
+
+    st.subheader("Parameter Sweep")
+    swept = st.multiselect("Variables to Sweep", list(compiled.variables),
+                           default=list(compiled.variables[:1]), key=f"sweep_vars_{key}")
+
+    axes_spec = {}
+    for var in swept:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            start = st.number_input(f"**{var}** start", value=1.0, key=f"sweep_start_{key}_{var}")
+        with col2:
+            stop = st.number_input(f"**{var}** stop", value=10.0, key=f"sweep_stop_{key}_{var}")
+        with col3:
+            num = st.number_input(f"**{var}** points", min_value=2, max_value=MAX_SWEEP_POINTS,
+                                  value=100, step=1, key=f"sweep_num_{key}_{var}")
+        with col4:
+            scale = st.selectbox(f"**{var}** scale", ["Linear", "Log"], key=f"sweep_scale_{key}_{var}")
+        axes_spec[var] = (start, stop, int(num), scale)
+
+    fixed = {}
+    fixed_vars = [var for var in compiled.variables if var not in swept]
+    if fixed_vars:
+        st.markdown("**Fixed Variables**")
+        for var in fixed_vars:
+            fixed[var] = st.number_input(f"Enter value for **{var}**", value=1.0, key=f"sweep_fixed_{key}_{var}")
+
+    total_points = math.prod(spec[2] for spec in axes_spec.values())
+    st.caption(f"Grid size: {total_points:,} points")
+
+    if not swept:
+        st.warning("Select at least one variable to sweep.")
+        return
+    if total_points > MAX_SWEEP_POINTS:
+        st.error(f"Grid too large: {total_points:,} points (limit {MAX_SWEEP_POINTS:,}).")
+        return
+
+    if st.button("Run Sweep", key=f"sweep_run_{key}"):
+        try:
+            axes = {var: sweep_values(*spec) for var, spec in axes_spec.items()}
+            start_time = time.perf_counter()
+            result = compiled.evaluate_grid(fixed, axes)
+            elapsed = time.perf_counter() - start_time
+            metrics.record("formula.evaluate_grid", elapsed)
+        except Exception as e:
+            st.error(f"Error: {e}. Please check the sweep ranges.")
+            return
+
+        finite = result[np.isfinite(result)]
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Points", f"{result.size:,}")
+        col2.metric("Eval Time", f"{elapsed * 1000:.2f} ms")
+        col3.metric(f"Min {unit}", f"{finite.min():.6g}" if finite.size else "n/a")
+        col4.metric(f"Max {unit}", f"{finite.max():.6g}" if finite.size else "n/a")
+
+        if len(swept) == 1:
+            step = max(1, result.size // SWEEP_CHART_POINTS)
+            chart = pd.DataFrame({compiled.result: result[::step]}, index=axes[swept[0]][::step])
+            chart.index.name = swept[0]
+            st.line_chart(chart)
+        elif len(swept) == 2:
+            # One line per sampled value of the second variable.
+            step = max(1, len(axes[swept[0]]) // SWEEP_CHART_POINTS)
+            series_step = max(1, len(axes[swept[1]]) // SWEEP_CHART_SERIES)
+            chart = pd.DataFrame(
+                {f"{swept[1]}={v:.4g}": result[::step, j]
+                 for j, v in list(enumerate(axes[swept[1]]))[::series_step]},
+                index=axes[swept[0]][::step],
+            )
+            chart.index.name = swept[0]
+            st.line_chart(chart)
+        else:
+            st.info("Charts are shown for one or two swept variables; download the array for the full grid.")
+
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, result=result, **{f"axis_{var}": axes[var] for var in swept})
+        st.download_button("Download Array (.npz)", buffer.getvalue(), file_name=f"{key}_sweep.npz",
+                           mime="application/octet-stream", on_click="ignore", key=f"sweep_dl_{key}")
+
+
+def render_uncertainty(compiled, unit, key):
+    """Renders the uncertainty mode: a distribution per variable, Monte Carlo or linearized propagation."""
+    import pandas as pd
+
+    from hub_core.uncertainty import DISTRIBUTIONS, Distribution, linearized, monte_carlo
+
+    st.subheader("Uncertainty Propagation")
+    method = st.radio("Method", ["Monte Carlo", "Linearized"], horizontal=True, key=f"unc_method_{key}")
+    spread_labels = {"Normal": ("Mean", "Std Dev"), "Uniform": ("Low", "High"), "Tolerance": ("Nominal", "± Tolerance")}
+
+    inputs = {}
+    for var in compiled.variables:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            kind = st.selectbox(f"**{var}** distribution", DISTRIBUTIONS, index=1, key=f"unc_kind_{key}_{var}")
+        first, second = spread_labels.get(kind, ("Value", None))
+        with col2:
+            a = st.number_input(f"**{var}** {first.lower()}", value=1.0, format="%g", key=f"unc_a_{key}_{var}_{kind}")
+        with col3:
+            b = (st.number_input(f"**{var}** {second.lower()}", value=2.0 if kind == "Uniform" else 0.05 * abs(a),
+                                 format="%g", key=f"unc_b_{key}_{var}_{kind}") if second else 0.0)
+        inputs[var] = (kind, a, b)
+
+    if method == "Monte Carlo":
+        col1, col2 = st.columns(2)
+        with col1:
+            samples = st.number_input("Samples", min_value=1000, max_value=MAX_MC_SAMPLES, value=1_000_000,
+                                      step=100_000, key=f"unc_samples_{key}")
+        with col2:
+            chunk_size = st.number_input("Chunk Size (0 = all at once)", min_value=0, max_value=MAX_MC_SAMPLES,
+                                         value=0, step=100_000, key=f"unc_chunk_{key}",
+                                         help="Evaluate this many samples at a time to cap memory use.")
+
+    if not st.button("Propagate", key=f"unc_run_{key}"):
+        return
+    try:
+        distributions = {var: Distribution(*spec) for var, spec in inputs.items()}
+        start_time = time.perf_counter()
+        if method == "Monte Carlo":
+            result = monte_carlo(compiled, distributions, samples=int(samples), chunk_size=int(chunk_size))
+        else:
+            result = linearized(compiled, distributions)
+        elapsed = time.perf_counter() - start_time
+        metrics.record(f"formula.uncertainty.{metric_name(method)}", elapsed)
+    except Exception as e:
+        st.error(f"Error: {e}. Please check the distributions.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col3.metric("Eval Time", f"{elapsed * 1000:.2f} ms")
+    if method == "Linearized":
+        col1.metric(f"Value {unit}", f"{result.value:.6g}")
+        col2.metric("Std Dev", f"{result.std:.6g}")
+        st.dataframe(pd.DataFrame({
+            "Sensitivity ∂f/∂x": result.sensitivities,
+            "Variance Share": result.contributions,
+        }), column_config={"Variance Share": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0)})
+        return
+
+    col1.metric(f"Mean {unit}", f"{result.mean:.6g}")
+    col2.metric("Std Dev", f"{result.std:.6g}")
+    if result.invalid:
+        st.warning(f"{result.invalid:,} of {result.samples:,} samples gave no finite result and were left out.")
+    st.dataframe(pd.DataFrame({"Percentile": [f"P{q:g}" for q in result.percentiles],
+                               "Value": list(result.percentiles.values())}), hide_index=True)
+    centers = (result.edges[:-1] + result.edges[1:]) / 2
+    chart = pd.DataFrame({"Samples": result.counts}, index=[f"{c:.4g}" for c in centers])
+    chart.index.name = compiled.result
+    st.bar_chart(chart)
+
+
+def load_formula(discipline, section, kind, name, units=()):
+    """Compiles a formula through the sandbox; shows why and returns ``None`` if that fails or times out."""
+    try:
+        with metrics.timed("formula.parse"):
+            return get_formula_safely(discipline, section, kind, name, units)
+    except FormulaTimeout as e:
+        st.error(f"⏱️ {e} Please try again shortly.")
+    except (SandboxError, ValueError) as e:
+        st.error(f"Could not load {name}: {e}")
+    return None
+
+
+def render_conversion_table(matrix, key):
+    """Renders the cross-reference view of a category: its factor matrix or a value table, with export."""
+    import numpy as np
+
+    from hub_core.matrix import TABLE_FORMATS, export_table
+
+    with st.expander("📋 Conversion Table"):
+        view = st.radio("Show", ["Factor Matrix", "Value Table"], horizontal=True, key=f"table_view_{key}")
+        if view == "Factor Matrix":
+            st.caption("Multiply a value in the row unit by the factor to get the column unit.")
+            frame = matrix.to_frame()
+            index = True
+        else:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                from_unit = st.selectbox("Values In", matrix.units, key=f"table_from_{key}")
+            with col2:
+                start = st.number_input("Start", value=1.0, format="%g", key=f"table_start_{key}")
+            with col3:
+                stop = st.number_input("Stop", value=10.0, format="%g", key=f"table_stop_{key}")
+            with col4:
+                step = st.number_input("Step", value=1.0, min_value=1e-12, format="%g", key=f"table_step_{key}")
+            rows = math.floor((stop - start) / step + 1e-9) + 1 if stop >= start else 0
+            max_rows = MAX_TABLE_CELLS // len(matrix.units)
+            if not 0 < rows <= max_rows:
+                st.error(f"The table needs between 1 and {max_rows:,} rows; it would have {max(rows, 0):,}.")
+                return
+            frame = matrix.table(start + step * np.arange(rows), from_unit)
+            index = False
+        st.dataframe(frame, use_container_width=True)
+
+        # The expander body runs on every rerun, even collapsed: serialize only on request.
+        col1, col2, col3 = st.columns([1, 1, 2])
+        with col1:
+            file_format = st.selectbox("Format", TABLE_FORMATS, key=f"table_format_{key}",
+                                       label_visibility="collapsed")
+        with col2:
+            if not st.button("Prepare Export", key=f"table_export_{key}"):
+                return
+        try:
+            with metrics.timed("conversion_table.export"):
+                data = export_table(frame, file_format, index=index)
+        except ImportError:
+            st.warning("XLSX export needs the openpyxl package; CSV is always available.")
+            return
+        with col3:
+            st.download_button(f"Download {file_format}", data, file_name=f"{key}_{view.replace(' ', '_').lower()}."
+                               f"{file_format.lower()}", on_click="ignore", key=f"table_dl_{key}")
+
+
+def render_unit_selectors(discipline, section, quantities, key, shared=()):
+    """Renders one unit selectbox per formula name mapped to a physical quantity.
+
+    Names of a ``shared`` group get a single selectbox between them. Returns
+    the chosen units as a tuple of ``(name, unit)`` pairs.
+    """
+    if not quantities:
+        return ()
+    grouped = {var for group in shared for var in group}
+    selectors = [tuple(group) for group in shared] + [(var,) for var in quantities if var not in grouped]
+    st.markdown("**Units**")
+    units = []
+    columns = st.columns(min(len(selectors), 4))
+    for i, names in enumerate(selectors):
+        with columns[i % len(columns)]:
+            quantity = quantities[names[0]]
+            options = quantity_units(discipline, section, quantity).names
+            unit = st.selectbox(f"**{', '.join(names)}** ({quantity})", options, key=f"{key}_{'_'.join(names)}")
+            units.extend((var, unit) for var in names)
+    return tuple(units)
+
+
 def render_engineering_tools():
     """Renders the UI for Chemical and Electrical engineering calculations."""
     st.header("🧪⚡ Engineering Calculators")
     st.info("A comprehensive hub for engineering-specific conversions and formula calculations.")
 
-    eng_category = st.sidebar.selectbox("Choose Discipline", ["Chemical", "Electrical"])
-    eng_section = st.sidebar.selectbox("Choose Section", list(ENGINEERING_DATA[eng_category].keys()))
+    eng_category = st.sidebar.selectbox("Choose Discipline", ENGINEERING_DATA.names, key="eng_discipline")
+    eng_section = st.sidebar.selectbox("Choose Section", ENGINEERING_DATA[eng_category].names,
+                                       key=f"eng_section_{eng_category}")
     data = ENGINEERING_DATA[eng_category][eng_section]
 
-    selection_type = st.sidebar.radio("Select Tool Type", ["Physical Quantity", "Law", "Dimensionless Number"])
+    selection_type = st.sidebar.radio("Select Tool Type", ["Physical Quantity", "Law", "Dimensionless Number"],
+                                      key="eng_tool_type")
 
     if selection_type == "Physical Quantity":
         st.subheader("Physical Quantity Conversion")
-        pq = st.selectbox("Select Physical Quantity", list(data["Physical Quantities"].keys()))
+        pq = st.selectbox("Select Physical Quantity", data["Physical Quantities"].names,
+                          key=f"eng_quantity_{eng_category}_{eng_section}")
         pq_data = data["Physical Quantities"][pq]
         
         col1, col2 = st.columns(2)
         with col1:
             value = st.number_input(f"Enter value of {pq}", value=1.0, format="%.6f")
-            unit_from = st.selectbox("From Unit", list(pq_data["units"].keys()))
+            unit_from = st.selectbox("From Unit", pq_data["units"].names,
+                                     key=f"eng_from_{eng_category}_{eng_section}_{pq}")
         with col2:
-            unit_to = st.selectbox("To Unit", list(pq_data["units"].keys()))
+            unit_to = st.selectbox("To Unit", pq_data["units"].names)
 
         if value is not None and unit_from and unit_to:
             try:
-                converted_value = value * pq_data["units"][unit_to] / pq_data["units"][unit_from]
+                converted_value = value * quantity_factor(eng_category, eng_section, pq, unit_from, unit_to)
                 st.markdown('<div class="result-box">', unsafe_allow_html=True)
                 st.markdown(f'<p class="result-text">{value:.4f} {unit_from} = {converted_value:.6g} {unit_to}</p>', unsafe_allow_html=True)
                 st.markdown('</div>', unsafe_allow_html=True)
             except (ZeroDivisionError, KeyError):
                 st.error("Invalid units selected.")
 
+        from hub_core.matrix import quantity_matrix
+
+        render_conversion_table(quantity_matrix(eng_category, eng_section, pq),
+                                key=metric_name(f"{eng_category} {eng_section} {pq}"))
+
     elif selection_type == "Law":
-        st.subheader("Law Calculation")
-        law = st.selectbox("Select Law", list(data["Laws"].keys()))
-        law_data = data["Laws"][law]
-        formula_str = law_data["formula"]
-        var_names = law_data.get("variables", [])
-        
-        st.markdown(f'<div class="formula-box">**Formula:** {formula_str}</div>', unsafe_allow_html=True)
-        st.info(f"**Description:** {law_data.get('description', 'No description provided.')}")
-        
-        if var_names:
-            st.markdown("---")
+        render_law_panel(eng_category, eng_section)
+
+    elif selection_type == "Dimensionless Number":
+        render_dimensionless_panel(eng_category, eng_section)
+
+
+@st.fragment
+@instrumented("fragment.law_panel")
+def render_law_panel(eng_category, eng_section):
+    """Renders the Law calculator; its widgets rerun only this fragment."""
+    data = ENGINEERING_DATA[eng_category][eng_section]
+    st.subheader("Law Calculation")
+    law = st.selectbox("Select Law", data["Laws"].names)
+    law_data = data["Laws"][law]
+    formula_str = law_data["formula"]
+    var_names = law_data.get("variables", [])
+
+    st.markdown(f'<div class="formula-box">**Formula:** {formula_str}</div>', unsafe_allow_html=True)
+    st.info(f"**Description:** {law_data.get('description', 'No description provided.')}")
+    units = render_unit_selectors(eng_category, eng_section,
+                                  formula_quantities(eng_category, eng_section, "Laws", law), key=f"units_{law}",
+                                  shared=shared_unit_groups(eng_category, eng_section, "Laws", law))
+    unit_labels = dict(units)
+    eval_mode = st.radio("Evaluation Mode", ["Single Point", "Sweep", "Uncertainty"], horizontal=True, key=f"mode_{law}")
+    compiled = load_formula(eng_category, eng_section, "Laws", law, units)
+    if compiled is None:
+        return
+
+    if var_names and eval_mode == "Sweep":
+        st.markdown("---")
+        render_formula_sweep(compiled, unit_labels.get(compiled.result, law_data["unit"]), key=f"law_{law}")
+
+    elif var_names and eval_mode == "Uncertainty":
+        st.markdown("---")
+        render_uncertainty(compiled, unit_labels.get(compiled.result, law_data["unit"]), key=f"law_{law}")
+
+    elif var_names:
+        target = st.selectbox("Solve For", [compiled.result] + list(var_names), key=f"solve_for_{law}")
+        input_names = var_names if target == compiled.result else [compiled.result] + [v for v in var_names if v != target]
+
+        st.markdown("---")
+        # Inputs are submitted together, so typing a value does not rerun anything.
+        with st.form(key=f"law_form_{law}_{target}"):
             st.subheader("Input Variables")
             var_inputs = {}
-            for var in var_names:
-                var_inputs[var] = st.number_input(f"Enter value for **{var}**", value=1.0)
-            
-            if st.button("Calculate", key=f"calc_{law}"):
-                try:
-                    expr = sp.sympify(formula_str.replace("^", "**"))
-                    # Special case for log
-                    if "log" in formula_str:
-                        expr = expr.subs({"log": sp.log})
-                    
-                    # Convert inputs to a dictionary for sympy
-                    subs_dict = {sp.Symbol(var): val for var, val in var_inputs.items()}
-                    result = expr.subs(subs_dict)
-                    
-                    st.markdown('<div class="result-box">', unsafe_allow_html=True)
-                    st.markdown(f'<p class="result-text">Result = {result:.6g} {law_data["unit"]}</p>', unsafe_allow_html=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-                except Exception as e:
-                    st.error(f"Error: {e}. Please check the formula and inputs.")
+            for var in input_names:
+                unit_suffix = f" ({unit_labels[var]})" if var in unit_labels else ""
+                var_inputs[var] = st.number_input(f"Enter value for **{var}**{unit_suffix}", value=1.0,
+                                                  key=f"law_input_{law}_{var}")
+            submitted = st.form_submit_button("Calculate")
 
-    elif selection_type == "Dimensionless Number":
-        st.subheader("Dimensionless Number Calculation")
-        dn = st.selectbox("Select Dimensionless Number", list(data["Dimensionless Numbers"].keys()))
-        dn_data = data["Dimensionless Numbers"][dn]
-        formula_str = dn_data["formula"]
-        var_names = dn_data.get("variables", [])
-        
-        st.markdown(f'<div class="formula-box">**Formula:** {formula_str}</div>', unsafe_allow_html=True)
-        
-        if var_names:
-            st.markdown("---")
+        if submitted:
+            try:
+                # Solving runs in the formula sandbox, in base units for inverses.
+                with metrics.timed("formula.evaluate"):
+                    result, closed_form = evaluate_safely(eng_category, eng_section, "Laws", law, var_inputs,
+                                                          units, target)
+                if target == compiled.result:
+                    result_text = f"Result = {result:.6g} {unit_labels.get(target, law_data['unit'])}"
+                else:
+                    result_text = f"{target} = {result:.6g} {unit_labels.get(target, '')}".rstrip()
+
+                st.markdown('<div class="result-box">', unsafe_allow_html=True)
+                st.markdown(f'<p class="result-text">{result_text}</p>', unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+                if not closed_form:
+                    st.caption("No closed form for this variable; solved numerically.")
+
+            except FormulaTimeout as e:
+                st.error(f"⏱️ {e} Try other inputs, or try again once the server is less busy.")
+            except Exception as e:
+                st.error(f"Error: {e}. Please check the formula and inputs.")
+
+
+@st.fragment
+@instrumented("fragment.dimensionless_panel")
+def render_dimensionless_panel(eng_category, eng_section):
+    """Renders the Dimensionless Number calculator; its widgets rerun only this fragment."""
+    data = ENGINEERING_DATA[eng_category][eng_section]
+    st.subheader("Dimensionless Number Calculation")
+    dn = st.selectbox("Select Dimensionless Number", data["Dimensionless Numbers"].names)
+    dn_data = data["Dimensionless Numbers"][dn]
+    formula_str = dn_data["formula"]
+    var_names = dn_data.get("variables", [])
+
+    st.markdown(f'<div class="formula-box">**Formula:** {formula_str}</div>', unsafe_allow_html=True)
+    eval_mode = st.radio("Evaluation Mode", ["Single Point", "Sweep", "Uncertainty"], horizontal=True, key=f"mode_{dn}")
+    compiled = load_formula(eng_category, eng_section, "Dimensionless Numbers", dn)
+    if compiled is None:
+        return
+
+    if var_names and eval_mode == "Sweep":
+        st.markdown("---")
+        render_formula_sweep(compiled, "(Dimensionless)", key=f"dn_{dn}")
+
+    elif var_names and eval_mode == "Uncertainty":
+        st.markdown("---")
+        render_uncertainty(compiled, "(Dimensionless)", key=f"dn_{dn}")
+
+    elif var_names:
+        st.markdown("---")
+        with st.form(key=f"dn_form_{dn}"):
             st.subheader("Input Variables")
             var_inputs = {}
             for var in var_names:
-                var_inputs[var] = st.number_input(f"Enter value for **{var}**", value=1.0)
+                var_inputs[var] = st.number_input(f"Enter value for **{var}**", value=1.0, key=f"dn_input_{dn}_{var}")
+            submitted = st.form_submit_button("Calculate")
+
+        if submitted:
+            try:
+                with metrics.timed("formula.evaluate"):
+                    dn_result, _ = evaluate_safely(eng_category, eng_section, "Dimensionless Numbers", dn, var_inputs)
+
+                st.markdown('<div class="result-box">', unsafe_allow_html=True)
+                st.markdown(f'<p class="result-text">Result = {dn_result:.6g} (Dimensionless)</p>', unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+            except FormulaTimeout as e:
+                st.error(f"⏱️ {e} Try other inputs, or try again once the server is less busy.")
+            except Exception as e:
+                st.error(f"Error: {e}. Please check the formula and inputs.")
+
 
-            if st.button("Calculate", key=f"calc_{dn}"):
+@st.fragment
+@instrumented("fragment.worksheet")
+def render_worksheet():
+    """Renders the worksheet: Laws and Dimensionless Numbers chained output -> input."""
+    import json
+
+    import pandas as pd
+
+    st.header("🔗 Formula Worksheet")
+    st.info("Feed one formula's output into another's input. Editing a value recomputes only the "
+            "formulas downstream of it whose inputs actually changed.")
+    sheet = st.session_state.setdefault("worksheet", Worksheet())
+
+    with st.expander("Add Formula", expanded=not sheet.nodes):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            discipline = st.selectbox("Discipline", ENGINEERING_DATA.names, key="ws_discipline")
+        with col2:
+            section = st.selectbox("Section", ENGINEERING_DATA[discipline].names, key=f"ws_section_{discipline}")
+        with col3:
+            kind = st.selectbox("Type", list(TOOL_KINDS), key="ws_kind")
+        names = list(ENGINEERING_DATA[discipline][section].get(kind, ()))
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            name = st.selectbox("Formula", names, key=f"ws_name_{discipline}_{section}_{kind}")
+        compiled = load_formula(discipline, section, kind, name) if name is not None else None
+        if compiled is not None:
+            with col2:
+                target = st.selectbox("Solve For", [compiled.result] + list(compiled.variables),
+                                      key=f"ws_target_{discipline}_{section}_{name}")
+            with col3:
+                node_id = st.text_input("Node Name", value=f"{target}{len(sheet.nodes) + 1}", key="ws_node_id")
+            if st.button("Add to Worksheet", key="ws_add"):
                 try:
-                    expr = sp.sympify(formula_str.replace("^", "**"))
-                    
-                    subs_dict = {sp.Symbol(var): val for var, val in var_inputs.items()}
-                    dn_result = expr.subs(subs_dict)
-                    
-                    st.markdown('<div class="result-box">', unsafe_allow_html=True)
-                    st.markdown(f'<p class="result-text">Result = {dn_result:.6g} (Dimensionless)</p>', unsafe_allow_html=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
-                except Exception as e:
-                    st.error(f"Error: {e}. Please check the formula and inputs.")
+                    sheet.add_node(node_id, discipline, section, kind, name, target)
+                except (KeyError, ValueError, FormulaTimeout, SandboxError) as e:
+                    st.error(str(e))
+
+    for node_id in list(sheet.order()):
+        node = sheet.nodes[node_id]
+        with st.container(border=True):
+            col1, col2 = st.columns([5, 1])
+            col1.markdown(f"**{node_id}** · {node.name} → `{node.target}`")
+            if col2.button("Remove", key=f"ws_remove_{node_id}"):
+                sheet.remove_node(node_id)
+                st.rerun(scope="fragment")
+            sources = ["Value"] + [other for other in sheet.nodes
+                                   if other != node_id and node_id not in sheet.upstream(other)]
+            columns = st.columns(min(len(node.input_names), 4) or 1)
+            for i, var in enumerate(node.input_names):
+                with columns[i % len(columns)]:
+                    current = node.inputs.get(var)
+                    index = sources.index(current.source) if isinstance(current, Link) and current.source in sources else 0
+                    source = st.selectbox(f"**{var}** from", sources, index=index, key=f"ws_src_{node_id}_{var}")
+                    if source == "Value":
+                        value = st.number_input(f"**{var}**", value=current if isinstance(current, float) else 1.0,
+                                                format="%g", key=f"ws_val_{node_id}_{var}",
+                                                label_visibility="collapsed")
+                        sheet.set_input(node_id, var, value)
+                    else:
+                        sheet.set_input(node_id, var, Link(source))
+
+    if not sheet.nodes:
+        return
+    with metrics.timed("formula.evaluate"):
+        evaluated = sheet.recompute()
+    st.subheader("Results")
+    st.dataframe(pd.DataFrame([
+        {"Node": node.id, "Formula": node.name, "Output": node.target,
+         "Value": node.value, "Status": node.error or "OK"}
+        for node in (sheet.nodes[node_id] for node_id in sheet.order())
+    ]), hide_index=True)
+    st.caption(f"Recomputed this run: {', '.join(evaluated) if evaluated else 'nothing (all results up to date)'}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("Save Worksheet (.json)", json.dumps(sheet.to_dict(), indent=2),
+                           file_name="worksheet.json", mime="application/json", on_click="ignore", key="ws_save")
+    with col2:
+        uploaded = st.file_uploader("Load Worksheet", type=["json"], key="ws_load")
+        if uploaded is not None and st.button("Replace Worksheet", key="ws_replace"):
+            try:
+                st.session_state["worksheet"] = Worksheet.from_dict(json.load(uploaded))
+            except (KeyError, ValueError, TypeError, FormulaTimeout, SandboxError) as e:
+                st.error(f"Could not load worksheet: {e}")
+            else:
+                st.rerun(scope="fragment")
 
 
 # --- MAIN APP LAYOUT ---
+rerun_start = time.perf_counter()
+profiler = cProfile.Profile() if st.session_state.pop("profile_next_rerun", False) and DEBUG_PANEL else None
+if profiler is not None:
+    try:
+        profiler.enable()
+    except ValueError:
+        # Only one profiler can be active per process; another session holds it.
+        profiler = None
+        st.toast("Another rerun is being profiled; try again.")
+if os.environ.get("HUB_METRICS_FILE"):
+    metrics.start_dumping(os.environ["HUB_METRICS_FILE"], float(os.environ.get("HUB_METRICS_INTERVAL", 15)))
+
 load_css()
 st.title("🌟 All-in-One Engineering & Science Hub")
 st.markdown("Tagline: The only conversion hub engineers will ever need.")
 
 # --- SIDEBAR NAVIGATION ---
 st.sidebar.title("Navigation")
+render_unit_search()
 app_mode = st.sidebar.radio(
     "Choose a Tool",
-    ["General Unit Converter", "🌡️ Temperature", "🏋️ BMI Calculator", "⚡ Per-Unit System", "🧪⚡ Engineering Calculators"]
+    ["General Unit Converter", "📂 Bulk File Converter", "🌡️ Temperature", "🏋️ BMI Calculator", "⚡ Per-Unit System", "🧪⚡ Engineering Calculators", "🔗 Worksheet"],
+    key="app_mode",
 )
 st.sidebar.markdown("---")
 st.sidebar.info(
@@ -526,28 +1154,47 @@ st.sidebar.info(
 with st.container():
     st.markdown('<div class="main-container">', unsafe_allow_html=True)
 
-    if app_mode == "General Unit Converter":
-        st.header("Select a Category")
-        category_names = list(UNIT_CATEGORIES.keys())
-        selected_category = st.radio(
-            "Conversion Category:",
-            category_names,
-            horizontal=True,
-            label_visibility="collapsed"
-        )
-        st.markdown("---")
-        render_standard_converter(selected_category)
-        
-    elif app_mode == "🌡️ Temperature":
-        render_temperature_converter()
-        
-    elif app_mode == "🏋️ BMI Calculator":
-        render_bmi_calculator()
-        
-    elif app_mode == "⚡ Per-Unit System":
-        render_per_unit_calculator()
+    with metrics.timed(f"render.{metric_name(app_mode)}"):
+        if app_mode == "General Unit Converter":
+            st.header("Select a Category")
+            # Temperature has its own page; the other offset and level categories sit with the plain ones.
+            category_names = UNIT_CATEGORIES.names + tuple(name for name in AFFINE_CATEGORIES.names
+                                                           if name != "Temperature")
+            selected_category = st.radio(
+                "Conversion Category:",
+                category_names,
+                horizontal=True,
+                label_visibility="collapsed",
+                key="unit_category",
+            )
+            st.markdown("---")
+            render_standard_converter(selected_category)
 
-    elif app_mode == "🧪⚡ Engineering Calculators":
-        render_engineering_tools()
+        elif app_mode == "📂 Bulk File Converter":
+            render_bulk_converter()
+
+        elif app_mode == "🌡️ Temperature":
+            render_temperature_converter()
+
+        elif app_mode == "🏋️ BMI Calculator":
+            render_bmi_calculator()
+
+        elif app_mode == "⚡ Per-Unit System":
+            render_per_unit_calculator()
+
+        elif app_mode == "🧪⚡ Engineering Calculators":
+            render_engineering_tools()
+
+        elif app_mode == "🔗 Worksheet":
+            render_worksheet()
         
     st.markdown('</div>', unsafe_allow_html=True)
+
+if profiler is not None:
+    profiler.disable()
+    store_profile(profiler)
+with metrics.timed("session.budget"):
+    session_bytes = enforce_session_budget()
+if DEBUG_PANEL:
+    render_debug_panel(session_bytes)
+metrics.record("rerun", time.perf_counter() - rerun_start)
@@ -0,0 +1,92 @@
+"""Throughput and peak memory of the streaming bulk converter for growing file sizes.
+
+Each conversion runs in a fresh process and reports how much its peak RSS grew
+during the conversion. That growth should stay flat as the row count grows,
+since only one chunk is held at a time.
+
+    python benchmarks/bench_bulk_convert.py [--rows 100000 1000000 4000000] [--parquet]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hub_core.bulk import DEFAULT_CHUNK_ROWS, convert_file  # noqa: E402
+
+PSI_TO_KPA = 6894.76 / 1000.0
+
+
+def write_input(path, rows, file_format, chunk_rows=1_000_000):
+    """Writes a synthetic historian export: timestamp, tag and a psi reading."""
+    rng = np.random.default_rng(0)
+    if file_format == "Parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+    else:
+        out = open(path, "w", newline="", encoding="utf-8")
+    try:
+        for start in range(0, rows, chunk_rows):
+            n = min(chunk_rows, rows - start)
+            frame = pd.DataFrame({
+                "timestamp": np.arange(start, start + n),
+                "tag": "PT-101",
+                "pressure_psi": rng.uniform(0.0, 500.0, n),
+            })
+            if file_format == "Parquet":
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                writer = writer or pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                frame.to_csv(out, header=(start == 0), index=False)
+    finally:
+        if file_format == "Parquet":
+            if writer is not None:
+                writer.close()
+        else:
+            out.close()
+
+
+def measure(src, dst, file_format, chunk_rows):
+    """Converts ``src`` and returns (rows/sec, peak RSS growth in MB). Runs in a child process."""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(src, "rb") as handle:
+        for progress in convert_file(handle, dst, file_format, "pressure_psi", PSI_TO_KPA,
+                                     "pressure_kPa", chunk_rows):
+            pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return progress.rows_per_sec, (peak - baseline) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 4_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--parquet", action="store_true")
+    args = parser.parse_args()
+    file_format = "Parquet" if args.parquet else "CSV"
+    suffix = ".parquet" if args.parquet else ".csv"
+
+    print(f"{file_format}, {args.chunk_rows:,} rows per chunk")
+    print(f"{'rows':>12} {'input MB':>10} {'rows/s':>12} {'RSS growth MB':>14}")
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            src = os.path.join(tmp, f"in{suffix}")
+            dst = os.path.join(tmp, f"out{suffix}")
+            write_input(src, rows, file_format)
+            with ctx.Pool(1) as pool:
+                rows_per_sec, growth_mb = pool.apply(measure, (src, dst, file_format, args.chunk_rows))
+            size_mb = os.path.getsize(src) / 1e6
+            print(f"{rows:>12,} {size_mb:>10.1f} {rows_per_sec:>12,.0f} {growth_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Cold vs warm start-up of the formula registry.
+
+Starts fresh interpreters that import ``hub_core``, compile every Law and
+Dimensionless Number and load every inverse, once against an empty cache
+directory (cold: SymPy parses and solves everything) and then against the
+cache that run left behind (warm: generated source is loaded from disk).
+Also reports whether SymPy had to be imported.
+
+    python benchmarks/bench_cold_start.py [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import sys
+from hub_core import build_registry, get_inverse
+for key, compiled in build_registry().items():
+    if key[2] == "Laws":
+        for var in compiled.variables:
+            get_inverse(key[0], key[1], key[3], var)
+print("sympy" in sys.modules)
+"""
+
+
+def start_up(cache_dir):
+    """Wall time of one fresh interpreter running the probe, and whether it imported SymPy."""
+    env = dict(os.environ, HUB_CORE_CACHE_DIR=cache_dir)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return time.perf_counter() - start, output.strip() == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    cold, warm = [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(start_up(cache_dir))
+            warm.append(start_up(cache_dir))
+    cold_s, cold_sympy = min(t for t, _ in cold), cold[0][1]
+    warm_s, warm_sympy = min(t for t, _ in warm), any(s for _, s in warm)
+    print(f"cold cache: {cold_s * 1000:8.1f} ms  (sympy imported: {cold_sympy})")
+    print(f"warm cache: {warm_s * 1000:8.1f} ms  (sympy imported: {warm_sympy})")
+    print(f"speed-up:   {cold_s / warm_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
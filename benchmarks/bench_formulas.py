@@ -0,0 +1,39 @@
+"""Per-evaluation cost of a Law/Dimensionless Number: sympify+subs vs. the compiled registry.
+
+Run from the repository root:
+
+    python benchmarks/bench_formulas.py
+"""
+import os
+import sys
+import timeit
+
+import sympy as sp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hub_core import ENGINEERING_DATA, build_registry  # noqa: E402
+from hub_core.formulas import parse_formula  # noqa: E402
+
+
+def per_click_sympy(entry, values):
+    """What a Calculate click used to cost: parse, then symbolic substitution."""
+    _, expr = parse_formula(entry["formula"], entry["variables"])
+    return float(expr.subs({sp.Symbol(var): val for var, val in values.items()}))
+
+
+def main():
+    registry = build_registry(ENGINEERING_DATA)
+    print(f"{'formula':<28} {'sympify+subs':>14} {'compiled':>12} {'speedup':>9}")
+    for (discipline, section, kind, name), compiled in registry.items():
+        entry = ENGINEERING_DATA[discipline][section][kind][name]
+        values = {var: 2.0 + i for i, var in enumerate(compiled.variables)}
+        n_slow, n_fast = 200, 200_000
+        slow = timeit.timeit(lambda: per_click_sympy(entry, values), number=n_slow) / n_slow
+        fast = timeit.timeit(lambda: compiled.evaluate(values), number=n_fast) / n_fast
+        print(f"{name:<28} {slow * 1e6:>11.1f} us {fast * 1e6:>9.3f} us {slow / fast:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
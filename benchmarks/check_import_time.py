@@ -0,0 +1,72 @@
+"""Import-time budget for the headless core.
+
+Measures ``import hub_core`` in fresh interpreters (best of several runs,
+minus the bare interpreter start-up), and the same import followed by the
+names a converter needs first (``COLD_PATH``), since the package loads its
+submodules lazily. Both must stay under budget and not drag in Streamlit,
+SymPy, NumPy or pandas. Exits non-zero when the budget is exceeded. Run it
+on a quiet machine; ``tests/test_import_time.py`` checks which modules the
+imports load, without timing them.
+
+    python benchmarks/check_import_time.py [--budget-ms 50] [--runs 7]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("streamlit", "sympy", "numpy", "pandas", "pyarrow")
+
+COLD_PATH = ("convert", "convert_temperature")
+
+PROBE = """
+import sys
+import hub_core
+{touch}
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(",".join(loaded))
+"""
+
+
+def probe(names=()):
+    touch = "\n".join(f"hub_core.{name}" for name in names)
+    return PROBE.format(touch=touch, heavy=HEAVY_MODULES)
+
+
+def best_wall_time(code, runs):
+    """Best wall time in seconds of running ``code`` in a fresh interpreter."""
+    best = float("inf")
+    output = ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                                capture_output=True, text=True).stdout
+        best = min(best, time.perf_counter() - start)
+    return best, output.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    baseline, _ = best_wall_time("pass", args.runs)
+    failures = []
+    for label, names in (("import hub_core", ()), (f"+ {', '.join(COLD_PATH)}", COLD_PATH)):
+        total, loaded = best_wall_time(probe(names), args.runs)
+        import_ms = (total - baseline) * 1000
+        print(f"{label}: {import_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+        if loaded:
+            failures.append(f"{label}: heavy modules imported eagerly: {loaded}")
+        if import_ms > args.budget_ms:
+            failures.append(f"{label}: {import_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Validates the hand-written unit tables against the unit expression parser.
+
+Every unit in ``UNIT_CATEGORIES`` and the engineering ``Physical Quantities``
+is parsed; its dimension must match the table's base unit and its factor
+must agree with the parsed scale. Exits non-zero on any mismatch, so it can
+gate CI.
+
+    python benchmarks/check_unit_tables.py [--tolerance 0.002]
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hub_core.units import TABLE_TOLERANCE, validate_unit_tables  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tolerance", type=float, default=TABLE_TOLERANCE, help="Relative factor tolerance.")
+    args = parser.parse_args()
+
+    issues = validate_unit_tables(tolerance=args.tolerance)
+    for location, unit, problem in issues:
+        print(f"FAIL: {location} › {unit}: {problem}")
+    print(f"{len(issues)} issue(s) in the unit tables")
+    sys.exit(1 if issues else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Flags performance regressions between two run_benchmarks.py result files.
+
+A timing regresses when it is slower than the baseline by more than the
+threshold (a fraction, default 0.25 = 25 %); a memory measurement when it
+grows by more than the memory threshold (default 0.10, as retained bytes are
+far less noisy than timings). Exits non-zero on any regression so it can
+gate a commit.
+
+    python benchmarks/compare_benchmarks.py baseline.json current.json [--threshold 0.25] [--memory-threshold 0.10]
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold, improved="faster"):
+    """Returns ``(rows, regressions)`` where each row is ``(name, old, new, ratio, status)``.
+
+    ``improved`` is the status of a result that dropped by more than the threshold.
+    """
+    rows, regressions = [], []
+    for name in sorted(set(baseline) | set(current)):
+        old, new = baseline.get(name), current.get(name)
+        if old is None or new is None:
+            rows.append((name, old, new, None, "new" if old is None else "removed"))
+            continue
+        ratio = new / old if old > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / (1 + threshold):
+            status = improved
+        else:
+            status = "ok"
+        rows.append((name, old, new, ratio, status))
+    return rows, regressions
+
+
+def print_rows(rows, unit, scale):
+    print(f"{'benchmark':<48} {'baseline ' + unit:>13} {'current ' + unit:>13} {'ratio':>7}  status")
+    for name, old, new, ratio, status in rows:
+        old_s = f"{old * scale:.3f}" if old is not None else "-"
+        new_s = f"{new * scale:.3f}" if new is not None else "-"
+        ratio_s = f"{ratio:.2f}" if ratio is not None else "-"
+        print(f"{name:<48} {old_s:>13} {new_s:>13} {ratio_s:>7}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--memory-threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    baseline, current = load(args.baseline), load(args.current)
+    print(f"baseline {baseline['meta'].get('revision')} -> current {current['meta'].get('revision')}, "
+          f"threshold {args.threshold:.0%} (memory {args.memory_threshold:.0%})")
+    rows, regressions = compare(baseline["seconds"], current["seconds"], args.threshold)
+    print_rows(rows, "us", 1e6)
+    # Result files from before the "bytes" section have no memory measurements to compare.
+    memory_rows, memory_regressions = compare(baseline.get("bytes", {}), current.get("bytes", {}),
+                                              args.memory_threshold, improved="smaller")
+    if memory_rows:
+        print()
+        print_rows(memory_rows, "KiB", 1 / 1024)
+    regressions += memory_regressions
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
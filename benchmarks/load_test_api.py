@@ -0,0 +1,139 @@
+"""Local load test for the JSON/HTTP API (api.py).
+
+Starts the API with the requested number of workers (unless --url points at
+a running server), drives it from several client processes for a fixed
+duration and reports requests/sec and p50/p99 latency per endpoint.
+
+    python benchmarks/load_test_api.py [--workers 4] [--clients 8] [--duration 10] [--batch 1000]
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_requests(batch):
+    """One representative batch request per endpoint."""
+    rng = random.Random(0)
+    values = [rng.uniform(0.0, 500.0) for _ in range(batch)]
+    return {
+        "convert": ("/convert", {"category": "Pressure", "from": "Pounds per Square Inch (psi)",
+                                 "to": "Kilopascals (kPa)", "values": values}),
+        "quantity": ("/convert/quantity", {"discipline": "Chemical", "section": "Heat Transfer",
+                                           "quantity": "Heat Transfer Rate", "from": "Btu/h", "to": "W",
+                                           "values": values}),
+        "temperature": ("/temperature", {"from": "Fahrenheit (°F)", "to": "Celsius (°C)", "values": values}),
+        "per-unit": ("/per-unit", {"quantity": "Impedance", "direction": "to_pu", "base_mva": 100,
+                                   "base_kv": 13.8, "values": values}),
+        "formula": ("/formula", {"discipline": "Chemical", "section": "Heat Transfer", "kind": "Laws",
+                                 "name": "Newton's Law of Cooling",
+                                 "columns": {"h": values, "A": 2.0, "Ts": 350.0, "T_inf": 300.0}}),
+    }
+
+
+def client(url, duration, batch, seed):
+    """Sends requests until ``duration`` elapses; returns {endpoint: [latency seconds]}."""
+    parsed = urllib.parse.urlparse(url)
+    requests = [(name, path, json.dumps(body).encode()) for name, (path, body) in build_requests(batch).items()]
+    random.Random(seed).shuffle(requests)
+    latencies = {name: [] for name, _, _ in requests}
+    errors = 0
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        name, path, body = requests[i % len(requests)]
+        i += 1
+        start = time.perf_counter()
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+        try:
+            conn.request("POST", path, body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+        except OSError:
+            errors += 1
+            continue
+        finally:
+            conn.close()
+        latencies[name].append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def wait_until_up(url, timeout=30):
+    parsed = urllib.parse.urlparse(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"API at {url} did not come up")
+
+
+def percentile(samples, q):
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1] if len(samples) > 1 else samples[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Use an already running server instead of starting one.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--batch", type=int, default=1000, help="Values per batch request.")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, "api.py"), "--port", str(args.port),
+                                   "--workers", str(args.workers)], stdout=subprocess.DEVNULL)
+    try:
+        wait_until_up(url)
+        with multiprocessing.Pool(args.clients) as pool:
+            results = pool.starmap(client, [(url, args.duration, args.batch, seed) for seed in range(args.clients)])
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    merged = {}
+    errors = 0
+    for latencies, client_errors in results:
+        errors += client_errors
+        for name, samples in latencies.items():
+            merged.setdefault(name, []).extend(samples)
+    total = sum(len(samples) for samples in merged.values())
+
+    print(f"{args.clients} clients, {args.workers if server else '?'} workers, "
+          f"{args.batch} values/request, {args.duration:.0f}s")
+    print(f"{'endpoint':<12} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, samples in merged.items():
+        if samples:
+            print(f"{name:<12} {len(samples):>9} {percentile(samples, 50) * 1000:>8.2f} "
+                  f"{percentile(samples, 99) * 1000:>8.2f}")
+    everything = [s for samples in merged.values() for s in samples]
+    print(f"{'all':<12} {total:>9} {percentile(everything, 50) * 1000:>8.2f} "
+          f"{percentile(everything, 99) * 1000:>8.2f}")
+    print(f"throughput: {total / args.duration:,.0f} req/s, "
+          f"{total * args.batch / args.duration:,.0f} values/s, errors: {errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Local load test for the Streamlit app (app.py): N concurrent simulated sessions.
+
+Each session is a ``streamlit.testing`` :class:`AppTest` driven from its own
+thread. Every round it clicks through every ``app_mode`` of the sidebar,
+nudges the number inputs of each page, walks every unit category, runs a
+Law and a Dimensionless Number calculation in each discipline and adds one
+node to its worksheet (first round only). File-upload pages (bulk
+conversion, per-unit networks, worksheet loading) are only opened, as
+AppTest cannot upload files.
+
+Two phases run on the same process after a warm-up session: a latency
+phase reporting reruns/sec and rerun latency percentiles, and a memory
+phase under ``tracemalloc`` reporting memory per session after the first
+round and its growth over the following rounds, plus the size of each
+session's own state as the app budgets it (:func:`hub_core.memory.deep_sizeof`).
+Fails (exit 1) if a session's state exceeds ``--budget-mb`` or memory per
+session keeps growing by more than ``--max-growth-kb`` per round.
+
+    python benchmarks/load_test_app.py [--sessions 8] [--rounds 3] [--budget-mb 16] [--max-growth-kb 256]
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from hub_core.memory import deep_sizeof  # noqa: E402
+
+APP = os.path.join(ROOT, "app.py")
+RUN_TIMEOUT = 60
+
+
+class Session:
+    """One simulated browser session; ``latencies`` collects the duration of every rerun."""
+
+    def __init__(self):
+        self.app = AppTest.from_file(APP, default_timeout=RUN_TIMEOUT)
+        self.latencies = []
+        self.errors = []
+        self.round = 0
+
+    def run(self, widget=None):
+        start = time.perf_counter()
+        (widget or self.app).run()
+        self.latencies.append(time.perf_counter() - start)
+        for exception in self.app.exception:
+            self.errors.append(exception.message)
+
+    def nudge_inputs(self):
+        """Steps every visible number input up on even rounds and back down on odd ones."""
+        for number_input in list(self.app.number_input):
+            self.run(number_input.increment() if self.round % 2 == 0 else number_input.decrement())
+
+    def click(self, label):
+        for button in self.app.button:
+            if button.label == label:
+                self.run(button.click())
+                return
+
+    def click_through(self):
+        app = self.app
+        if not self.latencies:
+            self.run()
+        for mode in app.radio(key="app_mode").options:
+            self.run(app.radio(key="app_mode").set_value(mode))
+            if mode == "General Unit Converter":
+                for category in app.radio(key="unit_category").options:
+                    self.run(app.radio(key="unit_category").set_value(category))
+                self.nudge_inputs()
+            elif mode == "🧪⚡ Engineering Calculators":
+                for discipline in app.selectbox(key="eng_discipline").options:
+                    self.run(app.selectbox(key="eng_discipline").set_value(discipline))
+                    for tool in ("Physical Quantity", "Law", "Dimensionless Number"):
+                        self.run(app.radio(key="eng_tool_type").set_value(tool))
+                        self.nudge_inputs()
+                        self.click("Calculate")
+            elif mode == "🔗 Worksheet":
+                if self.round == 0:
+                    self.click("Add to Worksheet")
+            else:
+                self.nudge_inputs()
+        self.round += 1
+
+    def state_bytes(self):
+        return deep_sizeof(dict(self.app.session_state.filtered_state))
+
+
+def run_rounds(sessions, rounds):
+    """Runs ``rounds`` click-throughs of every session, one thread per session."""
+    def drive(session):
+        for _ in range(rounds):
+            session.click_through()
+
+    threads = [threading.Thread(target=drive, args=(session,)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def traced_bytes():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3, help="Click-throughs per session and phase.")
+    parser.add_argument("--budget-mb", type=float, default=16.0, help="Per-session state budget (HUB_SESSION_BUDGET_MB).")
+    parser.add_argument("--max-growth-kb", type=float, default=256.0,
+                        help="Allowed memory growth per session per round after the first.")
+    args = parser.parse_args()
+    os.environ["HUB_SESSION_BUDGET_MB"] = str(args.budget_mb)
+
+    # Loads the tables, compiles the formulas and starts the sandbox once, outside any measurement.
+    warmup = Session()
+    warmup.click_through()
+    del warmup
+
+    sessions = [Session() for _ in range(args.sessions)]
+    start = time.perf_counter()
+    run_rounds(sessions, args.rounds)
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for session in sessions for latency in session.latencies)
+    errors = sorted({error for session in sessions for error in session.errors})
+    print(f"{args.sessions} sessions x {args.rounds} rounds: {len(latencies)} reruns in {elapsed:.1f} s "
+          f"({len(latencies) / elapsed:.1f} reruns/s)")
+    print(f"rerun latency: p50 {statistics.median(latencies) * 1000:.1f} ms, "
+          f"p90 {percentile(latencies, 0.9) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, "
+          f"max {latencies[-1] * 1000:.1f} ms")
+    del sessions
+
+    tracemalloc.start()
+    baseline = traced_bytes()
+    sessions = [Session() for _ in range(args.sessions)]
+    run_rounds(sessions, 1)
+    per_session = [(traced_bytes() - baseline) / args.sessions]
+    for _ in range(1, args.rounds):
+        run_rounds(sessions, 1)
+        per_session.append((traced_bytes() - baseline) / args.sessions)
+    tracemalloc.stop()
+    state = [session.state_bytes() for session in sessions]
+    errors = sorted(set(errors) | {error for session in sessions for error in session.errors})
+    growth = (per_session[-1] - per_session[0]) / max(1, len(per_session) - 1)
+    print("memory per session by round: " + ", ".join(f"{size / 1024:,.0f} KiB" for size in per_session))
+    print(f"growth after round 1: {growth / 1024:,.1f} KiB per session per round")
+    print(f"session state: max {max(state) / 1024:,.0f} KiB, mean {statistics.fmean(state) / 1024:,.0f} KiB "
+          f"(budget {args.budget_mb * 1024:,.0f} KiB)")
+
+    failures = [f"app error: {error}" for error in errors]
+    if max(state) > args.budget_mb * 2 ** 20:
+        failures.append(f"a session holds {max(state) / 2 ** 20:.1f} MiB of state (budget {args.budget_mb} MiB)")
+    if growth > args.max_growth_kb * 1024:
+        failures.append(f"memory per session grows {growth / 1024:,.0f} KiB per round "
+                        f"(bound {args.max_growth_kb:,.0f} KiB)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
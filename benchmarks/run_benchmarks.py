@@ -0,0 +1,432 @@
+"""Benchmark suite for conversions, formula evaluation and full page reruns.
+
+Covers scalar and bulk UNIT_CATEGORIES conversion, temperature, gauge and
+decibel-level conversion, the per-unit calculations, Law/Dimensionless
+Number evaluation, load time and memory of a 10,000-unit registry and,
+through Streamlit's headless AppTest harness, a full script rerun of app.py
+for every ``app_mode`` next to a rerun of each fragment alone, which is what
+a widget change inside that fragment costs. Results are written as JSON,
+timings under ``"seconds"`` and memory under ``"bytes"``; compare two result
+files with ``benchmarks/compare_benchmarks.py`` to flag regressions between
+commits.
+
+    python benchmarks/run_benchmarks.py [--output benchmark_results.json] [--skip-app]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from hub_core import (  # noqa: E402
+    TEMPERATURE_UNITS,
+    Link,
+    Worksheet,
+    base_current,
+    base_impedance,
+    convert,
+    convert_affine,
+    convert_temperature,
+    from_per_unit,
+    get_formula,
+    get_formula_in_units,
+    get_search_index,
+    iter_formulas,
+    parse_unit,
+    search_units,
+    to_per_unit,
+    unit_factor,
+)
+
+BULK_SIZE = 1_000_000
+APP_RERUNS = 5
+NETWORK_BUSES = 100_000
+WORKSHEET_CHAIN = 200
+REGISTRY_UNITS = 10_000
+MATRIX_UNITS = 500
+MATRIX_ROWS = 10_000
+
+
+def measure(func, repeat=5):
+    """Best-of-``repeat`` seconds per call of ``func``, auto-ranging the loop count."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench_conversion():
+    values = np.random.default_rng(0).uniform(0.0, 500.0, BULK_SIZE)
+    return {
+        "conversion.scalar": measure(lambda: convert(14.7, "Pressure", "Pounds per Square Inch (psi)",
+                                                     "Kilopascals (kPa)")),
+        "conversion.bulk_1e6": measure(lambda: convert(values, "Pressure", "Pounds per Square Inch (psi)",
+                                                       "Kilopascals (kPa)")),
+    }
+
+
+def bench_temperature():
+    values = np.random.default_rng(0).uniform(-50.0, 500.0, BULK_SIZE)
+    f, c = TEMPERATURE_UNITS[1], TEMPERATURE_UNITS[0]
+    return {
+        "temperature.scalar": measure(lambda: convert_temperature(98.6, f, c)),
+        "temperature.bulk_1e6": measure(lambda: convert_temperature(values, f, c)),
+    }
+
+
+def bench_affine():
+    values = np.random.default_rng(0).uniform(0.0, 500.0, BULK_SIZE)
+    gauge = ("Pressure (Absolute/Gauge)", "Pounds per Square Inch gauge (psig)", "Kilopascals absolute (kPa a)")
+    level = ("Power Level", "Decibel-milliwatts (dBm)", "Watts (W)")
+    return {
+        "affine.gauge_scalar": measure(lambda: convert_affine(14.7, *gauge)),
+        "affine.gauge_bulk_1e6": measure(lambda: convert_affine(values, *gauge)),
+        "affine.level_scalar": measure(lambda: convert_affine(14.7, *level)),
+        "affine.level_bulk_1e6": measure(lambda: convert_affine(values, *level)),
+    }
+
+
+UNIT_EXPRESSIONS = ("kg·m/s²", "Btu/(ft²·h·°F)", "kWh/m³", "W/m²·K", "lb/ft³·ft", "µF")
+
+
+def bench_units():
+    """Unit expression parsing, uncached (every call parses) and through the LRU cache."""
+    parse = parse_unit.__wrapped__
+    return {
+        "units.parse_uncached": measure(lambda: [parse(e) for e in UNIT_EXPRESSIONS]) / len(UNIT_EXPRESSIONS),
+        "units.factor_cached": measure(lambda: unit_factor("Btu/(ft²·h·°F)", "W/(m²·K)")),
+    }
+
+
+def bench_search():
+    results = {"search.build_index": measure(lambda: (get_search_index.cache_clear(), get_search_index()))}
+    for query in ("psi", "btu/h", "W/m²K", "p", "presure"):
+        name = query.encode("ascii", "ignore").decode().replace("/", "_").lower()
+        results[f"search.{name}"] = measure(lambda: search_units(query))
+    return results
+
+
+def bench_per_unit():
+    def per_unit_page():
+        # Everything render_per_unit_calculator computes for one rerun.
+        base_impedance(100.0, 13.8)
+        base_current(100.0, 13.8)
+        for quantity in ("Impedance", "Current", "Voltage"):
+            to_per_unit(1.0, quantity, 100.0, 13.8)
+            from_per_unit(1.0, quantity, 100.0, 13.8)
+
+    return {
+        "per_unit.to_pu": measure(lambda: to_per_unit(5.0, "Impedance", 100.0, 13.8)),
+        "per_unit.page_calculations": measure(per_unit_page),
+    }
+
+
+def bench_network():
+    """A radial network of NETWORK_BUSES buses with a transformer every 100 buses."""
+    from hub_core.network import PerUnitNetwork
+
+    buses = np.arange(NETWORK_BUSES)
+    from_kv = np.where(buses[1:] % 100 == 0, 230.0, np.nan)
+    to_kv = np.where(buses[1:] % 100 == 0, 13.8, np.nan)
+    network = PerUnitNetwork(buses, buses[:-1], buses[1:], 100.0, {0: 230.0}, from_kv, to_kv)
+    impedances = np.random.default_rng(0).uniform(0.1, 10.0, NETWORK_BUSES - 1)
+
+    def rebase_one_zone():
+        network.set_zone_base(NETWORK_BUSES // 200, 13.2)
+        network.set_zone_base(NETWORK_BUSES // 200, 13.8)
+
+    return {
+        "network.build_1e5": measure(lambda: PerUnitNetwork(buses, buses[:-1], buses[1:], 100.0, {0: 230.0},
+                                                            from_kv, to_kv), repeat=3),
+        "network.to_pu_1e5": measure(lambda: network.to_per_unit(impedances, "branch", "Impedance")),
+        "network.rebase_zone": measure(rebase_one_zone),
+        "network.rebase_mva": measure(lambda: (network.set_base_mva(50.0), network.set_base_mva(100.0))),
+    }
+
+
+def bench_formulas():
+    results = {}
+    for key, _entry in iter_formulas():
+        compiled = get_formula(*key)
+        values = {var: 2.0 + i for i, var in enumerate(compiled.variables)}
+        columns = {var: np.full(BULK_SIZE, value) for var, value in values.items()}
+        name = key[3].replace(" ", "_").replace("'", "").lower()
+        results[f"formula.{name}.scalar"] = measure(lambda: compiled.evaluate(values))
+        results[f"formula.{name}.batch_1e6"] = measure(lambda: compiled.evaluate_batch(columns), repeat=3)
+
+    # Unit conversion is folded into the compiled code, so this should match the base formula.
+    converted = get_formula_in_units("Chemical", "Heat Transfer", "Laws", "Fourier's Law",
+                                     (("A", "ft²"), ("k", "Btu/ft·h·F"), ("q", "Btu/h")))
+    values = {var: 2.0 + i for i, var in enumerate(converted.variables)}
+    columns = {var: np.full(BULK_SIZE, value) for var, value in values.items()}
+    results["formula.fouriers_law_in_units.scalar"] = measure(lambda: converted.evaluate(values))
+    results["formula.fouriers_law_in_units.batch_1e6"] = measure(lambda: converted.evaluate_batch(columns), repeat=3)
+    return results
+
+
+def bench_conversion_matrix():
+    """Building a 500-unit factor matrix, converting a 10,000-value column through it and exporting it."""
+    from hub_core.matrix import build_matrix, export_table
+
+    units = tuple(f"unit_{i}" for i in range(MATRIX_UNITS))
+    to_base = np.geomspace(1e-6, 1e6, MATRIX_UNITS)
+    matrix = build_matrix(units, to_base)
+    values = np.arange(1.0, MATRIX_ROWS + 1)
+    small = matrix.table(values[:100], units[0])
+    return {
+        f"matrix.build_{MATRIX_UNITS}": measure(lambda: build_matrix(units, to_base)),
+        f"matrix.convert_{MATRIX_ROWS}x{MATRIX_UNITS}": measure(lambda: matrix.convert(values, units[0]), repeat=3),
+        f"matrix.export_csv_100x{MATRIX_UNITS}": measure(lambda: export_table(small, "CSV", index=False), repeat=3),
+    }
+
+
+def bench_uncertainty():
+    """Monte Carlo (in one pass and chunked) and linearized propagation through Fourier's Law."""
+    from hub_core.uncertainty import Distribution, linearized, monte_carlo
+
+    compiled = get_formula("Chemical", "Heat Transfer", "Laws", "Fourier's Law")
+    inputs = {var: Distribution("Normal", 2.0 + i, 0.1) for i, var in enumerate(compiled.variables)}
+    return {
+        "uncertainty.monte_carlo_1e6": measure(lambda: monte_carlo(compiled, inputs, BULK_SIZE, seed=0), repeat=3),
+        "uncertainty.monte_carlo_1e6_chunked": measure(
+            lambda: monte_carlo(compiled, inputs, BULK_SIZE, chunk_size=BULK_SIZE // 10, seed=0), repeat=3),
+        "uncertainty.linearized": measure(lambda: linearized(compiled, inputs)),
+    }
+
+
+def bench_worksheet():
+    """Recompute cost of a chain of Ohm's Law nodes, each fed by the previous one's voltage."""
+    sheet = Worksheet()
+    for i in range(WORKSHEET_CHAIN):
+        sheet.add_node(f"n{i}", "Electrical", "Circuit", "Laws", "Ohm's Law")
+        sheet.set_input(f"n{i}", "I", Link(f"n{i - 1}") if i else 1.0)
+        sheet.set_input(f"n{i}", "R", 1.0 + 1e-6)
+    sheet.recompute()
+    head, tail = iter([2.0, 3.0] * 1000), iter([2.0, 3.0] * 1000)
+
+    def edit(node_id, values):
+        sheet.set_input(node_id, "R", next(values))
+        sheet.recompute()
+
+    last = f"n{WORKSHEET_CHAIN - 1}"
+    return {
+        # The first two edits of each node miss its memo; after that both values are memoized.
+        f"worksheet.edit_head_chain_{WORKSHEET_CHAIN}": measure(lambda: edit("n0", head)),
+        f"worksheet.edit_tail_chain_{WORKSHEET_CHAIN}": measure(lambda: edit(last, tail)),
+    }
+
+
+def write_synthetic_tables(directory, units=REGISTRY_UNITS):
+    """Writes a registry of ``units`` units, half in unit categories and half in 5 disciplines."""
+    from hub_core.registry import REGISTRY_FORMAT
+
+    def dump(name, data):
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            json.dump({"format": REGISTRY_FORMAT, **data}, f)
+
+    per_table = 10
+    categories = {
+        f"Category {c}": {"units": {f"Unit {c}.{u} (u{c}_{u})": 1.0 + u for u in range(per_table)}, "icon": "📏"}
+        for c in range(units // 2 // per_table)
+    }
+    dump("unit_categories.json", {"categories": categories})
+    disciplines = {}
+    sections_per_discipline = units // 2 // 5 // per_table // per_table
+    for d in range(5):
+        name = f"Discipline {d}"
+        disciplines[name] = f"discipline_{d}.json"
+        sections = {
+            f"Section {s}": {
+                "Physical Quantities": {
+                    f"Quantity {s}.{q}": {"units": {f"u{d}_{s}_{q}_{u}": 1.0 + u for u in range(per_table)}, "icon": "🔥"}
+                    for q in range(per_table)
+                },
+                "Laws": {"Ohm's Law": {"formula": "V = I * R", "unit": "V", "variables": ["I", "R"]}},
+            }
+            for s in range(sections_per_discipline)
+        }
+        dump(disciplines[name], {"discipline": name, "sections": sections})
+    dump("index.json", {"version": "synthetic", "unit_categories": "unit_categories.json", "disciplines": disciplines})
+
+
+def load_all_disciplines(directory):
+    """Loads a registry and every one of its lazy disciplines."""
+    from hub_core.registry import load_registry
+
+    _version, categories, disciplines = load_registry(directory)
+    for name in disciplines:
+        disciplines[name]
+    return categories, disciplines
+
+
+def load_plain_dicts(directory):
+    """Reads the same data files as plain ``json.load`` dicts, for comparison."""
+    with open(os.path.join(directory, "index.json"), encoding="utf-8") as f:
+        index = json.load(f)
+    tables = []
+    for name in [index["unit_categories"], *index["disciplines"].values()]:
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            tables.append(json.load(f))
+    return tables
+
+
+def bench_registry():
+    """Load time of a 10,000-unit registry, next to the same data as plain dicts."""
+    import tempfile
+
+    from hub_core.registry import load_registry
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_synthetic_tables(directory)
+        suffix = f"{REGISTRY_UNITS // 1000}k_units"
+        return {
+            f"registry.load_index_{suffix}": measure(lambda: load_registry(directory)),
+            f"registry.load_all_{suffix}": measure(lambda: load_all_disciplines(directory)),
+            f"registry.load_all_{suffix}_plain_dicts": measure(lambda: load_plain_dicts(directory)),
+        }
+
+
+def bench_registry_memory():
+    """Bytes retained by a fully loaded 10,000-unit registry, next to the same data as plain dicts."""
+    import tempfile
+    import tracemalloc
+
+    def retained(load, directory):
+        tracemalloc.start()
+        data = load(directory)  # noqa: F841 (kept alive for the measurement)
+        size, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return float(size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_synthetic_tables(directory)
+        suffix = f"{REGISTRY_UNITS // 1000}k_units"
+        return {
+            f"registry.memory_{suffix}": retained(load_all_disciplines, directory),
+            f"registry.memory_{suffix}_plain_dicts": retained(load_plain_dicts, directory),
+        }
+
+
+def bench_app_reruns():
+    """Median wall time of a full app.py rerun for every app_mode."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60).run()
+    results = {}
+    for mode in at.sidebar.radio[0].options:
+        at.sidebar.radio[0].set_value(mode).run()
+        if at.exception:
+            raise RuntimeError(f"app_mode {mode!r} raised: {at.exception}")
+        samples = []
+        for _ in range(APP_RERUNS):
+            start = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - start)
+        name = mode.encode("ascii", "ignore").decode().strip().replace(" ", "_").lower()
+        results[f"app_rerun.{name}"] = float(np.median(samples))
+    return results
+
+
+FRAGMENTS = {
+    "standard_converter": 'render_standard_converter("Pressure")',
+    "temperature_converter": "render_temperature_converter()",
+    "per_unit_calculator": "render_per_unit_calculator()",
+    "law_panel": 'render_law_panel("Electrical", "Circuit")',
+    "dimensionless_panel": 'render_dimensionless_panel("Chemical", "Heat Transfer")',
+    "worksheet": "render_worksheet()",
+}
+
+
+def fragment_script(call):
+    """app.py's imports, constants and functions followed by one renderer ``call``.
+
+    A widget change inside a fragment reruns only the fragment function, so
+    running this script measures what such a rerun costs.
+    """
+    import ast
+
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    body = [node for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef))
+            or (isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant))]
+    return ast.unparse(ast.Module(body=body, type_ignores=[])) + "\n" + call + "\n"
+
+
+def bench_fragment_reruns():
+    """Median wall time of rerunning each fragment on its own, to set against app_rerun.*."""
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for name, call in FRAGMENTS.items():
+        at = AppTest.from_string(fragment_script(call), default_timeout=60).run()
+        if at.exception:
+            raise RuntimeError(f"fragment {name!r} raised: {at.exception}")
+        samples = []
+        for _ in range(APP_RERUNS):
+            start = time.perf_counter()
+            at.run()
+            samples.append(time.perf_counter() - start)
+        results[f"fragment_rerun.{name}"] = float(np.median(samples))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Suites measuring memory: their results are bytes, reported under "bytes" instead of "seconds".
+MEMORY_SUITES = [bench_registry_memory]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--skip-app", action="store_true", help="Skip the AppTest page reruns.")
+    args = parser.parse_args()
+
+    results = {}
+    suites = [bench_conversion, bench_temperature, bench_affine, bench_units, bench_search, bench_per_unit, bench_network,
+              bench_formulas, bench_conversion_matrix, bench_uncertainty, bench_worksheet, bench_registry]
+    if not args.skip_app:
+        suites.extend([bench_app_reruns, bench_fragment_reruns])
+    for suite in suites:
+        suite_results = suite()
+        for name, seconds in suite_results.items():
+            print(f"{name:<48} {seconds * 1e6:>14.3f} us")
+        results.update(suite_results)
+    memory = {}
+    for suite in MEMORY_SUITES:
+        suite_results = suite()
+        for name, size in suite_results.items():
+            print(f"{name:<48} {size / 1024:>14,.1f} KiB")
+        memory.update(suite_results)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "seconds": results,
+        "bytes": memory,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Wrote {len(results) + len(memory)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Streaming command-line converter for shell pipelines.
+
+Reads numbers (or CSV lines) from stdin and writes converted values to stdout
+as they arrive, in constant memory. Units and formulas are resolved once at
+start-up, so each line costs one parse, one multiply-add (or one compiled
+formula call) and one write.
+
+    tail -f psi.log | python cli.py unit Pressure psi kPa --line-buffered
+    python cli.py temp F C < readings.txt
+    python cli.py quantity Chemical "Heat Transfer" "Heat Transfer Rate" Btu/h W < duty.txt
+    python cli.py per-unit Impedance --base-mva 100 --base-kv 13.8 < ohms.txt
+    python cli.py formula Electrical Circuit Laws "Ohm's Law" < i_r.csv     # lines: I,R
+    python cli.py unit Pressure psi kPa --field 3 < historian.csv           # convert 3rd CSV field
+    python cli.py expr "Btu/(ft²·h·°F)" "W/(m²·K)" < u_values.txt          # any compound units
+"""
+import argparse
+import sys
+
+from hub_core import (
+    ENGINEERING_DATA,
+    PER_UNIT_QUANTITIES,
+    TEMPERATURE_UNITS,
+    TOOL_KINDS,
+    UNIT_CATEGORIES,
+    base_value,
+    conversion_factor,
+    get_formula,
+    quantity_factor,
+    resolve_unit,
+    temperature_transform,
+    unit_factor,
+)
+
+
+def affine_transform(args):
+    """Returns ``(offset_in, scale, offset_out)`` with ``converted = (value - offset_in) * scale + offset_out``."""
+    if args.mode == "unit":
+        units = UNIT_CATEGORIES[args.category]["units"]
+        return 0.0, conversion_factor(args.category, resolve_unit(units, args.from_unit),
+                                      resolve_unit(units, args.to_unit)), 0.0
+    if args.mode == "quantity":
+        units = ENGINEERING_DATA[args.discipline][args.section]["Physical Quantities"][args.quantity]["units"]
+        return 0.0, quantity_factor(args.discipline, args.section, args.quantity,
+                                    resolve_unit(units, args.from_unit), resolve_unit(units, args.to_unit)), 0.0
+    if args.mode == "expr":
+        return 0.0, unit_factor(args.from_unit, args.to_unit), 0.0
+    if args.mode == "temp":
+        return temperature_transform(resolve_unit(TEMPERATURE_UNITS, args.from_unit),
+                                     resolve_unit(TEMPERATURE_UNITS, args.to_unit))
+    base = base_value(args.quantity, args.base_mva, args.base_kv)
+    return 0.0, (1.0 / base if args.direction == "to_pu" else base), 0.0
+
+
+def build_line_converter(args):
+    """Builds the per-line function ``str -> str`` for the selected mode."""
+    fmt = args.format
+    delimiter = args.delimiter
+
+    if args.mode == "formula":
+        compiled = get_formula(args.discipline, args.section, args.kind, args.name)
+        scalar = compiled.scalar
+        arity = len(compiled.variables)
+
+        def convert_formula(line):
+            fields = line.split(delimiter)
+            if len(fields) != arity:
+                return "nan"
+            try:
+                return format(scalar(*map(float, fields)), fmt)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                return "nan"
+        return convert_formula
+
+    offset_in, scale, offset_out = affine_transform(args)
+
+    if args.field is None:
+        def convert_value(line):
+            try:
+                return format((float(line) - offset_in) * scale + offset_out, fmt)
+            except ValueError:
+                return "nan"
+        return convert_value
+
+    index = args.field - 1
+
+    def convert_field(line):
+        fields = line.split(delimiter)
+        try:
+            fields[index] = format((float(fields[index]) - offset_in) * scale + offset_out, fmt)
+        except (ValueError, IndexError):
+            return line
+        return delimiter.join(fields)
+    return convert_field
+
+
+def run(args, stdin, stdout):
+    """Converts ``stdin`` to ``stdout`` line by line."""
+    convert_line = build_line_converter(args)
+    write = stdout.write
+    lines = iter(stdin)
+    if args.skip_header:
+        header = next(lines, None)
+        if header is not None:
+            write(header)
+    if args.line_buffered:
+        flush = stdout.flush
+        for line in lines:
+            write(convert_line(line.rstrip("\r\n")) + "\n")
+            flush()
+    else:
+        for line in lines:
+            write(convert_line(line.rstrip("\r\n")) + "\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming unit/formula converter for shell pipelines.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--field", type=int, help="Convert only this 1-based delimited field of each line.")
+    common.add_argument("--delimiter", default=",", help="Field delimiter (default ',').")
+    common.add_argument("--format", default="", help="Output format spec, e.g. '.6g' (default: shortest repr).")
+    common.add_argument("--skip-header", action="store_true", help="Pass the first line through unchanged.")
+    common.add_argument("--line-buffered", action="store_true",
+                        help="Flush after every line, for tail -f pipelines.")
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    unit = modes.add_parser("unit", parents=[common], help="Convert within a UNIT_CATEGORIES category.")
+    unit.add_argument("category", choices=list(UNIT_CATEGORIES))
+    unit.add_argument("from_unit")
+    unit.add_argument("to_unit")
+
+    quantity = modes.add_parser("quantity", parents=[common], help="Convert an engineering physical quantity.")
+    quantity.add_argument("discipline", choices=list(ENGINEERING_DATA))
+    quantity.add_argument("section")
+    quantity.add_argument("quantity")
+    quantity.add_argument("from_unit")
+    quantity.add_argument("to_unit")
+
+    expr = modes.add_parser("expr", parents=[common],
+                            help="Convert between compound unit expressions, e.g. 'kWh/m³' to 'MJ/m³'.")
+    expr.add_argument("from_unit")
+    expr.add_argument("to_unit")
+
+    temp = modes.add_parser("temp", parents=[common], help="Convert temperatures.")
+    temp.add_argument("from_unit")
+    temp.add_argument("to_unit")
+
+    per_unit = modes.add_parser("per-unit", parents=[common], help="Convert to or from per-unit.")
+    per_unit.add_argument("quantity", choices=list(PER_UNIT_QUANTITIES))
+    per_unit.add_argument("--base-mva", type=float, required=True)
+    per_unit.add_argument("--base-kv", type=float, required=True)
+    per_unit.add_argument("--direction", choices=["to_pu", "from_pu"], default="to_pu")
+
+    formula = modes.add_parser("formula", parents=[common],
+                               help="Evaluate a Law/Dimensionless Number; each line lists its variables.")
+    formula.add_argument("discipline", choices=list(ENGINEERING_DATA))
+    formula.add_argument("section")
+    formula.add_argument("kind", choices=list(TOOL_KINDS))
+    formula.add_argument("name")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        run(args, sys.stdin, sys.stdout)
+    except (KeyError, ValueError) as e:
+        sys.exit(f"error: {e.args[0] if e.args else e}")
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`); exit quietly.
+        sys.stderr.close()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Headless conversion and formula core of the Engineering & Science Hub.
+
+Importing this package pulls in only the standard library, and only what a
+name needs: every public name is loaded from its submodule on first access
+(module ``__getattr__``), so ``import hub_core`` itself costs next to
+nothing. Compiled formulas are loaded from the on-disk cache
+(:mod:`hub_core.cache`); SymPy is only loaded to compile a formula missing
+from it, NumPy on first array evaluation.
+"""
+import importlib
+
+# Public name -> submodule defining it.
+_EXPORTS = {
+    "Conversion": "affine",
+    "UnitTransform": "affine",
+    "category_units": "affine",
+    "convert_affine": "affine",
+    "get_conversion": "affine",
+    "conversion_factor": "conversion",
+    "convert": "conversion",
+    "convert_quantity": "conversion",
+    "quantity_factor": "conversion",
+    "quantity_units": "conversion",
+    "resolve_unit": "conversion",
+    "unit_symbol": "conversion",
+    "AFFINE_CATEGORIES": "data",
+    "ENGINEERING_DATA": "data",
+    "UNIT_CATEGORIES": "data",
+    "CompiledFormula": "formulas",
+    "TOOL_KINDS": "formulas",
+    "build_registry": "formulas",
+    "compile_formula": "formulas",
+    "evaluate_formula": "formulas",
+    "formula_quantities": "formulas",
+    "get_formula": "formulas",
+    "get_formula_in_units": "formulas",
+    "iter_formulas": "formulas",
+    "precompute_formulas": "formulas",
+    "shared_unit_groups": "formulas",
+    "sweep_values": "formulas",
+    "unit_scales": "formulas",
+    "InverseFormula": "inverse",
+    "find_root": "inverse",
+    "get_inverse": "inverse",
+    "precompute_inverses": "inverse",
+    "solve_for": "inverse",
+    "ACTUAL_UNITS": "per_unit",
+    "PER_UNIT_QUANTITIES": "per_unit",
+    "base_current": "per_unit",
+    "base_impedance": "per_unit",
+    "base_value": "per_unit",
+    "from_per_unit": "per_unit",
+    "to_per_unit": "per_unit",
+    "SearchHit": "search",
+    "SearchIndex": "search",
+    "get_search_index": "search",
+    "search_units": "search",
+    "TEMPERATURE_UNITS": "temperature",
+    "convert_temperature": "temperature",
+    "from_celsius": "temperature",
+    "temperature_transform": "temperature",
+    "to_celsius": "temperature",
+    "BASE_DIMENSIONS": "units",
+    "Unit": "units",
+    "convert_units": "units",
+    "format_dimension": "units",
+    "parse_unit": "units",
+    "unit_factor": "units",
+    "validate_unit_tables": "units",
+    "Link": "worksheet",
+    "Worksheet": "worksheet",
+    "WorksheetNode": "worksheet",
+}
+
+__all__ = [
+    "ACTUAL_UNITS",
+    "AFFINE_CATEGORIES",
+    "BASE_DIMENSIONS",
+    "ENGINEERING_DATA",
+    "PER_UNIT_QUANTITIES",
+    "TEMPERATURE_UNITS",
+    "TOOL_KINDS",
+    "UNIT_CATEGORIES",
+    "CompiledFormula",
+    "Conversion",
+    "InverseFormula",
+    "Link",
+    "SearchHit",
+    "SearchIndex",
+    "Unit",
+    "UnitTransform",
+    "Worksheet",
+    "WorksheetNode",
+    "base_current",
+    "base_impedance",
+    "base_value",
+    "build_registry",
+    "category_units",
+    "compile_formula",
+    "conversion_factor",
+    "convert",
+    "convert_affine",
+    "convert_quantity",
+    "convert_temperature",
+    "convert_units",
+    "evaluate_formula",
+    "find_root",
+    "format_dimension",
+    "formula_quantities",
+    "from_celsius",
+    "from_per_unit",
+    "get_conversion",
+    "get_formula",
+    "get_formula_in_units",
+    "get_inverse",
+    "get_search_index",
+    "iter_formulas",
+    "parse_unit",
+    "precompute_formulas",
+    "precompute_inverses",
+    "quantity_factor",
+    "quantity_units",
+    "resolve_unit",
+    "search_units",
+    "shared_unit_groups",
+    "solve_for",
+    "sweep_values",
+    "temperature_transform",
+    "to_celsius",
+    "to_per_unit",
+    "unit_factor",
+    "unit_scales",
+    "unit_symbol",
+    "validate_unit_tables",
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,9 @@
+"""Pre-builds the on-disk formula and inverse caches: ``python -m hub_core``."""
+import time
+
+from .cache import CACHE_DIR, precompute
+
+start = time.perf_counter()
+formulas, inverses = precompute()
+print(f"Cached {len(formulas)} formulas and {len(inverses)} solved Laws in {CACHE_DIR} "
+      f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,141 @@
+"""Affine and logarithmic unit conversion: every unit as a precomputed transform to its base unit.
+
+A unit maps to its category's base unit as ``base = value * scale + offset``.
+A logarithmic unit (a level such as dBm or dBV) first leaves the log domain,
+``value -> level_base ** (value / step)``. Any from/to pair of a category is
+composed into one cached :class:`Conversion`, applied to a float or a NumPy
+array in a single pass.
+
+Categories come from ``AFFINE_CATEGORIES`` (temperature, gauge pressure,
+levels), whose transforms are exact strings, and from the multiplicative
+``UNIT_CATEGORIES`` (``offset`` 0). Composing offset units is done in exact
+fractions, so e.g. Celsius -> Fahrenheit is exactly ``* 1.8 + 32``. The
+transforms are named tuples rather than dataclasses to keep this module,
+which every conversion imports, cheap to load.
+"""
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+from .data import AFFINE_CATEGORIES, UNIT_CATEGORIES
+
+
+class UnitTransform(namedtuple("UnitTransform", "scale offset level", defaults=(0.0, None))):
+    """``base = value * scale + offset``; a ``level`` ``(base, step)`` first maps ``value -> base ** (value / step)``."""
+    __slots__ = ()
+
+
+class Conversion(namedtuple("Conversion", "scale offset level_in level_out", defaults=(1.0, 0.0, None, None))):
+    """A composed from -> to conversion: ``level_out(level_in(value) * scale + offset)``.
+
+    ``level_in`` is ``(base, step)`` of a logarithmic source unit
+    (``value -> base ** (value / step)``); ``level_out`` that of a
+    logarithmic target unit (``x -> step * log_base(x)``).
+    """
+    __slots__ = ()
+
+    @property
+    def is_linear(self):
+        """True for a plain multiplication by ``scale``."""
+        return not self.offset and self.level_in is None and self.level_out is None
+
+    def __call__(self, value):
+        if self.level_in is not None:
+            value = _power(value, *self.level_in)
+        result = value * self.scale
+        if self.offset:
+            result += self.offset  # in place for arrays: no second temporary
+        if self.level_out is not None:
+            result = _log(result, *self.level_out)
+        return result
+
+
+def _power(value, base, step):
+    if isinstance(value, (int, float)):
+        try:
+            return base ** (value / step)
+        except OverflowError:
+            return math.inf
+    import numpy as np
+
+    with np.errstate(over="ignore"):
+        return np.power(base, np.asarray(value, dtype=float) / step)
+
+
+def _log(value, base, step):
+    if isinstance(value, (int, float)):
+        if value <= 0:
+            return -math.inf if value == 0 else math.nan
+        return step * (math.log10(value) if base == 10 else math.log(value, base))
+    import numpy as np
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return step * (np.log10(value) if base == 10 else np.log(value) / math.log(base))
+
+
+def _exact(text):
+    """Parses ``"1.25"`` or ``"2298.35/9"`` into an exact ``Fraction``."""
+    from fractions import Fraction
+
+    numerator, _, denominator = text.partition("/")
+    return Fraction(numerator) / Fraction(denominator or 1)
+
+
+def _parse(entry):
+    level = entry.get("level")
+    if level is not None:
+        base = math.e if level["base"] == "e" else float(level["base"])
+        level = (base, float(level["step"]))
+    return UnitTransform(_exact(entry["scale"]), _exact(entry.get("offset", "0")), level)
+
+
+@lru_cache(maxsize=None)
+def unit_transforms(category):
+    """Maps every unit of ``category`` to its :class:`UnitTransform`."""
+    if category in AFFINE_CATEGORIES:
+        return {unit: _parse(entry) for unit, entry in AFFINE_CATEGORIES[category]["transforms"].items()}
+    if category in UNIT_CATEGORIES:
+        units = UNIT_CATEGORIES[category]["units"]
+        return {unit: UnitTransform(units[unit]) for unit in units.names}
+    raise KeyError(f"Unknown unit category '{category}'.")
+
+
+def category_units(category):
+    """The unit labels of an ``AFFINE_CATEGORIES`` or ``UNIT_CATEGORIES`` category, in table order."""
+    if category in AFFINE_CATEGORIES:
+        return AFFINE_CATEGORIES[category]["transforms"].names
+    return UNIT_CATEGORIES[category]["units"].names
+
+
+def compose(source, target):
+    """Composes the :class:`Conversion` taking ``source`` units to ``target`` units (both :class:`UnitTransform`)."""
+    scale = source.scale / target.scale
+    offset = (source.offset - target.offset) / target.scale
+    if source.level is not None and target.level is not None and not offset:
+        # Level to level is affine in the log domain: step_out * log_b(scale * b_in ** (x / step_in)).
+        (base_in, step_in), (base_out, step_out) = source.level, target.level
+        if base_in == base_out:
+            ratio = step_out / step_in
+            shift = step_out * (math.log10(scale) if base_out == 10 else math.log(scale, base_out))
+        else:
+            ratio = step_out * math.log(base_in) / (step_in * math.log(base_out))
+            shift = step_out * math.log(scale) / math.log(base_out)
+        return Conversion(ratio, shift)
+    return Conversion(float(scale), float(offset), source.level, target.level)
+
+
+@lru_cache(maxsize=4096)
+def get_conversion(category, from_unit, to_unit):
+    """The cached :class:`Conversion` from ``from_unit`` to ``to_unit`` within ``category``."""
+    transforms = unit_transforms(category)
+    for unit in (from_unit, to_unit):
+        if unit not in transforms:
+            raise KeyError(f"Unit '{unit}' not found in '{category}'.")
+    if from_unit == to_unit:
+        return Conversion()
+    return compose(transforms[from_unit], transforms[to_unit])
+
+
+def convert_affine(value, category, from_unit, to_unit):
+    """Converts a float or NumPy array between two units of ``category``."""
+    return get_conversion(category, from_unit, to_unit)(value)
@@ -0,0 +1,189 @@
+"""Chunked, streaming unit conversion of a column in CSV or Parquet files.
+
+The input is read in fixed-size chunks, each chunk is converted with a single
+vectorized multiply and appended to the output, so peak memory depends on the
+chunk size and not on the size of the file. Needs NumPy, pandas and pyarrow,
+so it is not imported by ``hub_core`` itself.
+"""
+import csv
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 250_000
+FILE_FORMATS = ("CSV", "Parquet")
+
+
+@dataclass
+class BulkProgress:
+    """Running totals reported after every converted chunk."""
+    rows: int
+    chunks: int
+    elapsed: float
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def detect_format(filename):
+    """Guesses the file format from the file name."""
+    return "Parquet" if filename.lower().endswith((".parquet", ".pq")) else "CSV"
+
+
+def _read_csv_header(source):
+    """Reads and parses the header line of a binary CSV stream."""
+    line = source.readline().decode("utf-8-sig")
+    return next(csv.reader([line]), [])
+
+
+def list_columns(source, file_format):
+    """Reads only the header/schema of ``source`` and returns its column names."""
+    if file_format == "Parquet":
+        import pyarrow.parquet as pq
+        return list(pq.ParquetFile(source).schema_arrow.names)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return _read_csv_header(f)
+    position = source.tell()
+    columns = _read_csv_header(source)
+    source.seek(position)
+    return columns
+
+
+def _last_record_end(data):
+    """Index of the last newline in ``data`` that is not inside a quoted field, or -1.
+
+    A newline ends a record when an even number of quote characters precede it
+    (escaped quotes are doubled, so they never change the parity).
+    """
+    quotes_after = 0
+    end = len(data)
+    pos = data.rfind(b"\n")
+    while pos >= 0:
+        quotes_after += data.count(b'"', pos, end)
+        end = pos
+        if (data.count(b'"') - quotes_after) % 2 == 0:
+            return pos
+        pos = data.rfind(b"\n", 0, pos)
+    return -1
+
+
+def _csv_blocks(source, chunk_rows):
+    """Yields byte blocks of about ``chunk_rows`` whole CSV records from ``source``.
+
+    The block size is re-estimated from the average record length of the
+    previous block, so only one block is ever held in memory.
+    """
+    block_bytes = 1 << 20
+    carry = b""
+    while True:
+        data = source.read(block_bytes)
+        if not data:
+            if carry.strip():
+                yield carry
+            return
+        data = carry + data
+        cut = _last_record_end(data)
+        if cut < 0:
+            carry = data
+            continue
+        block, carry = data[:cut + 1], data[cut + 1:]
+        yield block
+        block_bytes = max(1 << 16, len(block) * chunk_rows // max(block.count(b"\n"), 1))
+
+
+def _convert_column(values, factor):
+    """Converts one chunk of a column with a single multiply; unparsable cells become NaN."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    try:
+        numbers = pc.cast(values, pa.float64()).to_numpy(zero_copy_only=False)
+    except pa.ArrowInvalid:
+        numbers = pd.to_numeric(values.to_numpy(zero_copy_only=False), errors="coerce")
+    return pa.array(np.asarray(numbers, dtype=float) * factor, from_pandas=True)
+
+
+def _replace_or_append(batch, column, target, converted):
+    """Returns ``batch`` with ``converted`` replacing ``column`` or appended as ``target``."""
+    import pyarrow as pa
+
+    arrays, names = list(batch.columns), list(batch.schema.names)
+    if target in names:
+        arrays[names.index(target)] = converted
+    else:
+        arrays.append(converted)
+        names.append(target)
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def convert_csv(source, destination, column, factor, output_column=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Streams ``source`` to ``destination`` converting ``column`` by ``factor``.
+
+    ``source`` is a path or a binary file object. Yields a :class:`BulkProgress`
+    after each chunk. When ``output_column`` is given the converted values are
+    appended as a new column, otherwise the original column is replaced. Every
+    other column is passed through as text, so its values are written back
+    exactly as they were read.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from convert_csv(f, destination, column, factor, output_column, chunk_rows)
+        return
+
+    target = output_column or column
+    names = _read_csv_header(source)
+    read_options = pacsv.ReadOptions(column_names=names)
+    convert_options = pacsv.ConvertOptions(column_types={name: pa.string() for name in names})
+    start = time.perf_counter()
+    rows = 0
+    writer = None
+    try:
+        for i, block in enumerate(_csv_blocks(source, chunk_rows)):
+            table = pacsv.read_csv(pa.py_buffer(block), read_options=read_options,
+                                   convert_options=convert_options)
+            batch = table.combine_chunks().to_batches()[0]
+            batch = _replace_or_append(batch, column, target, _convert_column(batch.column(column), factor))
+            if writer is None:
+                writer = pacsv.CSVWriter(destination, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+            yield BulkProgress(rows, i + 1, time.perf_counter() - start)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def convert_parquet(source, destination, column, factor, output_column=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Parquet counterpart of :func:`convert_csv`, reading record batches."""
+    import pyarrow.parquet as pq
+
+    target = output_column or column
+    start = time.perf_counter()
+    rows = 0
+    writer = None
+    try:
+        for i, batch in enumerate(pq.ParquetFile(source).iter_batches(batch_size=chunk_rows)):
+            batch = _replace_or_append(batch, column, target, _convert_column(batch.column(column), factor))
+            if writer is None:
+                writer = pq.ParquetWriter(destination, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+            yield BulkProgress(rows, i + 1, time.perf_counter() - start)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def convert_file(source, destination, file_format, column, factor, output_column=None,
+                 chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Dispatches to the CSV or Parquet streaming converter."""
+    converter = convert_parquet if file_format == "Parquet" else convert_csv
+    return converter(source, destination, column, factor, output_column, chunk_rows)
@@ -0,0 +1,106 @@
+"""Content-hashed on-disk cache of compiled formula artifacts.
+
+Parsed formulas (and their solved inverses) are stored as generated Python
+source keyed by a hash of the formula text, so a new process rebuilds its
+callables with ``exec`` in milliseconds instead of importing SymPy and
+re-parsing. An entry is invalidated automatically whenever its formula text,
+its variables or the code generator version change.
+
+The cache lives in ``~/.cache/hub_core`` (override with ``HUB_CORE_CACHE_DIR``).
+Its contents are executed as code, so the directory must only be writable by
+the user running the app, as with ``__pycache__``.
+
+    python -m hub_core              # pre-build the forward and inverse caches
+"""
+import hashlib
+import json
+import os
+
+CACHE_DIR = os.environ.get("HUB_CORE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "hub_core"))
+CACHE_FORMAT = 2
+CODEGEN_VERSION = 1
+
+
+def formula_hash(entry, scales=()):
+    """Content hash of a formula entry; changes whenever the formula, its variables or the codegen change.
+
+    ``scales`` (``(name, factor)`` pairs folded into the formula) are part of the key when given.
+    """
+    parts = [entry["formula"], ",".join(entry.get("variables", [])), str(CODEGEN_VERSION)]
+    if scales:
+        parts.append(",".join(f"{name}*{factor!r}" for name, factor in scales))
+    text = "|".join(parts)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cache_path(name):
+    return os.path.join(CACHE_DIR, name)
+
+
+def load_cache(name):
+    """Reads the entries of cache file ``name``; an empty dict if it is missing, unreadable or stale."""
+    try:
+        with open(cache_path(name), encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("entries", {}) if cache.get("format") == CACHE_FORMAT else {}
+
+
+def save_cache(name, entries):
+    """Atomically replaces cache file ``name`` with ``entries``."""
+    import tempfile
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"format": CACHE_FORMAT, "entries": entries}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path(name))
+
+
+def update_cache(name, digest, value):
+    """Adds one entry to cache file ``name``, ignoring an unwritable cache directory."""
+    entries = load_cache(name)
+    entries[digest] = value
+    try:
+        save_cache(name, entries)
+    except OSError:
+        pass
+
+
+def generate_source(expr, symbols, func_name, printer="math"):
+    """Generates ``def func_name(...)`` evaluating ``expr`` with ``math`` or ``numpy`` calls.
+
+    Arguments are renamed ``_v0, _v1, ...`` so any variable name is safe.
+    Raises ``NotImplementedError`` when ``expr`` uses a function the printer
+    cannot express (e.g. LambertW for ``math``).
+    """
+    import sympy as sp
+    from sympy.printing.codeprinter import PrintMethodNotImplementedError
+    from sympy.printing.numpy import NumPyPrinter
+    from sympy.printing.pycode import PythonCodePrinter
+
+    arg_names = [f"_v{i}" for i in range(len(symbols))]
+    renamed = expr.xreplace({symbol: sp.Symbol(name) for symbol, name in zip(symbols, arg_names)})
+    code_printer = NumPyPrinter() if printer == "numpy" else PythonCodePrinter()
+    try:
+        body = code_printer.doprint(renamed)
+    except PrintMethodNotImplementedError as e:
+        raise NotImplementedError(str(e)) from None
+    return f"def {func_name}({', '.join(arg_names)}):\n    return {body}\n"
+
+
+def load_source(source, func_name, namespace):
+    """Executes generated ``source`` in ``namespace`` and returns the function it defines."""
+    scope = dict(namespace)
+    exec(compile(source, f"<hub_core:{func_name}>", "exec"), scope)
+    return scope[func_name]
+
+
+def precompute():
+    """Builds the forward-formula and inverse caches for every formula."""
+    from .formulas import precompute_formulas
+    from .inverse import precompute_inverses
+
+    return precompute_formulas(), precompute_inverses()
+
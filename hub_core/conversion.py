@@ -0,0 +1,72 @@
+"""Unit conversion over the unit categories and the engineering physical quantities.
+
+Category conversions run on the transform engine of :mod:`hub_core.affine`,
+which also covers the offset and logarithmic units of ``AFFINE_CATEGORIES``.
+Every function works on plain floats and, unchanged, on NumPy arrays.
+"""
+from .affine import get_conversion
+from .data import ENGINEERING_DATA
+
+
+def conversion_factor(category, from_unit, to_unit):
+    """Multiplier taking a value in ``from_unit`` to ``to_unit`` within a category.
+
+    Raises ``ValueError`` when the two units are not related by a plain
+    multiplier (an offset or a logarithmic unit); use :func:`convert` then.
+    """
+    conversion = get_conversion(category, from_unit, to_unit)
+    if not conversion.is_linear:
+        raise ValueError(f"'{from_unit}' -> '{to_unit}' is not a plain multiplier; use convert().")
+    return conversion.scale
+
+
+def convert(value, category, from_unit, to_unit):
+    """Converts ``value`` between two units of a ``UNIT_CATEGORIES`` or ``AFFINE_CATEGORIES`` category."""
+    return get_conversion(category, from_unit, to_unit)(value)
+
+
+def quantity_units(discipline, section, quantity):
+    """Returns the unit table of an ``ENGINEERING_DATA`` physical quantity."""
+    return ENGINEERING_DATA[discipline][section]["Physical Quantities"][quantity]["units"]
+
+
+def quantity_factor(discipline, section, quantity, from_unit, to_unit):
+    """Multiplier taking ``from_unit`` to ``to_unit`` for an engineering physical quantity.
+
+    Physical quantity tables store units per base unit, so the ratio is the
+    inverse of :func:`conversion_factor`.
+    """
+    units = quantity_units(discipline, section, quantity)
+    return units[to_unit] / units[from_unit]
+
+
+def convert_quantity(value, discipline, section, quantity, from_unit, to_unit):
+    """Converts ``value`` between two units of an engineering physical quantity."""
+    return value * quantity_factor(discipline, section, quantity, from_unit, to_unit)
+
+
+def unit_symbol(unit):
+    """Returns the symbol of a unit label, e.g. ``"psi"`` for ``"Pounds per Square Inch (psi)"``."""
+    if unit.endswith(")") and "(" in unit:
+        return unit[unit.rindex("(") + 1:-1]
+    return unit
+
+
+def resolve_unit(units, query):
+    """Finds the unit label in ``units`` matching ``query`` by full label or symbol.
+
+    Exact matches win over case-insensitive ones, which also ignore a leading
+    degree sign ("F" finds "Fahrenheit (°F)"). Raises ``KeyError`` when nothing
+    (or more than one unit) matches.
+    """
+    if query in units:
+        return query
+    for unit in units:
+        if unit_symbol(unit) == query:
+            return unit
+    folded = query.casefold().lstrip("°")
+    matches = [unit for unit in units
+               if folded in (unit.casefold(), unit_symbol(unit).casefold().lstrip("°"))]
+    if len(matches) == 1:
+        return matches[0]
+    raise KeyError(f"Unit '{query}' not found or ambiguous; choose one of: {', '.join(units)}")
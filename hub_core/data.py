@@ -0,0 +1,24 @@
+"""Unit tables and engineering formulas shared by every front end.
+
+``UNIT_CATEGORIES`` factors are expressed in the category's base unit per
+unit (value_in_base = value * factor). The ``Physical Quantities`` tables in
+``ENGINEERING_DATA`` use the opposite convention, units per base unit.
+
+A Law's optional ``quantities`` maps its result and variables to physical
+quantities of the same section, whose base units the formula is written in.
+
+``AFFINE_CATEGORIES`` holds the units with an offset or a logarithmic scale
+(temperatures, gauge pressures, decibel levels) as transforms to a base
+unit; see :mod:`hub_core.affine`.
+
+All are read-only mappings loaded from the versioned JSON files in
+``hub_core/tables`` (see :mod:`hub_core.registry`); each discipline of
+``ENGINEERING_DATA`` is read on first access. ``QUANTITY_NAMES`` maps
+discipline -> section -> quantity -> unit labels without reading them. Edit
+those files, not this module, to add units or formulas.
+"""
+from .registry import load_affine_categories, load_quantity_names, load_registry
+
+DATA_VERSION, UNIT_CATEGORIES, ENGINEERING_DATA = load_registry()
+AFFINE_CATEGORIES = load_affine_categories()
+QUANTITY_NAMES = load_quantity_names()
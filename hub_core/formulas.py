@@ -0,0 +1,334 @@
+"""Compiled formula registry for the Law and Dimensionless Number tools.
+
+Every formula in ``ENGINEERING_DATA`` is parsed with SymPy exactly once and
+turned into a plain ``math`` function (scalar evaluation) and a NumPy
+function (array evaluation). The generated source is kept in the on-disk
+cache (see :mod:`hub_core.cache`), so later processes rebuild the functions
+without SymPy. Compiled formulas are cached per process and shared by every
+caller. NumPy is only imported when a formula is evaluated over arrays.
+"""
+import math
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import Callable
+
+from .cache import formula_hash, generate_source, load_cache, load_source, save_cache, update_cache
+from .conversion import quantity_units
+from .data import ENGINEERING_DATA
+
+FORMULA_CACHE_FILE = "formulas.json"
+
+TOOL_KINDS = ("Laws", "Dimensionless Numbers")
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    """A parsed formula together with its compiled evaluators.
+
+    ``scales`` holds ``(name, factor)`` pairs folded into the evaluators:
+    each variable is multiplied by its factor on the way in and the result
+    divided by its own on the way out (see :func:`get_formula_in_units`).
+    """
+    name: str
+    formula: str
+    result: str
+    variables: tuple
+    scalar: Callable
+    vector: Callable
+    scales: tuple = ()
+
+    @cached_property
+    def expr(self):
+        """The SymPy expression of the right-hand side, parsed on first access."""
+        _, expr = parse_formula(self.formula, self.variables)
+        return scale_expr(expr, self.result, self.scales)
+
+    def evaluate(self, values):
+        """Evaluates the formula for a mapping of variable name -> float."""
+        return self.scalar(*(values[var] for var in self.variables))
+
+    def evaluate_value(self, values):
+        """Like :meth:`evaluate`, but returns a finite float and raises ``ValueError`` for anything else.
+
+        Division by zero, overflow, domain errors and complex or non-finite
+        results all become a ``ValueError`` naming the formula, so every front
+        end reports a bad point the same way.
+        """
+        try:
+            value = self.evaluate(values)
+        except ZeroDivisionError:
+            raise ValueError(f"{self.name} divides by zero for these inputs.") from None
+        except OverflowError:
+            raise ValueError(f"{self.name} overflows for these inputs.") from None
+        except ValueError:
+            raise ValueError(f"These inputs are outside the domain of {self.name}.") from None
+        if isinstance(value, complex) or not math.isfinite(value):
+            raise ValueError(f"{self.name} has no finite real value for these inputs.")
+        return float(value)
+
+    def evaluate_batch(self, columns):
+        """Evaluates the formula row-wise over equal-length arrays in one vectorized call.
+
+        ``columns`` maps each variable to an array or a scalar (broadcast to every row).
+        """
+        import numpy as np
+
+        args = [np.asarray(columns[var], dtype=float) for var in self.variables]
+        shape = np.broadcast_shapes(*(arg.shape for arg in args)) if args else ()
+        with np.errstate(all="ignore"):
+            out = self.vector(*args)
+        return np.broadcast_to(np.asarray(out, dtype=float), shape)
+
+    def evaluate_grid(self, fixed, axes):
+        """Evaluates the formula over the Cartesian grid of ``axes``.
+
+        ``axes`` maps the swept variables to 1-D arrays, ``fixed`` supplies the
+        remaining variables. Each axis is reshaped to broadcast along its own
+        dimension, so no meshgrid is materialised. The result has one dimension
+        per swept variable, in the order of ``axes``.
+        """
+        import numpy as np
+
+        swept = list(axes)
+        columns = {}
+        for var in self.variables:
+            if var in axes:
+                shape = [1] * len(swept)
+                shape[swept.index(var)] = -1
+                columns[var] = np.asarray(axes[var], dtype=float).reshape(shape)
+            else:
+                columns[var] = fixed[var]
+        grid_shape = tuple(len(axes[var]) for var in swept)
+        return np.broadcast_to(self.evaluate_batch(columns), grid_shape)
+
+
+def split_formula(formula_str):
+    """Splits ``"lhs = rhs"`` into ``(lhs, rhs)``; ``lhs`` is empty for a bare expression."""
+    text = formula_str.replace("^", "**")
+    if "=" in text:
+        lhs, rhs = (part.strip() for part in text.split("=", 1))
+        return lhs, rhs
+    return "", text.strip()
+
+
+def parse_formula(formula_str, variables):
+    """Splits ``"lhs = rhs"`` and parses the right-hand side.
+
+    Every declared variable is bound to a plain Symbol so names such as
+    ``I``, ``E`` or ``S`` are not mistaken for SymPy constants.
+    """
+    import sympy as sp
+
+    lhs, rhs = split_formula(formula_str)
+    local_dict = {var: sp.Symbol(var) for var in variables}
+    expr = sp.sympify(rhs, locals=local_dict)
+    return lhs, expr
+
+
+def scale_expr(expr, result, scales):
+    """Folds unit factors into ``expr``: ``f(x * s_x, ...) / s_result``.
+
+    SymPy merges the factors into the expression's numeric coefficients, so
+    the scaled formula evaluates as fast as the original.
+    """
+    if not scales:
+        return expr
+    import sympy as sp
+
+    factors = dict(scales)
+    replaced = expr.xreplace({sp.Symbol(var): sp.Symbol(var) * sp.Float(factor)
+                              for var, factor in factors.items() if var != result})
+    return replaced / sp.Float(factors.get(result, 1.0))
+
+
+def generate_formula_source(entry, scales=()):
+    """Parses ``entry`` with SymPy and returns the generated ``math``/NumPy source of its evaluators."""
+    import sympy as sp
+
+    variables = tuple(entry.get("variables", []))
+    lhs, expr = parse_formula(entry["formula"], variables)
+    expr = scale_expr(expr, lhs, scales)
+    symbols = [sp.Symbol(var) for var in variables]
+    return {
+        "scalar": generate_source(expr, symbols, "scalar", "math"),
+        "vector": generate_source(expr, symbols, "vector", "numpy"),
+    }
+
+
+def _lazy_numpy_function(source):
+    """Wraps generated NumPy source so NumPy is only imported on the first call."""
+    func = None
+
+    def vector(*args):
+        nonlocal func
+        if func is None:
+            import numpy
+
+            func = load_source(source, "vector", {"numpy": numpy})
+        return func(*args)
+    return vector
+
+
+def _lambdified(entry, scales=()):
+    """Fallback for expressions the code generator cannot print: plain SymPy lambdify."""
+    import sympy as sp
+
+    variables = tuple(entry.get("variables", []))
+    lhs, expr = parse_formula(entry["formula"], variables)
+    expr = scale_expr(expr, lhs, scales)
+    symbols = [sp.Symbol(var) for var in variables]
+    return sp.lambdify(symbols, expr, modules="math"), sp.lambdify(symbols, expr, modules="numpy")
+
+
+@lru_cache(maxsize=1)
+def _disk_entries():
+    return load_cache(FORMULA_CACHE_FILE)
+
+
+def compile_formula(name, entry, use_cache=True, scales=()):
+    """Compiles one ``ENGINEERING_DATA`` formula entry, using the on-disk cache when possible.
+
+    ``scales`` are ``(name, factor)`` pairs folded into the compiled code as
+    constants; see :class:`CompiledFormula`.
+    """
+    variables = tuple(entry.get("variables", []))
+    lhs, _ = split_formula(entry["formula"])
+    digest = formula_hash(entry, scales)
+    sources = _disk_entries().get(digest) if use_cache else None
+    if sources is None:
+        try:
+            sources = generate_formula_source(entry, scales)
+        except NotImplementedError:
+            scalar, vector = _lambdified(entry, scales)
+            return CompiledFormula(name, entry["formula"], lhs or name, variables, scalar, vector, scales)
+        if use_cache:
+            cache_formula_source(digest, sources)
+    return formula_from_source(name, entry, sources, scales)
+
+
+def cache_formula_source(digest, sources):
+    """Stores generated evaluator source in this process and in the disk cache."""
+    _disk_entries()[digest] = sources
+    update_cache(FORMULA_CACHE_FILE, digest, sources)
+
+
+def cached_formula_source(entry, scales=()):
+    """The cached evaluator source of ``entry``, or ``None`` when it still has to be generated."""
+    return _disk_entries().get(formula_hash(entry, scales))
+
+
+def formula_from_source(name, entry, sources, scales=()):
+    """Builds a :class:`CompiledFormula` from source made by :func:`generate_formula_source`."""
+    lhs, _ = split_formula(entry["formula"])
+    return CompiledFormula(
+        name=name,
+        formula=entry["formula"],
+        result=lhs or name,
+        variables=tuple(entry.get("variables", [])),
+        scalar=load_source(sources["scalar"], "scalar", {"math": math}),
+        vector=_lazy_numpy_function(sources["vector"]),
+        scales=scales,
+    )
+
+
+def sweep_values(start, stop, num, scale="Linear"):
+    """Returns ``num`` sweep points from ``start`` to ``stop`` on a linear or log scale."""
+    import numpy as np
+
+    if scale == "Log":
+        if start <= 0 or stop <= 0:
+            raise ValueError("Log sweeps need positive start and stop values.")
+        return np.geomspace(start, stop, num)
+    return np.linspace(start, stop, num)
+
+
+def iter_formulas(engineering_data=ENGINEERING_DATA):
+    """Yields ``((discipline, section, kind, name), entry)`` for every formula."""
+    for discipline, sections in engineering_data.items():
+        for section, data in sections.items():
+            for kind in TOOL_KINDS:
+                for name, entry in data.get(kind, {}).items():
+                    yield (discipline, section, kind, name), entry
+
+
+def build_registry(engineering_data=ENGINEERING_DATA):
+    """Compiles every Law and Dimensionless Number in ``engineering_data``.
+
+    Returns a dict keyed by ``(discipline, section, kind, name)``.
+    """
+    return {key: compile_formula(key[3], entry) for key, entry in iter_formulas(engineering_data)}
+
+
+def precompute_formulas():
+    """Generates the source of every formula and rewrites the disk cache, dropping stale entries."""
+    cached = load_cache(FORMULA_CACHE_FILE)
+    entries = {}
+    for _key, entry in iter_formulas():
+        digest = formula_hash(entry)
+        try:
+            entries[digest] = cached.get(digest) or generate_formula_source(entry)
+        except NotImplementedError:
+            continue
+    save_cache(FORMULA_CACHE_FILE, entries)
+    _disk_entries.cache_clear()
+    return entries
+
+
+@lru_cache(maxsize=None)
+def get_formula(discipline, section, kind, name):
+    """Returns the compiled ``ENGINEERING_DATA`` formula, compiling it on first use."""
+    return compile_formula(name, ENGINEERING_DATA[discipline][section][kind][name])
+
+
+def formula_quantities(discipline, section, kind, name):
+    """Maps the result and variables of a formula to their physical quantities (may be empty)."""
+    return ENGINEERING_DATA[discipline][section][kind][name].get("quantities", {})
+
+
+def shared_unit_groups(discipline, section, kind, name):
+    """Groups of formula names that must be given in one unit, e.g. two absolute temperatures that are subtracted.
+
+    Their quantity's units are differences without offsets, so ``Ts - T_inf``
+    is only right when both are read on the same scale.
+    """
+    return ENGINEERING_DATA[discipline][section][kind][name].get("shared_units", ())
+
+
+def unit_scales(discipline, section, kind, name, units):
+    """Multipliers taking each value from its chosen unit to its quantity's base unit.
+
+    ``units`` maps (or lists ``(name, unit)`` pairs of) formula names to unit
+    labels of their physical quantity. A unit chosen for one name of a
+    :func:`shared_unit_groups` group applies to the whole group; different
+    units within a group raise ``ValueError``.
+    """
+    quantities = formula_quantities(discipline, section, kind, name)
+    units = dict(units)
+    for group in shared_unit_groups(discipline, section, kind, name):
+        chosen = {units[var] for var in group if var in units}
+        if len(chosen) > 1:
+            raise ValueError(f"{', '.join(group)} must be given in the same unit.")
+        if chosen:
+            units.update(dict.fromkeys(group, chosen.pop()))
+    return {var: 1.0 / quantity_units(discipline, section, quantities[var])[unit]
+            for var, unit in units.items()}
+
+
+@lru_cache(maxsize=256)
+def get_formula_in_units(discipline, section, kind, name, units=()):
+    """Returns the formula compiled for inputs and result in the given units.
+
+    ``units`` is a tuple of ``(name, unit)`` pairs; names left out stay in
+    their base unit. The conversion factors are folded into the compiled
+    code, so scalar and batch evaluation cost the same as the base formula.
+    """
+    factors = unit_scales(discipline, section, kind, name, units)
+    scales = tuple(sorted((var, factor) for var, factor in factors.items() if factor != 1.0))
+    if not scales:
+        return get_formula(discipline, section, kind, name)
+    return compile_formula(name, ENGINEERING_DATA[discipline][section][kind][name], scales=scales)
+
+
+def evaluate_formula(discipline, section, kind, name, values):
+    """Evaluates an ``ENGINEERING_DATA`` formula for a mapping of variable name -> float."""
+    return get_formula(discipline, section, kind, name).evaluate(values)
@@ -0,0 +1,201 @@
+"""Pre-solved inverse forms of the Laws: solve any Law for any of its variables.
+
+For a Law ``R = f(x1, ..., xn)`` every ``xi`` is solved symbolically ahead of
+time and each real closed-form branch is compiled to a ``math`` function.
+The generated source of every branch is kept in the on-disk cache (see
+:mod:`hub_core.cache`), so a new process loads it without SymPy instead of
+calling ``sympy.solve``. Targets without a usable closed form, or whose
+branches do not reproduce the given result, fall back to a numeric
+root-finder on the compiled forward formula.
+"""
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .cache import formula_hash, generate_source, load_cache, load_source, save_cache, update_cache
+from .formulas import CompiledFormula, get_formula, iter_formulas
+
+INVERSE_CACHE_FILE = "inverses.json"
+RESIDUAL_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class InverseFormula:
+    """A Law rearranged for ``target``; inputs are the Law's result plus the other variables."""
+    forward: CompiledFormula
+    target: str
+    inputs: tuple
+    branches: tuple
+
+    def evaluate(self, values, guess=1.0):
+        """Solves for ``target`` given a mapping of every name in ``inputs`` -> float."""
+        return self.solve(values, guess)[0]
+
+    def solve(self, values, guess=1.0):
+        """Like :meth:`evaluate`, but returns ``(value, closed_form)``.
+
+        Real, finite closed-form branches that reproduce the result are
+        preferred, positive roots first; ``closed_form`` is then ``True``.
+        Otherwise the forward formula is solved numerically starting from
+        ``guess`` and ``closed_form`` is ``False``, even when the Law has
+        branches that failed for these inputs.
+        """
+        args = [values[name] for name in self.inputs]
+        expected = values[self.forward.result]
+        candidates = []
+        for branch in self.branches:
+            try:
+                candidate = branch(*args)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                continue
+            if isinstance(candidate, complex) or not math.isfinite(candidate):
+                continue
+            if self._residual(values, candidate, expected) <= RESIDUAL_TOLERANCE:
+                candidates.append(float(candidate))
+        if candidates:
+            return max(candidates, key=lambda c: c >= 0), True
+        return find_root(lambda x: self._forward_at(values, x) - expected, guess), False
+
+    def _forward_at(self, values, x):
+        point = dict(values)
+        point[self.target] = x
+        return self.forward.evaluate(point)
+
+    def _residual(self, values, candidate, expected):
+        try:
+            actual = self._forward_at(values, candidate)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            return math.inf
+        return abs(actual - expected) / max(abs(expected), 1.0)
+
+
+def find_root(func, guess=1.0, tolerance=1e-12, max_iter=100):
+    """Finds a root of ``func`` with the secant method, falling back to bracketing + bisection.
+
+    Raises ``ValueError`` when no root can be found.
+    """
+    x0, x1 = guess, guess * 1.01 + 1e-3
+    try:
+        f0, f1 = func(x0), func(x1)
+        for _ in range(max_iter):
+            if f1 == f0:
+                break
+            x0, x1 = x1, x1 - f1 * (x1 - x0) / (f1 - f0)
+            f0, f1 = f1, func(x1)
+            if abs(x1 - x0) <= tolerance * max(abs(x1), 1.0) and abs(f1) <= 1e-9 * max(abs(f0), 1.0):
+                return x1
+    except (ValueError, ZeroDivisionError, OverflowError):
+        pass
+
+    # Scan a log-spaced grid on both signs for a sign change, then bisect it.
+    grid = [s * 10.0 ** (e / 4) for s in (1.0, -1.0) for e in range(-48, 49)]
+    previous = None
+    for x in grid:
+        try:
+            fx = func(x)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            previous = None
+            continue
+        if fx == 0:
+            return x
+        if previous is not None and (previous[1] < 0) != (fx < 0):
+            return _bisect(func, previous[0], x, previous[1])
+        previous = (x, fx)
+    raise ValueError("No solution found for the given inputs.")
+
+
+def _bisect(func, a, b, fa, max_iter=200):
+    for _ in range(max_iter):
+        mid = (a + b) / 2
+        fm = func(mid)
+        if fm == 0 or abs(b - a) <= 1e-15 * max(abs(mid), 1.0):
+            return mid
+        if (fa < 0) != (fm < 0):
+            b = mid
+        else:
+            a, fa = mid, fm
+    return (a + b) / 2
+
+
+def solve_law(compiled):
+    """Symbolically solves ``compiled`` for each variable; returns ``{var: [source, ...]}``.
+
+    Each branch is generated ``math`` source of a function ``branch(result, *others)``.
+    Complex branches and branches that need functions outside ``math``
+    (e.g. LambertW) are dropped, leaving those targets to the numeric solver.
+    """
+    import sympy as sp
+
+    result = sp.Symbol(compiled.result)
+    inverses = {}
+    for var in compiled.variables:
+        target = sp.Symbol(var)
+        inputs = [result] + [sp.Symbol(v) for v in compiled.variables if v != var]
+        try:
+            solutions = sp.solve(sp.Eq(result, sp.nsimplify(compiled.expr, rational=True)), target)
+        except (NotImplementedError, ValueError):
+            solutions = []
+        branches = []
+        for solution in solutions:
+            if solution.has(sp.I):
+                continue
+            try:
+                branches.append(generate_source(solution, inputs, "branch", "math"))
+            except NotImplementedError:
+                continue
+        inverses[var] = branches
+    return inverses
+
+
+def precompute_inverses():
+    """Solves every Law and rewrites the disk cache, dropping entries for changed formulas."""
+    cached = load_cache(INVERSE_CACHE_FILE)
+    entries = {}
+    for key, entry in iter_formulas():
+        if key[2] != "Laws":
+            continue
+        digest = formula_hash(entry)
+        entries[digest] = cached.get(digest) or solve_law(get_formula(*key))
+    save_cache(INVERSE_CACHE_FILE, entries)
+    _cached_entries.cache_clear()
+    return entries
+
+
+@lru_cache(maxsize=1)
+def _cached_entries():
+    return load_cache(INVERSE_CACHE_FILE)
+
+
+@lru_cache(maxsize=None)
+def _solved_law(discipline, section, name):
+    """Returns ``{var: [source, ...]}`` for a Law from the disk cache, solving and storing it on a miss."""
+    from .data import ENGINEERING_DATA
+
+    entry = ENGINEERING_DATA[discipline][section]["Laws"][name]
+    digest = formula_hash(entry)
+    solved = _cached_entries().get(digest)
+    if solved is None:
+        solved = solve_law(get_formula(discipline, section, "Laws", name))
+        _cached_entries()[digest] = solved
+        update_cache(INVERSE_CACHE_FILE, digest, solved)
+    return solved
+
+
+@lru_cache(maxsize=None)
+def get_inverse(discipline, section, name, target):
+    """Returns the compiled :class:`InverseFormula` of a Law for ``target``."""
+    forward = get_formula(discipline, section, "Laws", name)
+    if target not in forward.variables:
+        raise KeyError(f"'{target}' is not a variable of {name}.")
+    inputs = (forward.result,) + tuple(v for v in forward.variables if v != target)
+    branches = tuple(
+        load_source(source, "branch", {"math": math})
+        for source in _solved_law(discipline, section, name)[target]
+    )
+    return InverseFormula(forward=forward, target=target, inputs=inputs, branches=branches)
+
+
+def solve_for(discipline, section, name, target, values, guess=1.0):
+    """Solves a Law for ``target`` given its result and the remaining variables."""
+    return get_inverse(discipline, section, name, target).evaluate(values, guess)
+
@@ -0,0 +1,84 @@
+"""Cross-reference conversion tables: every unit of a category against every other.
+
+The factor matrix of a category is a single outer product of its unit
+factors, ``M[i, j]`` taking a value in unit ``i`` to unit ``j``. It is
+computed once per category, cached and shared read-only. Converting a whole
+column of values into every unit is then one broadcast multiply with a row
+of the matrix. Needs NumPy and pandas (and openpyxl for XLSX export), so it
+is not imported by ``hub_core`` itself.
+"""
+import io
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .data import ENGINEERING_DATA, UNIT_CATEGORIES
+
+TABLE_FORMATS = ("CSV", "XLSX")
+FLOAT_FORMAT = "%.10g"
+
+
+@dataclass(frozen=True)
+class ConversionMatrix:
+    """The N×N factor matrix of a category; ``factors[i, j]`` converts ``units[i]`` to ``units[j]``."""
+    units: tuple
+    factors: np.ndarray
+
+    def index(self, unit):
+        try:
+            return self.units.index(unit)
+        except ValueError:
+            raise KeyError(f"Unit '{unit}' not found.") from None
+
+    def factor(self, from_unit, to_unit):
+        return float(self.factors[self.index(from_unit), self.index(to_unit)])
+
+    def convert(self, values, from_unit):
+        """Converts ``values`` (in ``from_unit``) to every unit: one row per value, one column per unit."""
+        return np.multiply.outer(np.asarray(values, dtype=float), self.factors[self.index(from_unit)])
+
+    def to_frame(self):
+        """The factor matrix as a DataFrame, rows "from" and columns "to"."""
+        frame = pd.DataFrame(self.factors, index=self.units, columns=self.units)
+        frame.index.name = "From \\ To"
+        return frame
+
+    def table(self, values, from_unit):
+        """A conversion table of ``values`` into every unit, as a DataFrame."""
+        return pd.DataFrame(self.convert(values, from_unit), columns=self.units)
+
+
+def build_matrix(units, to_base):
+    """Builds the :class:`ConversionMatrix` of ``units`` given each unit's factor to a common base unit."""
+    to_base = np.asarray(to_base, dtype=float)
+    factors = np.outer(to_base, 1.0 / to_base)
+    factors.flags.writeable = False
+    return ConversionMatrix(tuple(units), factors)
+
+
+@lru_cache(maxsize=None)
+def category_matrix(category):
+    """The cached :class:`ConversionMatrix` of a ``UNIT_CATEGORIES`` category."""
+    units = UNIT_CATEGORIES[category]["units"]
+    return build_matrix(units.names, np.frombuffer(units.factors, dtype=float))
+
+
+@lru_cache(maxsize=None)
+def quantity_matrix(discipline, section, quantity):
+    """The cached :class:`ConversionMatrix` of an ``ENGINEERING_DATA`` physical quantity."""
+    units = ENGINEERING_DATA[discipline][section]["Physical Quantities"][quantity]["units"]
+    # Physical quantity tables hold units per base unit.
+    return build_matrix(units.names, 1.0 / np.frombuffer(units.factors, dtype=float))
+
+
+def export_table(frame, file_format, index=True):
+    """Serializes a table to CSV or XLSX bytes."""
+    if file_format == "CSV":
+        return frame.to_csv(index=index, float_format=FLOAT_FORMAT).encode("utf-8")
+    if file_format == "XLSX":
+        buffer = io.BytesIO()
+        frame.to_excel(buffer, index=index, sheet_name="Conversions")
+        return buffer.getvalue()
+    raise ValueError(f"Unknown table format '{file_format}'; expected one of {', '.join(TABLE_FORMATS)}.")
@@ -0,0 +1,53 @@
+"""Approximate memory held by per-session objects, for the app's session budget.
+
+:func:`deep_sizeof` walks containers and object attributes and adds up what
+one session owns. Objects shared by the whole process are not counted: the
+unit and formula registry (:mod:`hub_core.registry`), compiled formulas,
+modules, classes and functions. Arrays and frames report their buffer size
+(``nbytes`` / ``memory_usage``) instead of being walked.
+"""
+import sys
+import types
+from collections import deque
+
+from .formulas import CompiledFormula
+from .inverse import InverseFormula
+from .registry import LazyTable, Table
+
+SHARED_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+    Table, LazyTable, CompiledFormula, InverseFormula,
+)
+
+
+def deep_sizeof(obj):
+    """Bytes held by ``obj`` and everything it references that is not shared process-wide."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        if hasattr(item, "memory_usage") and callable(item.memory_usage):  # pandas
+            total += int(item.memory_usage(deep=True).sum())
+            continue
+        nbytes = getattr(item, "nbytes", None)
+        if isinstance(nbytes, int):  # NumPy arrays, memoryviews
+            total += nbytes
+            continue
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, bytearray, int, float, complex, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        if hasattr(item, "__dict__"):
+            stack.append(vars(item))
+        for slot in getattr(type(item), "__slots__", ()):
+            if hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return total
@@ -0,0 +1,137 @@
+"""Process-wide timing metrics for the hot paths of the app and the API.
+
+Recording is off until :func:`enable` is called (or ``HUB_METRICS=1`` is
+set); while off, :func:`timed` hands back one shared no-op context manager,
+so instrumented code pays a flag check and nothing else. Each metric keeps
+its last ``WINDOW`` samples for percentiles plus running totals, and can be
+rendered in the Prometheus text format for a scraper, either served
+directly or dumped to a file periodically.
+"""
+import contextlib
+import os
+import threading
+import time
+from collections import deque
+
+WINDOW = 1024
+PERCENTILES = (0.5, 0.9, 0.99)
+
+_enabled = os.environ.get("HUB_METRICS", "") not in ("", "0")
+_lock = threading.Lock()
+_samples = {}
+_totals = {}
+_NOOP = contextlib.nullcontext()
+
+
+def enable(on=True):
+    """Turns recording on or off for the whole process."""
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, seconds):
+    """Adds one sample of ``seconds`` to metric ``name``."""
+    if not _enabled:
+        return
+    with _lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=WINDOW)
+            _totals[name] = [0, 0.0]
+        samples.append(seconds)
+        totals = _totals[name]
+        totals[0] += 1
+        totals[1] += seconds
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def timed(name):
+    """Context manager recording the wall time of its body under ``name``."""
+    return _Timer(name) if _enabled else _NOOP
+
+
+def reset():
+    """Drops every recorded sample."""
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def snapshot():
+    """Returns ``{name: {"count", "sum", "p50", "p90", "p99"}}``; percentiles cover the last ``WINDOW`` samples."""
+    with _lock:
+        items = [(name, sorted(samples), tuple(_totals[name])) for name, samples in _samples.items()]
+    stats = {}
+    for name, ordered, (count, total) in sorted(items):
+        entry = {"count": count, "sum": total}
+        for q in PERCENTILES:
+            entry[f"p{round(q * 100)}"] = _percentile(ordered, q)
+        stats[name] = entry
+    return stats
+
+
+def render_text(prefix="hub"):
+    """Renders :func:`snapshot` as a Prometheus summary per metric, in seconds."""
+    lines = []
+    metric = f"{prefix}_duration_seconds"
+    lines.append(f"# TYPE {metric} summary")
+    for name, entry in snapshot().items():
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for q in PERCENTILES:
+            lines.append(f'{metric}{{name="{label}",quantile="{q}"}} {entry[f"p{round(q * 100)}"]:.9f}')
+        lines.append(f'{metric}_sum{{name="{label}"}} {entry["sum"]:.9f}')
+        lines.append(f'{metric}_count{{name="{label}"}} {entry["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    """Writes :func:`render_text` to ``path`` atomically (``{pid}`` in the path is filled in)."""
+    path = path.format(pid=os.getpid())
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_text())
+    os.replace(tmp, path)
+
+
+_dumpers = set()
+
+
+def start_dumping(path, interval=15.0):
+    """Dumps the metrics to ``path`` every ``interval`` seconds from a daemon thread (once per path and process)."""
+    key = (path, os.getpid())
+    with _lock:
+        if key in _dumpers:
+            return
+        _dumpers.add(key)
+
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                dump(path)
+            except OSError:
+                pass
+
+    threading.Thread(target=loop, name="hub-metrics-dump", daemon=True).start()
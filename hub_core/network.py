@@ -0,0 +1,233 @@
+"""Vectorized per-unit conversion for whole networks of buses and branches.
+
+Buses joined by lines share a voltage zone; transformers join zones. Each
+zone's base kV is found by walking the zone graph from one or more buses of
+known base, scaling by every transformer's rated voltage ratio on the way.
+Conversions are one array divide or multiply against per-element base
+arrays. Those are cached and, when the base MVA or one zone's base kV
+changes, refreshed only for the quantities and zones that changed. Needs
+NumPy and pandas, so it is not imported by ``hub_core`` itself.
+
+Bus table columns: ``bus`` plus any of ``voltage_kv``, ``current_a`` (or
+their ``_pu`` counterparts). Branch table columns: ``from_bus``, ``to_bus``,
+optional ``from_kv``/``to_kv`` (transformer rated voltages, blank for lines)
+and any of ``r_ohm``, ``x_ohm``, ``current_a``. Branch values are taken on
+the from-bus side, so transformer impedances are referred to that side.
+"""
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .per_unit import base_current, base_impedance
+
+ELEMENTS = ("bus", "branch")
+NETWORK_COLUMNS = (
+    ("voltage_kv", "voltage_pu", "Voltage"),
+    ("current_a", "current_pu", "Current"),
+    ("r_ohm", "r_pu", "Impedance"),
+    ("x_ohm", "x_pu", "Impedance"),
+)
+
+
+class PerUnitNetwork:
+    """Zone bases of a network and vectorized actual <-> per-unit conversion of its elements."""
+
+    def __init__(self, bus_ids, from_bus, to_bus, base_mva, bases, from_kv=None, to_kv=None):
+        """``bases`` maps bus id -> base kV for at least one bus of every island.
+
+        ``from_kv``/``to_kv`` hold transformer rated voltages (NaN for lines).
+        Where transformer paths form a loop with inconsistent ratios, the
+        zone keeps the base reached first.
+        """
+        self.bus_ids = np.asarray(bus_ids)
+        index = pd.Index(self.bus_ids)
+        if not index.is_unique:
+            raise ValueError("Bus ids must be unique.")
+        self.branch_from = index.get_indexer(np.asarray(from_bus))
+        self.branch_to = index.get_indexer(np.asarray(to_bus))
+        if (self.branch_from < 0).any() or (self.branch_to < 0).any():
+            raise ValueError("Every branch must connect two buses of the bus table.")
+        n_branches = len(self.branch_from)
+        from_kv = np.full(n_branches, np.nan) if from_kv is None else np.asarray(from_kv, dtype=float)
+        to_kv = np.full(n_branches, np.nan) if to_kv is None else np.asarray(to_kv, dtype=float)
+        is_transformer = np.isfinite(from_kv) & np.isfinite(to_kv)
+
+        self.bus_zone = _line_zones(len(self.bus_ids), self.branch_from[~is_transformer],
+                                    self.branch_to[~is_transformer])
+        self.branch_zone = self.bus_zone[self.branch_from]
+        self.n_zones = int(self.bus_zone.max()) + 1 if len(self.bus_zone) else 0
+
+        # Zone graph: one edge per transformer, walkable both ways.
+        self._neighbours = [[] for _ in range(self.n_zones)]
+        ratios = to_kv[is_transformer] / from_kv[is_transformer]
+        for a, b, ratio in zip(self.bus_zone[self.branch_from[is_transformer]],
+                               self.bus_zone[self.branch_to[is_transformer]], ratios):
+            if a != b:
+                self._neighbours[a].append((int(b), float(ratio)))
+                self._neighbours[b].append((int(a), 1.0 / float(ratio)))
+
+        seeds = {}
+        for bus, kv in bases.items():
+            position = index.get_indexer([bus])[0]
+            if position < 0:
+                raise ValueError(f"Base bus '{bus}' is not in the bus table.")
+            seeds[int(self.bus_zone[position])] = float(kv)
+        self.zone_base_kv = np.full(self.n_zones, np.nan)
+        self._children = [[] for _ in range(self.n_zones)]
+        self._fixed = set(seeds)
+        for zone, kv in seeds.items():
+            self.zone_base_kv[zone] = kv
+        self._propagate(list(seeds))
+        unreached = np.flatnonzero(np.isnan(self.zone_base_kv))
+        if unreached.size:
+            buses = self.bus_ids[np.isin(self.bus_zone, unreached)][:5]
+            raise ValueError(f"No base kV reaches the zone(s) of bus(es) {', '.join(map(str, buses))}; "
+                             "give a base for a bus in each island.")
+
+        self.base_mva = float(base_mva)
+        self._zone_bases = {}
+        self._element_bases = {}
+
+    @classmethod
+    def from_tables(cls, buses, branches, base_mva, bases):
+        """Builds a network from bus and branch DataFrames (see the module docstring)."""
+        return cls(
+            buses["bus"].to_numpy(),
+            branches["from_bus"].to_numpy(),
+            branches["to_bus"].to_numpy(),
+            base_mva,
+            bases,
+            from_kv=pd.to_numeric(branches["from_kv"], errors="coerce").to_numpy() if "from_kv" in branches else None,
+            to_kv=pd.to_numeric(branches["to_kv"], errors="coerce").to_numpy() if "to_kv" in branches else None,
+        )
+
+    def _propagate(self, roots):
+        """Breadth-first walk from ``roots`` assigning base kV to every zone not yet reached.
+
+        Records the walk as a tree so a later base change can re-walk only
+        the zones below the changed one. Returns the zones it assigned.
+        """
+        queue = deque(roots)
+        assigned = []
+        while queue:
+            zone = queue.popleft()
+            for neighbour, ratio in self._neighbours[zone]:
+                if np.isnan(self.zone_base_kv[neighbour]):
+                    self.zone_base_kv[neighbour] = self.zone_base_kv[zone] * ratio
+                    self._children[zone].append(neighbour)
+                    assigned.append(neighbour)
+                    queue.append(neighbour)
+        return assigned
+
+    def _subtree(self, zone):
+        zones = [zone]
+        for z in zones:
+            zones.extend(child for child in self._children[z] if child not in self._fixed)
+        return zones
+
+    def set_base_mva(self, base_mva):
+        """Changes the system MVA base. Voltage bases are kept; impedance and current bases rescale."""
+        base_mva = float(base_mva)
+        if base_mva == self.base_mva:
+            return
+        scale = self.base_mva / base_mva
+        self.base_mva = base_mva
+        for quantity, factor in (("Impedance", scale), ("Current", 1.0 / scale)):
+            if quantity in self._zone_bases:
+                self._zone_bases[quantity] *= factor
+            for element in ELEMENTS:
+                if (element, quantity) in self._element_bases:
+                    self._element_bases[element, quantity] *= factor
+
+    def set_zone_base(self, zone, base_kv):
+        """Sets one zone's base kV and re-derives the zones reached through it.
+
+        Zones upstream of ``zone``, and zones seeded with their own base, keep
+        their bases. Returns the indices of the zones whose base changed.
+        """
+        zone = int(zone)
+        scale = float(base_kv) / self.zone_base_kv[zone]
+        if scale == 1.0:
+            return np.array([], dtype=int)
+        affected = self._subtree(zone)
+        self.zone_base_kv[affected] *= scale
+        changed = np.zeros(self.n_zones, dtype=bool)
+        changed[affected] = True
+        for quantity in list(self._zone_bases):
+            self._zone_bases[quantity][changed] = self._zone_base_values(quantity, changed)
+        for (element, quantity), values in self._element_bases.items():
+            rows = changed[self.element_zone(element)]
+            values[rows] = self._zone_bases[quantity][self.element_zone(element)[rows]]
+        return np.flatnonzero(changed)
+
+    def _zone_base_values(self, quantity, zones=slice(None)):
+        kv = self.zone_base_kv[zones]
+        if quantity == "Impedance":
+            return base_impedance(self.base_mva, kv)
+        if quantity == "Current":
+            return base_current(self.base_mva, kv)
+        if quantity == "Voltage":
+            return kv.copy()
+        raise ValueError(f"Unknown per-unit quantity '{quantity}'.")
+
+    def zone_bases(self, quantity):
+        """Base value of ``quantity`` for every zone."""
+        if quantity not in self._zone_bases:
+            self._zone_bases[quantity] = self._zone_base_values(quantity)
+        return self._zone_bases[quantity]
+
+    def element_zone(self, element):
+        """Zone index of every bus or branch."""
+        if element not in ELEMENTS:
+            raise ValueError(f"Unknown network element '{element}'.")
+        return self.bus_zone if element == "bus" else self.branch_zone
+
+    def base_values(self, element, quantity):
+        """Base value of ``quantity`` for every bus or branch."""
+        key = (element, quantity)
+        if key not in self._element_bases:
+            self._element_bases[key] = self.zone_bases(quantity)[self.element_zone(element)]
+        return self._element_bases[key]
+
+    def to_per_unit(self, actual, element, quantity):
+        """Converts one actual value per bus or branch (Ω, A or kV L-L) to per-unit."""
+        return np.asarray(actual, dtype=float) / self.base_values(element, quantity)
+
+    def from_per_unit(self, pu, element, quantity):
+        """Converts one per-unit value per bus or branch back to its actual value."""
+        return np.asarray(pu, dtype=float) * self.base_values(element, quantity)
+
+    def convert_table(self, table, element, direction="to_pu"):
+        """Returns ``table`` with its zone, base kV and the converted ``NETWORK_COLUMNS`` appended."""
+        if direction not in ("to_pu", "from_pu"):
+            raise ValueError("'direction' must be 'to_pu' or 'from_pu'.")
+        zones = self.element_zone(element)
+        result = table.copy()
+        result["zone"] = zones
+        result["base_kv"] = self.zone_base_kv[zones]
+        for actual, pu, quantity in NETWORK_COLUMNS:
+            source, target = (actual, pu) if direction == "to_pu" else (pu, actual)
+            if source in table:
+                values = pd.to_numeric(table[source], errors="coerce").to_numpy()
+                convert = self.to_per_unit if direction == "to_pu" else self.from_per_unit
+                result[target] = convert(values, element, quantity)
+        return result
+
+
+def _line_zones(n_buses, from_index, to_index):
+    """Labels the connected components of the bus graph formed by lines, numbered 0..n-1."""
+    parent = list(range(n_buses))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in zip(from_index.tolist(), to_index.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+    roots = np.fromiter((find(i) for i in range(n_buses)), dtype=np.int64, count=n_buses)
+    return np.unique(roots, return_inverse=True)[1].reshape(-1)
@@ -0,0 +1,36 @@
+"""Three-phase per-unit system: base values and actual <-> per-unit conversion."""
+import math
+
+PER_UNIT_QUANTITIES = ("Impedance", "Current", "Voltage")
+ACTUAL_UNITS = {"Impedance": "Ω", "Current": "A", "Voltage": "kV"}
+
+
+def base_impedance(base_mva, base_kv):
+    """Base impedance in Ω from the system MVA and line-to-line kV bases."""
+    return (base_kv ** 2) / base_mva
+
+
+def base_current(base_mva, base_kv):
+    """Base current in A from the system MVA and line-to-line kV bases."""
+    return (base_mva * 1000) / (math.sqrt(3) * base_kv)
+
+
+def base_value(quantity, base_mva, base_kv):
+    """Base value of ``quantity`` ("Impedance", "Current" or "Voltage")."""
+    if quantity == "Impedance":
+        return base_impedance(base_mva, base_kv)
+    if quantity == "Current":
+        return base_current(base_mva, base_kv)
+    if quantity == "Voltage":
+        return base_kv
+    raise ValueError(f"Unknown per-unit quantity '{quantity}'.")
+
+
+def to_per_unit(actual, quantity, base_mva, base_kv):
+    """Converts an actual value (Ω, A or kV L-L) to per-unit."""
+    return actual / base_value(quantity, base_mva, base_kv)
+
+
+def from_per_unit(pu, quantity, base_mva, base_kv):
+    """Converts a per-unit value back to its actual value (Ω, A or kV L-L)."""
+    return pu * base_value(quantity, base_mva, base_kv)
@@ -0,0 +1,229 @@
+"""Read-only registry of the unit tables and formulas, loaded from versioned data files.
+
+The tables live as JSON under ``hub_core/tables``: ``index.json`` names the
+unit category file and one file per discipline. Each file is turned into
+nested :class:`Table` mappings with interned keys, precomputed key lists
+(``names`` in file order, ``sorted_names``) and, for unit tables, factors
+packed into an ``array('d')``. Disciplines are only read when first
+accessed; the quantity and unit names of every discipline are also kept in a
+small manifest (``names.json``) so that indexing them loads no discipline.
+The result is built once per process and never mutated, so every session and
+thread can share it.
+"""
+import json
+import os
+import sys
+import threading
+from array import array
+from collections.abc import Mapping
+
+TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+REGISTRY_FORMAT = 1
+LINEAR_LOOKUP = 16
+
+
+class Table(Mapping):
+    """An immutable, ordered mapping with precomputed key lists.
+
+    Tables of up to ``LINEAR_LOOKUP`` entries find keys by scanning
+    ``names`` (a few interned-string comparisons) instead of keeping a hash
+    index, which would cost more memory than the entries themselves.
+    """
+    __slots__ = ("names", "_sorted", "_index", "_values")
+
+    def __init__(self, items=()):
+        items = list(items.items() if isinstance(items, Mapping) else items)
+        self.names = tuple(sys.intern(key) for key, _ in items)
+        self._sorted = None
+        self._index = {key: i for i, key in enumerate(self.names)} if len(items) > LINEAR_LOOKUP else None
+        self._values = self._pack([value for _, value in items])
+
+    def _pack(self, values):
+        return tuple(values)
+
+    def _position(self, key):
+        if self._index is not None:
+            return self._index[key]
+        try:
+            return self.names.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+
+    @property
+    def sorted_names(self):
+        """``names`` in sorted order, computed once."""
+        if self._sorted is None:
+            self._sorted = tuple(sorted(self.names))
+        return self._sorted
+
+    def __getitem__(self, key):
+        return self._values[self._position(key)]
+
+    def __contains__(self, key):
+        return key in self._index if self._index is not None else key in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class UnitTable(Table):
+    """A unit label -> factor table whose factors live in a shared ``array('d')`` pool.
+
+    Every unit table of a data file appends its factors to the same pool, so
+    a factor costs 8 bytes instead of a float object.
+    """
+    __slots__ = ("_start",)
+
+    def __init__(self, items=(), pool=None):
+        self._start = None
+        self._values = array("d") if pool is None else pool
+        super().__init__(items)
+
+    def _pack(self, values):
+        self._start = len(self._values)
+        self._values.extend(float(value) for value in values)
+        return self._values
+
+    def __getitem__(self, key):
+        return self._values[self._start + self._position(key)]
+
+    @property
+    def factors(self):
+        """The factors in ``names`` order, as a read-only buffer of doubles (e.g. for ``numpy.frombuffer``)."""
+        return memoryview(self._values)[self._start:self._start + len(self.names)].toreadonly()
+
+
+class LazyTable(Mapping):
+    """A read-only mapping whose keys are known up front and whose values are loaded on first access."""
+    __slots__ = ("names", "sorted_names", "_load", "_loaded", "_lock")
+
+    def __init__(self, names, load):
+        self.names = tuple(sys.intern(name) for name in names)
+        self.sorted_names = tuple(sorted(self.names))
+        self._load = load
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        value = self._loaded.get(key)
+        if value is None:
+            if key not in self.names:
+                raise KeyError(key)
+            with self._lock:
+                value = self._loaded.get(key)
+                if value is None:
+                    value = self._loaded[key] = self._load(key)
+        return value
+
+    def __contains__(self, key):
+        return key in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def loaded(self):
+        """Keys whose values have been loaded so far."""
+        return tuple(name for name in self.names if name in self._loaded)
+
+
+def freeze(value, key=None, pool=None):
+    """Turns parsed JSON into :class:`Table` (``"units"`` objects into :class:`UnitTable`) and tuples.
+
+    Keys and strings inside lists are interned: the same unit, quantity and
+    variable names recur all over the tables. Unit factors are appended to
+    ``pool``, one ``array('d')`` per data file.
+    """
+    if pool is None:
+        pool = array("d")
+    if isinstance(value, dict):
+        if key == "units":
+            return UnitTable(value, pool)
+        return Table((name, freeze(item, name, pool)) for name, item in value.items())
+    if isinstance(value, list):
+        return tuple(sys.intern(item) if isinstance(item, str) else freeze(item, pool=pool) for item in value)
+    return value
+
+
+def read_table_file(path):
+    """Reads one data file, checking its format version."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != REGISTRY_FORMAT:
+        raise ValueError(f"{path}: unsupported table format {data.get('format')!r} (expected {REGISTRY_FORMAT}).")
+    return data
+
+
+def load_registry(directory=TABLES_DIR):
+    """Loads ``(version, unit_categories, engineering_data)`` from the data files in ``directory``.
+
+    The unit categories are read right away; ``engineering_data`` is a
+    :class:`LazyTable` reading each discipline's file on first access.
+    """
+    index = read_table_file(os.path.join(directory, "index.json"))
+    unit_categories = freeze(read_table_file(os.path.join(directory, index["unit_categories"]))["categories"])
+    files = index["disciplines"]
+
+    def load_discipline(discipline):
+        data = read_table_file(os.path.join(directory, files[discipline]))
+        if data.get("discipline") != discipline:
+            raise ValueError(f"{files[discipline]} holds '{data.get('discipline')}', not '{discipline}'.")
+        return freeze(data["sections"])
+
+    return index["version"], unit_categories, LazyTable(files, load_discipline)
+
+
+def read_quantity_names(directory=TABLES_DIR):
+    """Collects ``{discipline: {section: {quantity: [unit, ...]}}}`` from the discipline files.
+
+    This is what ``names.json`` must hold; regenerate it with
+    ``python -m hub_core.registry`` after editing a discipline's quantities.
+    """
+    index = read_table_file(os.path.join(directory, "index.json"))
+    names = {}
+    for discipline, file_name in index["disciplines"].items():
+        sections = read_table_file(os.path.join(directory, file_name))["sections"]
+        names[discipline] = {
+            section: {quantity: list(q["units"]) for quantity, q in data.get("Physical Quantities", {}).items()}
+            for section, data in sections.items()
+        }
+    return names
+
+
+def load_quantity_names(directory=TABLES_DIR):
+    """Loads the quantity and unit names of every discipline without loading the disciplines.
+
+    Reads the manifest named by ``index.json``, falling back to the
+    discipline files themselves for table directories without one.
+    """
+    index = read_table_file(os.path.join(directory, "index.json"))
+    if "quantity_names" not in index:
+        return freeze(read_quantity_names(directory))
+    return freeze(read_table_file(os.path.join(directory, index["quantity_names"]))["disciplines"])
+
+
+def load_affine_categories(directory=TABLES_DIR):
+    """Loads the affine unit categories (offset and logarithmic units, see :mod:`hub_core.affine`).
+
+    Their transforms stay exact decimal or fraction strings here; they are
+    parsed when a conversion is first composed.
+    """
+    index = read_table_file(os.path.join(directory, "index.json"))
+    if "affine_categories" not in index:
+        return Table()
+    return freeze(read_table_file(os.path.join(directory, index["affine_categories"]))["categories"])
+
+
+if __name__ == "__main__":
+    with open(os.path.join(TABLES_DIR, "names.json"), "w", encoding="utf-8") as f:
+        json.dump({"format": REGISTRY_FORMAT, "disciplines": read_quantity_names()}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
@@ -0,0 +1,408 @@
+"""Time-bounded formula work in a small pool of worker processes.
+
+Parsing a formula with SymPy, solving a Law symbolically or root-finding an
+inverse can take arbitrarily long for a pathological expression, and a
+Python thread cannot be interrupted. :class:`FormulaSandbox` therefore runs
+such calls in separate worker processes: at most ``max_workers`` at a time,
+each with a timeout after which its worker is killed (and replaced on the
+next call), so a slow formula costs its caller a clear
+:class:`FormulaTimeout` and never holds a worker, or any other session's
+request, for longer than that. Calls wait for a worker in submission order,
+and :meth:`FormulaSandbox.cancel` stops a queued or running one.
+
+Formula text is checked with :func:`check_formula` before it reaches SymPy:
+only arithmetic, the declared variables and a short list of functions are
+accepted, within caps on length, size and constant exponents.
+"""
+import ast
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as WaitTimeout
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .cache import formula_hash
+from .data import ENGINEERING_DATA
+from .formulas import (
+    cache_formula_source,
+    cached_formula_source,
+    formula_from_source,
+    generate_formula_source,
+    get_formula_in_units,
+    split_formula,
+    unit_scales,
+)
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_TIMEOUT = float(os.environ.get("HUB_FORMULA_TIMEOUT", "5"))
+MAX_FORMULA_LENGTH = 500
+MAX_FORMULA_NODES = 200
+MAX_EXPONENT = 1000
+MAX_CONSTANT = 1e300
+# Extra seconds a caller waits past a call's queue and run timeouts before giving up on it,
+# covering a worker that has to be started first.
+RESULT_MARGIN = 10.0
+FUNCTIONS = frozenset({
+    "sqrt", "exp", "log", "ln", "sin", "cos", "tan", "asin", "acos", "atan", "atan2",
+    "sinh", "cosh", "tanh", "Abs", "sign", "Min", "Max",
+})
+CONSTANTS = frozenset({"pi"})
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd)
+
+
+# Set in children forked from this process (see FormulaSandbox).
+_forked = False
+
+
+def _mark_forked():
+    global _forked
+    _forked = True
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_mark_forked)
+
+
+class FormulaTimeout(TimeoutError):
+    """A sandboxed call ran, or waited for a worker, longer than allowed."""
+
+
+class SandboxError(RuntimeError):
+    """A sandbox worker died while running a call, e.g. when its memory limit was hit."""
+
+
+def _constant_value(node):
+    """The float value of a subtree made of numbers only, or ``None`` if it uses a name."""
+    if isinstance(node, ast.Constant):
+        try:
+            return float(node.value)
+        except OverflowError:
+            raise ValueError("The formula contains an overflowing constant.") from None
+    if isinstance(node, ast.UnaryOp):
+        operand = _constant_value(node.operand)
+        return None if operand is None else (-operand if isinstance(node.op, ast.USub) else operand)
+    if isinstance(node, ast.BinOp):
+        left, right = _constant_value(node.left), _constant_value(node.right)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Pow) and abs(right) > MAX_EXPONENT:
+            raise ValueError(f"Exponents are limited to ±{MAX_EXPONENT}.")
+        try:
+            value = {ast.Add: left + right, ast.Sub: left - right, ast.Mult: left * right}.get(type(node.op))
+            if value is None:
+                value = left / right if isinstance(node.op, ast.Div) else left ** right
+        except (ZeroDivisionError, OverflowError):
+            raise ValueError("The formula contains an invalid or overflowing constant.") from None
+        if isinstance(value, complex) or abs(value) > MAX_CONSTANT:
+            raise ValueError("The formula contains an invalid or overflowing constant.")
+        return value
+    return None
+
+
+def check_formula(formula, variables):
+    """Rejects formula text that is not plain, bounded arithmetic over ``variables``.
+
+    Raises ``ValueError`` naming the first problem found; returns the parsed
+    right-hand side otherwise.
+    """
+    if len(formula) > MAX_FORMULA_LENGTH:
+        raise ValueError(f"Formulas are limited to {MAX_FORMULA_LENGTH} characters.")
+    lhs, rhs = split_formula(formula)
+    if lhs and not lhs.isidentifier():
+        raise ValueError(f"'{lhs}' is not a valid result name.")
+    try:
+        tree = ast.parse(rhs, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid formula: {e.msg}.") from None
+    names = set(variables)
+    nodes = list(ast.walk(tree))
+    if len(nodes) > MAX_FORMULA_NODES:
+        raise ValueError(f"Formulas are limited to {MAX_FORMULA_NODES} terms.")
+    for node in nodes:
+        if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + _OPERATORS):
+            if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+                _constant_value(node)
+                exponent = _constant_value(node.right)
+                if exponent is not None and abs(exponent) > MAX_EXPONENT:
+                    raise ValueError(f"Exponents are limited to ±{MAX_EXPONENT}.")
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise ValueError("Only numeric constants are allowed.")
+            if abs(node.value) > MAX_CONSTANT:
+                raise ValueError("The formula contains an overflowing constant.")
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise ValueError(f"Only these functions are allowed: {', '.join(sorted(FUNCTIONS))}.")
+        elif isinstance(node, ast.Name):
+            if node.id not in names and node.id not in FUNCTIONS and node.id not in CONSTANTS:
+                raise ValueError(f"'{node.id}' is not a declared variable.")
+        else:
+            raise ValueError(f"'{type(node).__name__}' is not allowed in a formula.")
+    return tree
+
+
+def _serve(conn, memory_limit):
+    """Worker loop: runs ``(func, args)`` requests and sends back ``(ok, result or exception)``."""
+    if memory_limit:
+        try:
+            import resource
+
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ImportError, ValueError, OSError):
+            pass
+    while True:
+        try:
+            func, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = (True, func(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # The result or exception would not pickle; report it as text.
+            conn.send((False, SandboxError(f"{type(e).__name__}: {e}")))
+
+
+class _Worker:
+    def __init__(self, context, memory_limit):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, memory_limit), name="hub-sandbox-worker",
+                                       daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+@dataclass
+class _Call:
+    func: object
+    args: tuple
+    timeout: float
+    submitted: float
+    worker: _Worker = None
+    cancelled: bool = False
+
+
+class FormulaSandbox:
+    """A bounded pool of worker processes running calls with a timeout each.
+
+    ``queue_timeout`` bounds how long a call may wait for a free worker
+    (default: the call's own timeout). ``memory_limit`` caps each worker's
+    address space in bytes where the platform supports it.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT, queue_timeout=None,
+                 memory_limit=None):
+        # Workers never fork the (threaded) server process itself; with a fork
+        # server they are forked from one that has already imported hub_core.
+        # A forked child (e.g. a pre-forked API worker) cannot use the fork
+        # server its parent started, so it spawns its workers instead.
+        if "forkserver" in multiprocessing.get_all_start_methods() and not _forked:
+            self._context = multiprocessing.get_context("forkserver")
+            self._context.set_forkserver_preload([__name__])
+        else:
+            self._context = multiprocessing.get_context("spawn")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.memory_limit = memory_limit
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="hub-sandbox")
+        self._lock = threading.Lock()
+        self._idle = []
+        self._calls = {}
+
+    def submit(self, func, *args, timeout=None):
+        """Queues ``func(*args)`` for a worker; returns a ``concurrent.futures.Future``.
+
+        ``func`` and its arguments are pickled, so ``func`` must be importable
+        by name (a module-level function).
+        """
+        call = _Call(func, args, self.timeout if timeout is None else timeout, time.monotonic())
+        future = self._executor.submit(self._run, call)
+        self._calls[future] = call
+        future.add_done_callback(lambda f: self._calls.pop(f, None))
+        return future
+
+    def call(self, func, *args, timeout=None):
+        """Runs ``func(*args)`` in a worker and returns its result, re-raising its exception.
+
+        Raises :class:`FormulaTimeout` when it runs longer than ``timeout``
+        seconds (default: the sandbox's) or cannot get a worker in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(func, *args, timeout=timeout)
+        queue_timeout = timeout if self.queue_timeout is None else self.queue_timeout
+        try:
+            return future.result(queue_timeout + timeout + RESULT_MARGIN)
+        except WaitTimeout:
+            if future.done():  # a FormulaTimeout raised by the call itself
+                raise
+            self.cancel(future)
+            raise FormulaTimeout(f"The formula did not finish within {timeout:g} s and was stopped.") from None
+
+    def cancel(self, future):
+        """Cancels a queued call, or kills the worker of a running one; ``False`` if it already finished."""
+        if future.cancel():
+            return True
+        call = self._calls.get(future)
+        if call is None or future.done():
+            return False
+        with self._lock:
+            call.cancelled = True
+            # Signalled under the lock, so the worker cannot have been handed to another call yet;
+            # the running call sees its pipe close and replaces it.
+            if call.worker is not None:
+                call.worker.process.kill()
+        return True
+
+    def _run(self, call):
+        waited = time.monotonic() - call.submitted
+        queue_timeout = call.timeout if self.queue_timeout is None else self.queue_timeout
+        if waited > queue_timeout:
+            raise FormulaTimeout(f"No formula worker became free within {queue_timeout:g} s; try again shortly.")
+        with self._lock:
+            if call.cancelled:
+                raise CancelledError()
+            worker = self._idle.pop() if self._idle else None
+        if worker is not None and not worker.process.is_alive():
+            worker.kill()
+            worker = None
+        if worker is None:
+            worker = _Worker(self._context, self.memory_limit)
+        # Published under the lock, so cancel() either sees the worker or has already marked the call.
+        with self._lock:
+            cancelled = call.cancelled
+            if not cancelled:
+                call.worker = worker
+        if cancelled:
+            self._release(worker)
+            raise CancelledError()
+        try:
+            worker.conn.send((call.func, call.args))
+            if not worker.conn.poll(call.timeout):
+                worker.kill()
+                self._replace()
+                raise FormulaTimeout(f"The formula took longer than {call.timeout:g} s and was stopped.")
+            ok, value = worker.conn.recv()
+        except FormulaTimeout:
+            raise
+        except (EOFError, OSError):
+            worker.kill()
+            self._replace()
+            if call.cancelled:
+                raise CancelledError() from None
+            raise SandboxError("The formula worker stopped unexpectedly (out of memory?).") from None
+        except BaseException:
+            # The call itself could not be sent (e.g. it does not pickle); the worker is still usable.
+            self._finish(call, worker)
+            raise
+        self._finish(call, worker)
+        if not ok:
+            raise value
+        return value
+
+    def _finish(self, call, worker):
+        """Detaches ``worker`` from ``call`` under the lock cancel() uses, then returns it to the pool."""
+        with self._lock:
+            call.worker = None
+        self._release(worker)
+
+    def _release(self, worker):
+        with self._lock:
+            if len(self._idle) < self.max_workers:
+                self._idle.append(worker)
+                return
+        worker.kill()
+
+    def _replace(self):
+        """Starts a replacement for a killed worker in the background, so the next call need not wait for it."""
+        threading.Thread(target=lambda: self._release(_Worker(self._context, self.memory_limit)),
+                         name="hub-sandbox-spawn", daemon=True).start()
+
+    def shutdown(self):
+        """Stops accepting calls and kills every worker."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.kill()
+
+
+def get_sandbox():
+    """The process-wide :class:`FormulaSandbox`, created on first use and shared by every session.
+
+    A forked child (e.g. a pre-forked API worker) gets a sandbox of its own:
+    the parent's executor threads do not exist in the child and its worker
+    pipes must not be shared.
+    """
+    return _process_sandbox(os.getpid())
+
+
+@lru_cache(maxsize=1)
+def _process_sandbox(pid):
+    return FormulaSandbox()
+
+
+def compile_formula_safely(name, entry, scales=(), timeout=None):
+    """Like :func:`~hub_core.formulas.compile_formula`, with the SymPy parse done in the sandbox.
+
+    ``entry`` is checked with :func:`check_formula` first. Formulas in the
+    disk cache load without touching the sandbox.
+    """
+    check_formula(entry["formula"], entry.get("variables", ()))
+    sources = cached_formula_source(entry, scales)
+    if sources is None:
+        try:
+            sources = get_sandbox().call(generate_formula_source, entry, scales, timeout=timeout)
+        except NotImplementedError as e:
+            raise ValueError(f"{name} cannot be compiled: {e}") from None
+        cache_formula_source(formula_hash(entry, scales), sources)
+    return formula_from_source(name, entry, sources, scales)
+
+
+@lru_cache(maxsize=256)
+def get_formula_safely(discipline, section, kind, name, units=()):
+    """Sandboxed counterpart of :func:`~hub_core.formulas.get_formula_in_units`."""
+    factors = unit_scales(discipline, section, kind, name, units)
+    scales = tuple(sorted((var, factor) for var, factor in factors.items() if factor != 1.0))
+    return compile_formula_safely(name, ENGINEERING_DATA[discipline][section][kind][name], scales)
+
+
+def _evaluate(discipline, section, kind, name, units, values, target):
+    """Worker side of :func:`evaluate_safely`."""
+    from .inverse import find_root, get_inverse
+
+    compiled = get_formula_in_units(discipline, section, kind, name, units)
+    if target is None or target == compiled.result:
+        return compiled.evaluate_value(values), True
+    # Inverses are solved in base units; convert in and out around them.
+    scales = unit_scales(discipline, section, kind, name, units)
+    base = {var: value * scales.get(var, 1.0) for var, value in values.items()}
+    if kind == "Laws":
+        result, closed_form = get_inverse(discipline, section, name, target).solve(base)
+    else:
+        forward = get_formula_in_units(discipline, section, kind, name)
+        expected = base[forward.result]
+        result = find_root(lambda x: forward.evaluate({**base, target: x}) - expected)
+        closed_form = False
+    return float(result) / scales.get(target, 1.0), closed_form
+
+
+def evaluate_safely(discipline, section, kind, name, values, units=(), target=None, timeout=None):
+    """Evaluates a formula, or solves it for ``target``, in the sandbox.
+
+    Returns ``(value, closed_form)``; ``closed_form`` is ``False`` when the
+    target had to be solved numerically.
+    """
+    return get_sandbox().call(_evaluate, discipline, section, kind, name, tuple(units), dict(values), target,
+                              timeout=timeout)
@@ -0,0 +1,192 @@
+"""Fuzzy search over every unit, quantity and category of the hub.
+
+Each searchable term (a unit label, its symbol, a quantity or category
+name) is normalized so that "W/m²·K", "W/m2K" and "w/m^2 k" are the same
+string, then indexed by its trigrams and by its one- and two-character
+prefixes. A query intersects the trigram postings and checks the few
+remaining candidates; when nothing contains the query verbatim, terms are
+ranked by trigram overlap instead, which absorbs typos. Lookups touch only
+the postings of the query's own grams, so they stay far below a millisecond
+for tens of thousands of units.
+"""
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .conversion import unit_symbol
+from .data import AFFINE_CATEGORIES, QUANTITY_NAMES, UNIT_CATEGORIES
+from .temperature import TEMPERATURE, TEMPERATURE_UNITS
+
+GRAM = 3
+PREFIX_LENGTHS = (1, 2)
+MIN_SIMILARITY = 0.4
+_FOLD = str.maketrans({"²": "2", "³": "3", "µ": "u", "μ": "u", "°": None, "·": None, "⋅": None,
+                       "*": None, "^": None, " ": None, "-": None, "_": None})
+
+# Match quality, best first.
+EXACT, PREFIX, SUBSTRING, FUZZY = range(4)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One searchable unit, quantity or category.
+
+    ``kind`` is "category" or "unit" (``UNIT_CATEGORIES``), "temperature", or
+    "quantity" or "quantity_unit" (``ENGINEERING_DATA``, indexed from ``QUANTITY_NAMES``). ``path`` locates it:
+    ``(category[, unit])``, ``(unit,)`` or ``(discipline, section, quantity[, unit])``.
+    """
+    kind: str
+    path: tuple
+    label: str
+
+    @property
+    def unit(self):
+        return self.path[-1] if self.kind in ("unit", "temperature", "quantity_unit") else None
+
+
+def normalize(text):
+    """Search form of a unit or name: case-folded, without spaces, separators or degree signs."""
+    return text.casefold().translate(_FOLD)
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class SearchIndex:
+    """Trigram and prefix index over ``(SearchHit, terms)`` pairs."""
+
+    def __init__(self, items):
+        items = tuple(items)
+        self.entries = tuple(entry for entry, _terms in items)
+        self._terms = []
+        self._term_entry = []
+        grams, prefixes = {}, {}
+        for entry_id, (_entry, terms) in enumerate(items):
+            for term in {normalize(t) for t in terms if t}:
+                term_id = len(self._terms)
+                self._terms.append(term)
+                self._term_entry.append(entry_id)
+                for gram in _grams(term):
+                    grams.setdefault(gram, []).append(term_id)
+                for n in PREFIX_LENGTHS:
+                    if len(term) >= n:
+                        prefixes.setdefault(term[:n], []).append(term_id)
+        self._grams = {gram: frozenset(ids) for gram, ids in grams.items()}
+        # Prefix postings are kept in rank order (shortest term first, so an
+        # exact match leads), letting short queries stop after ``limit`` hits.
+        self._prefixes = {prefix: tuple(sorted(ids, key=lambda t: (len(self._terms[t]), self._term_entry[t])))
+                          for prefix, ids in prefixes.items()}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _candidates(self, query):
+        """Term ids containing ``query``."""
+        postings = []
+        for gram in _grams(query):
+            ids = self._grams.get(gram)
+            if ids is None:
+                return ()
+            postings.append(ids)
+        postings.sort(key=len)
+        matches = postings[0].intersection(*postings[1:])
+        return [term_id for term_id in matches if query in self._terms[term_id]]
+
+    def _similar(self, query):
+        """``(term_id, dice)`` for terms sharing enough trigrams with ``query``."""
+        query_grams = _grams(query)
+        if not query_grams:
+            return []
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._grams.get(gram, ()))
+        similar = []
+        for term_id, count in shared.items():
+            dice = 2 * count / (len(query_grams) + max(len(self._terms[term_id]) - GRAM + 1, 1))
+            if dice >= MIN_SIMILARITY:
+                similar.append((term_id, dice))
+        return similar
+
+    def search(self, query, limit=20):
+        """Returns up to ``limit`` :class:`SearchHit` matching ``query``, best first.
+
+        Exact term matches rank above prefix matches, then substring matches,
+        then fuzzy matches by trigram similarity; ties go to the shorter term.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        if len(query) < GRAM:
+            return self._search_prefix(query, limit)
+        best = {}
+        scored = [(term_id, None) for term_id in self._candidates(query)]
+        if not scored:
+            scored = self._similar(query)
+        for term_id, similarity in scored:
+            term = self._terms[term_id]
+            if similarity is not None:
+                quality = (FUZZY, -similarity)
+            elif term == query:
+                quality = (EXACT, 0)
+            elif term.startswith(query):
+                quality = (PREFIX, 0)
+            else:
+                quality = (SUBSTRING, 0)
+            entry_id = self._term_entry[term_id]
+            score = (*quality, len(term), entry_id)
+            if entry_id not in best or score < best[entry_id]:
+                best[entry_id] = score
+        ranked = sorted(best, key=best.__getitem__)
+        return [self.entries[entry_id] for entry_id in ranked[:limit]]
+
+    def _search_prefix(self, query, limit):
+        """Queries shorter than a trigram match term prefixes only."""
+        hits, seen = [], set()
+        for term_id in self._prefixes.get(query, ()):
+            entry_id = self._term_entry[term_id]
+            if entry_id not in seen:
+                seen.add(entry_id)
+                hits.append(self.entries[entry_id])
+                if len(hits) == limit:
+                    break
+        return hits
+
+
+def iter_search_entries(unit_categories=UNIT_CATEGORIES, quantity_names=QUANTITY_NAMES):
+    """Yields ``(SearchHit, terms)`` for every category, unit and engineering quantity.
+
+    Engineering quantities come from the names manifest, so building the
+    index does not load any discipline of ``ENGINEERING_DATA``.
+    """
+    for category, data in unit_categories.items():
+        yield SearchHit("category", (category,), category), (category,)
+        for unit in data["units"]:
+            yield SearchHit("unit", (category, unit), f"{unit} · {category}"), (unit, unit_symbol(unit))
+    for category, data in AFFINE_CATEGORIES.items():
+        if category == TEMPERATURE:
+            continue
+        yield SearchHit("category", (category,), category), (category,)
+        for unit in data["transforms"]:
+            yield SearchHit("unit", (category, unit), f"{unit} · {category}"), (unit, unit_symbol(unit))
+    for unit in TEMPERATURE_UNITS:
+        yield SearchHit("temperature", (unit,), f"{unit} · Temperature"), (unit, unit_symbol(unit))
+    for discipline, sections in quantity_names.items():
+        for section, quantities in sections.items():
+            for quantity, units in quantities.items():
+                where = f"{discipline} › {section}"
+                yield SearchHit("quantity", (discipline, section, quantity), f"{quantity} · {where}"), (quantity,)
+                for unit in units:
+                    yield (SearchHit("quantity_unit", (discipline, section, quantity, unit),
+                                     f"{unit} · {quantity} · {where}"), (unit,))
+
+
+@lru_cache(maxsize=None)
+def get_search_index():
+    """The :class:`SearchIndex` over the built-in tables, built on first use."""
+    return SearchIndex(iter_search_entries())
+
+
+def search_units(query, limit=20):
+    """Searches every unit, quantity and category of the hub; see :meth:`SearchIndex.search`."""
+    return get_search_index().search(query, limit)
@@ -0,0 +1,46 @@
+"""Temperature conversion between the scales of the ``Temperature`` affine category.
+
+Celsius, Fahrenheit, Kelvin, Rankine and Réaumur are transforms of
+:mod:`hub_core.affine`; each pair of scales composes into one cached
+multiply-add.
+"""
+from .affine import category_units, get_conversion
+
+TEMPERATURE = "Temperature"
+TEMPERATURE_UNITS = category_units(TEMPERATURE)
+CELSIUS = "Celsius (°C)"
+
+
+def _conversion(from_unit, to_unit):
+    try:
+        return get_conversion(TEMPERATURE, from_unit, to_unit)
+    except KeyError:
+        unit = from_unit if from_unit not in TEMPERATURE_UNITS else to_unit
+        raise ValueError(f"Unknown temperature unit '{unit}'.") from None
+
+
+def to_celsius(value, unit):
+    """Converts ``value`` in ``unit`` to degrees Celsius."""
+    return _conversion(unit, CELSIUS)(value)
+
+
+def from_celsius(value, unit):
+    """Converts ``value`` in degrees Celsius to ``unit``."""
+    return _conversion(CELSIUS, unit)(value)
+
+
+def temperature_transform(from_unit, to_unit):
+    """Returns ``(offset_in, scale, offset_out)`` with ``converted = (value - offset_in) * scale + offset_out``.
+
+    Lets callers resolve the units once and convert each value with a single
+    subtract-multiply-add.
+    """
+    conversion = _conversion(from_unit, to_unit)
+    return 0.0, conversion.scale, conversion.offset
+
+
+def convert_temperature(value, from_unit, to_unit):
+    """Converts a temperature (float or NumPy array) between any two of ``TEMPERATURE_UNITS``."""
+    if from_unit == to_unit:
+        return value
+    return _conversion(from_unit, to_unit)(value)
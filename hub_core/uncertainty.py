@@ -0,0 +1,224 @@
+"""Uncertainty propagation through the Laws and Dimensionless Numbers.
+
+Each variable of a compiled formula is given a :class:`Distribution`. The
+Monte Carlo estimate draws every variable for all samples at once and
+evaluates the formula's NumPy function in one vectorized pass per chunk,
+so peak memory is the result array plus one chunk of inputs and
+temporaries. The linearized estimate propagates standard deviations
+through the formula's symbolic partial derivatives at the means; those are
+generated once, in the formula sandbox, and kept in the on-disk cache like
+the formulas themselves.
+Needs NumPy, so it is not imported by ``hub_core`` itself.
+"""
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from .cache import formula_hash, generate_source, load_cache, load_source, update_cache
+
+GRADIENT_CACHE_FILE = "gradients.json"
+DISTRIBUTIONS = ("Fixed", "Normal", "Uniform", "Tolerance")
+DEFAULT_SAMPLES = 1_000_000
+DEFAULT_PERCENTILES = (2.5, 5.0, 50.0, 95.0, 97.5)
+DEFAULT_BINS = 50
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """An uncertain input.
+
+    ``"Fixed"``: exactly ``a``; ``"Normal"``: mean ``a``, standard deviation
+    ``b``; ``"Uniform"``: between ``a`` and ``b``; ``"Tolerance"``: ``a ± b``,
+    uniformly distributed over the tolerance band.
+    """
+    kind: str
+    a: float
+    b: float = 0.0
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{self.kind}'; expected one of {', '.join(DISTRIBUTIONS)}.")
+        if self.kind == "Uniform" and self.b < self.a:
+            raise ValueError("A uniform distribution needs low <= high.")
+        if self.kind in ("Normal", "Tolerance") and self.b < 0:
+            raise ValueError(f"A {self.kind.lower()} distribution needs a non-negative spread.")
+
+    @property
+    def mean(self):
+        return (self.a + self.b) / 2 if self.kind == "Uniform" else self.a
+
+    @property
+    def std(self):
+        if self.kind == "Normal":
+            return self.b
+        if self.kind == "Uniform":
+            return (self.b - self.a) / math.sqrt(12)
+        if self.kind == "Tolerance":
+            return self.b / math.sqrt(3)
+        return 0.0
+
+    def sample(self, rng, size):
+        """``size`` draws from ``rng``; a fixed value is returned as a scalar and broadcast."""
+        if self.kind == "Normal":
+            return rng.normal(self.a, self.b, size)
+        if self.kind == "Uniform":
+            return rng.uniform(self.a, self.b, size)
+        if self.kind == "Tolerance":
+            return rng.uniform(self.a - self.b, self.a + self.b, size)
+        return float(self.a)
+
+
+def as_distribution(value):
+    """A :class:`Distribution` as is; a plain number as a fixed one."""
+    return value if isinstance(value, Distribution) else Distribution("Fixed", float(value))
+
+
+@dataclass
+class MonteCarloResult:
+    """Summary of a Monte Carlo run; statistics cover the finite results only."""
+    samples: int
+    invalid: int
+    mean: float
+    std: float
+    percentiles: dict
+    counts: np.ndarray
+    edges: np.ndarray
+
+
+@dataclass
+class LinearizedResult:
+    """First-order estimate: the value at the input means and its propagated standard deviation.
+
+    ``sensitivities`` maps each variable to its partial derivative at the
+    means, ``contributions`` to its share of the output variance.
+    """
+    value: float
+    std: float
+    sensitivities: dict
+    contributions: dict
+
+
+def _distributions(compiled, inputs):
+    missing = [var for var in compiled.variables if var not in inputs]
+    if missing:
+        raise KeyError(f"No distribution given for {', '.join(missing)}.")
+    return {var: as_distribution(inputs[var]) for var in compiled.variables}
+
+
+def monte_carlo(compiled, inputs, samples=DEFAULT_SAMPLES, chunk_size=None, seed=None,
+                percentiles=DEFAULT_PERCENTILES, bins=DEFAULT_BINS):
+    """Propagates ``inputs`` (variable -> :class:`Distribution` or number) through ``compiled`` by sampling.
+
+    The formula is evaluated over ``chunk_size`` samples at a time (all at
+    once by default). Samples whose result is not finite, e.g. a division by
+    a zero draw, are counted in ``invalid`` and left out of the statistics.
+    """
+    samples = int(samples)
+    if samples < 2:
+        raise ValueError("Monte Carlo needs at least 2 samples.")
+    distributions = _distributions(compiled, inputs)
+    chunk = min(int(chunk_size), samples) if chunk_size else samples
+    if chunk < 1:
+        raise ValueError("The chunk size must be positive.")
+
+    rng = np.random.default_rng(seed)
+    out = np.empty(samples)
+    for start in range(0, samples, chunk):
+        n = min(chunk, samples - start)
+        columns = {var: dist.sample(rng, n) for var, dist in distributions.items()}
+        out[start:start + n] = compiled.evaluate_batch(columns)
+
+    finite = out[np.isfinite(out)]
+    if not finite.size:
+        raise ValueError("No sample gave a finite result; check the input distributions.")
+    counts, edges = np.histogram(finite, bins=bins)
+    return MonteCarloResult(
+        samples=samples,
+        invalid=samples - finite.size,
+        mean=float(finite.mean()),
+        std=float(finite.std(ddof=1)) if finite.size > 1 else 0.0,
+        percentiles=dict(zip(percentiles, np.percentile(finite, percentiles).tolist())),
+        counts=counts,
+        edges=edges,
+    )
+
+
+def gradient_sources(formula, variables, result, scales=()):
+    """Generates the ``math`` source of each partial derivative, ``None`` where it cannot be printed.
+
+    Takes the fields of a :class:`~hub_core.formulas.CompiledFormula` rather
+    than the formula itself, so it can be sent to a sandbox worker.
+    """
+    import sympy as sp
+
+    from .formulas import parse_formula, scale_expr
+
+    _, expr = parse_formula(formula, variables)
+    expr = scale_expr(expr, result, scales)
+    symbols = [sp.Symbol(var) for var in variables]
+    sources = {}
+    for var, symbol in zip(variables, symbols):
+        try:
+            sources[var] = generate_source(sp.diff(expr, symbol), symbols, "partial", "math")
+        except NotImplementedError:
+            sources[var] = None
+    return sources
+
+
+@lru_cache(maxsize=1)
+def _cached_entries():
+    return load_cache(GRADIENT_CACHE_FILE)
+
+
+@lru_cache(maxsize=256)
+def get_gradient(compiled):
+    """Maps each variable of ``compiled`` to its partial derivative, a function of all the variables.
+
+    Derivatives without a ``math`` form map to ``None`` and are taken
+    numerically. Symbolic differentiation runs in the formula sandbox, so a
+    pathological formula raises :class:`~hub_core.sandbox.FormulaTimeout`.
+    """
+    from .sandbox import get_sandbox
+
+    digest = formula_hash({"formula": compiled.formula, "variables": compiled.variables}, compiled.scales)
+    sources = _cached_entries().get(digest)
+    if sources is None:
+        sources = get_sandbox().call(gradient_sources, compiled.formula, compiled.variables, compiled.result,
+                                     compiled.scales)
+        _cached_entries()[digest] = sources
+        update_cache(GRADIENT_CACHE_FILE, digest, sources)
+    return {var: load_source(source, "partial", {"math": math}) if source else None
+            for var, source in sources.items()}
+
+
+def _central_difference(compiled, point, var):
+    step = 1e-6 * max(abs(point[var]), 1.0)
+    return (compiled.evaluate({**point, var: point[var] + step})
+            - compiled.evaluate({**point, var: point[var] - step})) / (2 * step)
+
+
+def linearized(compiled, inputs):
+    """Propagates ``inputs`` through ``compiled`` to first order around their means.
+
+    Fast, but only as good as the formula is linear over each input's spread;
+    compare with :func:`monte_carlo` for wide or skewed inputs.
+    """
+    distributions = _distributions(compiled, inputs)
+    point = {var: dist.mean for var, dist in distributions.items()}
+    args = [point[var] for var in compiled.variables]
+    gradient = get_gradient(compiled)
+    sensitivities, variances = {}, {}
+    for var, dist in distributions.items():
+        partial = gradient.get(var)
+        slope = float(partial(*args)) if partial else _central_difference(compiled, point, var)
+        sensitivities[var] = slope
+        variances[var] = (slope * dist.std) ** 2
+    total = sum(variances.values())
+    return LinearizedResult(
+        value=float(compiled.evaluate(point)),
+        std=math.sqrt(total),
+        sensitivities=sensitivities,
+        contributions={var: v / total if total else 0.0 for var, v in variances.items()},
+    )
@@ -0,0 +1,332 @@
+"""Compound unit expressions reduced to a scale factor and a dimension vector.
+
+``parse_unit("Btu/(ft²·h·°F)")`` returns a :class:`Unit` whose ``scale``
+takes a value in that unit to base SI and whose ``dimension`` holds the
+exponents of ``BASE_DIMENSIONS``. Dimension vectors are interned, so equal
+dimensions are the same tuple object. Parsed expressions are memoized in a
+bounded LRU cache, so converting between the same units again skips
+parsing altogether.
+
+Grammar: factors are joined by ``·``, ``*``, ``.`` or a space; a ``/``
+divides by the whole product that follows it up to the next ``/``, so
+``W/m·K`` is ``W/(m·K)`` as the engineering tables write it. Exponents are
+superscripts, ``^n``, ``**n`` or digits directly after a symbol (``m2``).
+``°C`` and ``°F`` are temperature *differences* here; absolute temperatures
+are handled by :mod:`hub_core.temperature`.
+"""
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .conversion import unit_symbol
+from .data import ENGINEERING_DATA, UNIT_CATEGORIES
+
+BASE_DIMENSIONS = ("m", "kg", "s", "A", "K", "mol", "cd", "bit")
+PARSE_CACHE_SIZE = 4096
+TABLE_TOLERANCE = 2e-3
+
+_interned = {}
+
+
+def intern_dimension(exponents):
+    """Returns the canonical tuple for a dimension vector."""
+    exponents = tuple(exponents)
+    return _interned.setdefault(exponents, exponents)
+
+
+DIMENSIONLESS = intern_dimension((0,) * len(BASE_DIMENSIONS))
+
+
+@dataclass(frozen=True)
+class Unit:
+    """A scale factor to base SI together with an interned dimension vector."""
+    scale: float
+    dimension: tuple = DIMENSIONLESS
+
+    def __mul__(self, other):
+        return Unit(self.scale * other.scale,
+                    intern_dimension(a + b for a, b in zip(self.dimension, other.dimension)))
+
+    def __truediv__(self, other):
+        return Unit(self.scale / other.scale,
+                    intern_dimension(a - b for a, b in zip(self.dimension, other.dimension)))
+
+    def __pow__(self, power):
+        return Unit(self.scale ** power, intern_dimension(a * power for a in self.dimension))
+
+
+def _base(index, scale=1.0):
+    exponents = [0] * len(BASE_DIMENSIONS)
+    exponents[index] = 1
+    return Unit(scale, intern_dimension(exponents))
+
+
+_BASE_UNITS = {
+    "m": _base(0), "g": _base(1, 1e-3), "s": _base(2), "A": _base(3), "K": _base(4),
+    "mol": _base(5), "cd": _base(6), "b": _base(7), "bit": _base(7),
+}
+
+# symbol: (scale, definition in terms of units defined before it)
+_DERIVED_UNITS = {
+    "Hz": (1.0, "1/s"), "N": (1.0, "kg·m/s²"), "Pa": (1.0, "N/m²"), "J": (1.0, "N·m"),
+    "W": (1.0, "J/s"), "C": (1.0, "A·s"), "V": (1.0, "W/A"), "Ω": (1.0, "V/A"), "ohm": (1.0, "Ω"),
+    "S": (1.0, "A/V"), "F": (1.0, "C/V"), "Wb": (1.0, "V·s"), "H": (1.0, "Wb/A"), "T": (1.0, "Wb/m²"),
+    "B": (8.0, "b"), "L": (1e-3, "m³"), "t": (1000.0, "kg"),
+    "min": (60.0, "s"), "h": (3600.0, "s"), "hour": (3600.0, "s"), "d": (86400.0, "s"),
+    "Wh": (3600.0, "J"), "eV": (1.602176634e-19, "J"), "cal": (4.184, "J"), "erg": (1e-7, "J"),
+    "Btu": (1055.05585262, "J"), "BTU": (1055.05585262, "J"),
+    "dyn": (1e-5, "N"), "lbf": (4.4482216152605, "N"), "kgf": (9.80665, "N"),
+    "bar": (1e5, "Pa"), "Bar": (1e5, "Pa"), "atm": (101325.0, "Pa"), "psi": (6894.757293168, "Pa"),
+    "mmHg": (133.322387415, "Pa"), "hp": (745.69987158227, "W"),
+    "in": (0.0254, "m"), "ft": (0.3048, "m"), "yd": (0.9144, "m"), "mi": (1609.344, "m"),
+    "ly": (9.4607304725808e15, "m"), "Å": (1e-10, "m"),
+    "ha": (1e4, "m²"), "ac": (4046.8564224, "m²"),
+    "gal": (3.785411784e-3, "m³"), "qt": (9.46352946e-4, "m³"),
+    "lb": (0.45359237, "kg"), "oz": (0.028349523125, "kg"), "ct": (2e-4, "kg"),
+    "°C": (1.0, "K"), "°F": (5.0 / 9.0, "K"), "degC": (1.0, "K"), "degF": (5.0 / 9.0, "K"),
+}
+
+_PREFIXES = {
+    "Y": 1e24, "Z": 1e21, "E": 1e18, "P": 1e15, "T": 1e12, "G": 1e9, "M": 1e6, "k": 1e3, "h": 1e2,
+    "da": 1e1, "d": 1e-1, "c": 1e-2, "m": 1e-3, "µ": 1e-6, "μ": 1e-6, "u": 1e-6, "n": 1e-9,
+    "p": 1e-12, "f": 1e-15, "a": 1e-18,
+}
+_PREFIXABLE = {"m", "g", "s", "A", "K", "mol", "cd", "b", "B", "Hz", "N", "Pa", "J", "W", "C", "V", "Ω",
+               "ohm", "S", "F", "Wb", "H", "T", "L", "Wh", "eV", "cal", "bar"}
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+  | (?P<super>[⁻⁰¹²³⁴⁵⁶⁷⁸⁹]+)
+  | (?P<power>\^|\*\*)
+  | (?P<op>[·⋅*./()])
+  | (?P<minus>-)
+  | (?P<symbol>°?[^\W\d_⁰¹²³⁴⁵⁶⁷⁸⁹]+)
+""", re.VERBOSE)
+
+
+def _tokenize(text):
+    tokens, pos = [], 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise ValueError(f"Unexpected '{text[pos]}' in unit '{text}'.")
+        kind = match.lastgroup
+        value = match.group()
+        pos = match.end()
+        if kind == "space":
+            tokens.append(("space", value))
+        elif kind == "op":
+            tokens.append(("mul" if value in "·⋅*." else value, value))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text, units):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.units = units
+        self.pos = 0
+
+    def peek(self, skip_space=True):
+        while skip_space and self.pos < len(self.tokens) and self.tokens[self.pos][0] == "space":
+            self.pos += 1
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def fail(self, message):
+        raise ValueError(f"Invalid unit '{self.text}': {message}.")
+
+    def parse(self):
+        unit = self.expression()
+        if self.peek() is not None:
+            self.fail(f"unexpected '{self.tokens[self.pos][1]}'")
+        return unit
+
+    def expression(self):
+        unit = self.product()
+        while self.peek() == "/":
+            self.take()
+            unit = unit / self.product()
+        return unit
+
+    def product(self):
+        unit = self.factor()
+        while True:
+            kind = self.peek(skip_space=False)
+            if kind in ("symbol", "(") or (kind == "space" and self.peek() in ("symbol", "number", "(")):
+                # "m²K" or "(m/s)(kg)": a factor right after an exponent or ')' multiplies.
+                unit = unit * self.factor()
+            elif kind == "mul":
+                self.take()
+                unit = unit * self.factor()
+            else:
+                return unit
+
+    def factor(self):
+        kind = self.peek()
+        if kind == "(":
+            self.take()
+            unit = self.expression()
+            if self.peek() != ")":
+                self.fail("missing ')'")
+            self.take()
+        elif kind == "number":
+            return Unit(float(self.take()[1]))
+        elif kind == "symbol":
+            unit = resolve_symbol(self.take()[1], self.units)
+        else:
+            self.fail("expected a unit")
+        return unit ** self.exponent() if self._has_exponent() else unit
+
+    def _has_exponent(self):
+        return self.peek(skip_space=False) in ("super", "power", "number", "minus")
+
+    def exponent(self):
+        kind, value = self.take()
+        if kind == "super":
+            text = value.translate(_SUPERSCRIPTS)
+        elif kind in ("number", "minus"):
+            text = value
+            if kind == "minus":
+                text += self._integer()
+        else:
+            text = self._integer(signed=True)
+        try:
+            return int(text)
+        except ValueError:
+            self.fail(f"bad exponent '{text}'")
+
+    def _integer(self, signed=False):
+        sign = ""
+        if signed and self.peek() == "minus":
+            sign = self.take()[1]
+        if self.peek() != "number":
+            self.fail("expected an integer exponent")
+        return sign + self.take()[1]
+
+
+@lru_cache(maxsize=None)
+def _unit_registry():
+    """Every named unit, each derived one parsed from its definition on first use."""
+    units = dict(_BASE_UNITS)
+    for symbol, (scale, definition) in _DERIVED_UNITS.items():
+        units[symbol] = Unit(scale) * _Parser(definition, units).parse()
+    return units
+
+
+def resolve_symbol(symbol, units=None):
+    """Looks up a unit symbol, trying SI prefixes when it is not known as written."""
+    units = _unit_registry() if units is None else units
+    unit = units.get(symbol)
+    if unit is not None:
+        return unit
+    for length in (2, 1):
+        prefix, rest = symbol[:length], symbol[length:]
+        if prefix in _PREFIXES and rest in _PREFIXABLE:
+            return Unit(_PREFIXES[prefix]) * units[rest]
+    raise ValueError(f"Unknown unit symbol '{symbol}'.")
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_unit(text):
+    """Parses a unit expression such as ``"kg·m/s²"`` into a :class:`Unit`.
+
+    ``"-"``, ``"1"`` and ``""`` are dimensionless. Raises ``ValueError`` for
+    unknown symbols and malformed expressions.
+    """
+    text = text.strip()
+    if text in ("", "-", "1"):
+        return Unit(1.0)
+    return _Parser(text, _unit_registry()).parse()
+
+
+def format_dimension(dimension):
+    """Readable form of a dimension vector, e.g. ``"kg·m·s⁻²"``."""
+    superscripts = str.maketrans("0123456789-", "⁰¹²³⁴⁵⁶⁷⁸⁹⁻")
+    parts = [name if power == 1 else f"{name}{str(power).translate(superscripts)}"
+             for name, power in zip(BASE_DIMENSIONS, dimension) if power]
+    return "·".join(parts) or "1"
+
+
+def unit_factor(from_unit, to_unit):
+    """Multiplier taking a value in ``from_unit`` to ``to_unit``.
+
+    Raises ``ValueError`` when the two expressions have different dimensions.
+    """
+    source, target = parse_unit(from_unit), parse_unit(to_unit)
+    if source.dimension is not target.dimension:
+        raise ValueError(f"Cannot convert '{from_unit}' ({format_dimension(source.dimension)}) to "
+                         f"'{to_unit}' ({format_dimension(target.dimension)}).")
+    return source.scale / target.scale
+
+
+def convert_units(value, from_unit, to_unit):
+    """Converts ``value`` between two unit expressions; works on floats and NumPy arrays."""
+    return value * unit_factor(from_unit, to_unit)
+
+
+def _degree_form(symbol):
+    """The tables write temperature differences as bare ``C``/``F``; read them as ``°C``/``°F``."""
+    return re.sub(r"(?<![\w°])([CF])(?![\w])", r"°\1", symbol)
+
+
+def _table_unit(symbol, dimension=None):
+    """Parses a table unit, retrying the degree reading when the plain one has the wrong dimension."""
+    unit = parse_unit(symbol)
+    if dimension is not None and unit.dimension is not dimension and _degree_form(symbol) != symbol:
+        degree_unit = parse_unit(_degree_form(symbol))
+        if degree_unit.dimension is dimension:
+            return degree_unit
+    return unit
+
+
+def validate_unit_tables(unit_categories=UNIT_CATEGORIES, engineering_data=ENGINEERING_DATA,
+                         tolerance=TABLE_TOLERANCE):
+    """Checks every hand-written factor in the unit tables against the parser.
+
+    Returns a list of ``(location, unit, problem)`` tuples, empty when every
+    unit parses, matches its base unit's dimension and has a factor within
+    ``tolerance`` (relative) of the parsed one.
+    """
+    issues = []
+
+    def check(location, units, per_base):
+        base_label = next((label for label, factor in units.items() if factor == 1.0), None)
+        if base_label is None:
+            issues.append((location, None, "no unit with factor 1.0"))
+            return
+        try:
+            base = _table_unit(unit_symbol(base_label))
+        except ValueError as e:
+            issues.append((location, base_label, str(e)))
+            return
+        for label, factor in units.items():
+            try:
+                unit = _table_unit(unit_symbol(label), base.dimension)
+            except ValueError as e:
+                issues.append((location, label, str(e)))
+                continue
+            if unit.dimension is not base.dimension:
+                issues.append((location, label, f"dimension {format_dimension(unit.dimension)} differs from "
+                                                f"{base_label} ({format_dimension(base.dimension)})"))
+                continue
+            expected = base.scale / unit.scale if per_base else unit.scale / base.scale
+            if not math.isclose(factor, expected, rel_tol=tolerance):
+                issues.append((location, label, f"factor {factor:g} but the parsed unit gives {expected:.6g}"))
+
+    for category, data in unit_categories.items():
+        check(category, data["units"], per_base=False)
+    for discipline, sections in engineering_data.items():
+        for section, data in sections.items():
+            for quantity, q in data.get("Physical Quantities", {}).items():
+                check(f"{discipline} › {section} › {quantity}", q["units"], per_base=True)
+    return issues
@@ -0,0 +1,223 @@
+"""Worksheets: chains of Laws and Dimensionless Numbers linked into a DAG.
+
+Each node evaluates one ``ENGINEERING_DATA`` formula, either for its result
+or, like the calculator's "Solve For", for one of its variables. A node's
+inputs are constants or links to other nodes' outputs. Changing an input
+only marks that node dirty; :meth:`Worksheet.recompute` then walks the
+nodes in topological order and evaluates a node only when it is dirty and
+its argument tuple differs from the ones memoized for it. Downstream nodes
+are dirtied only when an output actually changes, so an edit that leaves a
+value unchanged stops propagating right there.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from .sandbox import FormulaTimeout, SandboxError, evaluate_safely, get_formula_safely
+
+NODE_MEMO_SIZE = 32
+
+
+@dataclass(frozen=True)
+class Link:
+    """An input fed by the output of node ``source``."""
+    source: str
+
+
+@dataclass
+class WorksheetNode:
+    """One formula evaluation in a :class:`Worksheet`."""
+    id: str
+    discipline: str
+    section: str
+    kind: str
+    name: str
+    target: str
+    inputs: dict = field(default_factory=dict)
+    value: float = None
+    error: str = None
+    memo: OrderedDict = field(default_factory=OrderedDict, repr=False)
+
+    @property
+    def compiled(self):
+        return get_formula_safely(self.discipline, self.section, self.kind, self.name)
+
+    @property
+    def input_names(self):
+        """Names this node needs: the formula's variables, or its result and the other variables."""
+        compiled = self.compiled
+        if self.target == compiled.result:
+            return compiled.variables
+        return (compiled.result,) + tuple(v for v in compiled.variables if v != self.target)
+
+    def evaluate(self, args):
+        """Evaluates for a tuple of argument values in ``input_names`` order, memoizing recent results."""
+        if args in self.memo:
+            self.memo.move_to_end(args)
+            return self.memo[args]
+        values = dict(zip(self.input_names, args))
+        compiled = self.compiled
+        if self.target == compiled.result:
+            result = compiled.evaluate_value(values)
+        else:
+            # Solving for a variable may take SymPy or a root search; keep it time-bounded.
+            result, _ = evaluate_safely(self.discipline, self.section, self.kind, self.name, values,
+                                        target=self.target)
+        self.memo[args] = result
+        if len(self.memo) > NODE_MEMO_SIZE:
+            self.memo.popitem(last=False)
+        return result
+
+
+class Worksheet:
+    """A DAG of :class:`WorksheetNode` with incremental, memoized recomputation."""
+
+    def __init__(self):
+        self.nodes = {}
+        self._dirty = set()
+        self._order = None
+        self._readers = None
+
+    def add_node(self, node_id, discipline, section, kind, name, target=None):
+        """Adds a node evaluating ``name`` for ``target`` (default: the formula's result)."""
+        if node_id in self.nodes:
+            raise ValueError(f"Node '{node_id}' already exists.")
+        compiled = get_formula_safely(discipline, section, kind, name)
+        target = target or compiled.result
+        if target != compiled.result and target not in compiled.variables:
+            raise KeyError(f"'{target}' is not a variable of {name}.")
+        self.nodes[node_id] = WorksheetNode(node_id, discipline, section, kind, name, target)
+        self._dirty.add(node_id)
+        self._order = None
+        return self.nodes[node_id]
+
+    def remove_node(self, node_id):
+        """Removes a node; inputs linked to it become unset."""
+        del self.nodes[node_id]
+        for node in self.nodes.values():
+            for var, source in list(node.inputs.items()):
+                if source == Link(node_id):
+                    del node.inputs[var]
+                    self._dirty.add(node.id)
+        self._dirty.discard(node_id)
+        self._order = None
+
+    def set_input(self, node_id, var, value):
+        """Sets ``var`` of a node to a constant, or to ``Link(source)`` to feed it from another node."""
+        node = self.nodes[node_id]
+        if var not in node.input_names:
+            raise KeyError(f"'{var}' is not an input of node '{node_id}'.")
+        if isinstance(value, Link):
+            if value.source not in self.nodes:
+                raise KeyError(f"Unknown node '{value.source}'.")
+            if value.source == node_id or node_id in self.upstream(value.source):
+                raise ValueError(f"Linking '{value.source}' into '{node_id}' would create a cycle.")
+            self._order = None
+        else:
+            value = float(value)
+        if node.inputs.get(var) != value:
+            if isinstance(node.inputs.get(var), Link):
+                self._order = None
+            node.inputs[var] = value
+            self._dirty.add(node_id)
+
+    def upstream(self, node_id):
+        """Ids of every node ``node_id`` depends on, directly or not."""
+        seen, stack = set(), [node_id]
+        while stack:
+            for source in self.nodes[stack.pop()].inputs.values():
+                if isinstance(source, Link) and source.source not in seen:
+                    seen.add(source.source)
+                    stack.append(source.source)
+        return seen
+
+    def order(self):
+        """Node ids in topological order (sources first), cached until the links change."""
+        if self._order is None:
+            self._readers = {}
+            pending = dict.fromkeys(self.nodes, 0)
+            for node in self.nodes.values():
+                for source in node.inputs.values():
+                    if isinstance(source, Link):
+                        self._readers.setdefault(source.source, []).append(node.id)
+                        pending[node.id] += 1
+            # Kahn's algorithm: iterative, so long chains of links cannot hit the recursion limit.
+            order = [node_id for node_id, count in pending.items() if not count]
+            for node_id in order:
+                for reader in self._readers.get(node_id, ()):
+                    pending[reader] -= 1
+                    if not pending[reader]:
+                        order.append(reader)
+            self._order = order
+        return self._order
+
+    def recompute(self):
+        """Brings every dirty node, and whatever its changes reach, up to date.
+
+        Returns the ids of the nodes that were actually evaluated (memo hits
+        and unchanged argument tuples are skipped).
+        """
+        evaluated = []
+        if not self._dirty:
+            return evaluated
+        for node_id in self.order():
+            if node_id not in self._dirty:
+                continue
+            node = self.nodes[node_id]
+            previous = (node.value, node.error)
+            args, node.error = self._arguments(node)
+            if node.error is None:
+                cached = args in node.memo
+                try:
+                    node.value = node.evaluate(args)
+                    if not cached:
+                        evaluated.append(node_id)
+                except (ValueError, ZeroDivisionError, OverflowError, FormulaTimeout, SandboxError) as e:
+                    node.value, node.error = None, str(e)
+            else:
+                node.value = None
+            if (node.value, node.error) != previous:
+                self._dirty.update(self._readers.get(node_id, ()))
+        self._dirty.clear()
+        return evaluated
+
+    def _arguments(self, node):
+        """Resolves a node's inputs to a tuple, or returns ``(None, error)`` when one is missing or failed."""
+        args = []
+        for var in node.input_names:
+            source = node.inputs.get(var)
+            if source is None:
+                return None, f"'{var}' is not set."
+            if isinstance(source, Link):
+                upstream = self.nodes[source.source]
+                if upstream.value is None:
+                    return None, f"'{var}' comes from '{upstream.id}', which has no value."
+                source = upstream.value
+            args.append(source)
+        return tuple(args), None
+
+    def value(self, node_id):
+        """The up-to-date output of a node (``None`` when it cannot be evaluated)."""
+        self.recompute()
+        return self.nodes[node_id].value
+
+    def to_dict(self):
+        """A JSON-serializable description of the worksheet (without results)."""
+        return {"nodes": [
+            {"id": node.id, "discipline": node.discipline, "section": node.section, "kind": node.kind,
+             "name": node.name, "target": node.target,
+             "inputs": {var: {"link": source.source} if isinstance(source, Link) else source
+                        for var, source in node.inputs.items()}}
+            for node in self.nodes.values()
+        ]}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a worksheet saved with :meth:`to_dict`."""
+        sheet = cls()
+        for spec in data["nodes"]:
+            sheet.add_node(spec["id"], spec["discipline"], spec["section"], spec["kind"], spec["name"],
+                           spec.get("target"))
+        for spec in data["nodes"]:
+            for var, source in spec.get("inputs", {}).items():
+                sheet.set_input(spec["id"], var, Link(source["link"]) if isinstance(source, dict) else source)
+        return sheet
@@ -0,0 +1,55 @@
+"""Affine and logarithmic conversions: exact offsets and round trips."""
+import itertools
+import math
+
+import pytest
+
+from hub_core.affine import category_units, convert_affine, get_conversion
+
+TEMPERATURES = category_units("Temperature")
+TEMPERATURE_PAIRS = list(itertools.permutations(TEMPERATURES, 2))
+# The same temperature in every scale: 100 °C.
+BOILING = {"Celsius (°C)": 100.0, "Fahrenheit (°F)": 212.0, "Kelvin (K)": 373.15,
+           "Rankine (°R)": 671.67, "Réaumur (°Ré)": 80.0}
+
+
+def test_celsius_to_fahrenheit_is_exact():
+    conversion = get_conversion("Temperature", "Celsius (°C)", "Fahrenheit (°F)")
+    assert (conversion.scale, conversion.offset) == (1.8, 32.0)
+    assert not conversion.is_linear
+
+
+@pytest.mark.parametrize("source, target", TEMPERATURE_PAIRS)
+def test_temperature_pairs(source, target):
+    assert convert_affine(BOILING[source], "Temperature", source, target) == pytest.approx(BOILING[target],
+                                                                                          abs=1e-9)
+
+
+@pytest.mark.parametrize("source, target", TEMPERATURE_PAIRS)
+def test_temperature_round_trip(source, target):
+    there = convert_affine(-40.0, "Temperature", source, target)
+    assert convert_affine(there, "Temperature", target, source) == pytest.approx(-40.0, abs=1e-9)
+
+
+def test_identity_conversion():
+    assert get_conversion("Temperature", "Kelvin (K)", "Kelvin (K)").is_linear
+    assert convert_affine(12.5, "Temperature", "Kelvin (K)", "Kelvin (K)") == 12.5
+
+
+def test_power_levels():
+    assert convert_affine(30.0, "Power Level", "Decibel-milliwatts (dBm)", "Watts (W)") == pytest.approx(1.0)
+    assert convert_affine(1.0, "Power Level", "Watts (W)", "Decibel-milliwatts (dBm)") == pytest.approx(30.0)
+    dbm_to_dbw = get_conversion("Power Level", "Decibel-milliwatts (dBm)", "Decibel-watts (dBW)")
+    assert (dbm_to_dbw.scale, dbm_to_dbw.offset) == pytest.approx((1.0, -30.0))
+    for dbm in (-120.0, 0.0, 17.3):
+        watts = convert_affine(dbm, "Power Level", "Decibel-milliwatts (dBm)", "Watts (W)")
+        assert convert_affine(watts, "Power Level", "Watts (W)", "Decibel-milliwatts (dBm)") == pytest.approx(dbm)
+
+
+def test_zero_power_is_minus_infinity_dbm():
+    assert convert_affine(0.0, "Power Level", "Watts (W)", "Decibel-milliwatts (dBm)") == -math.inf
+
+
+def test_unknown_unit_raises():
+    with pytest.raises(KeyError):
+        get_conversion("Temperature", "Celsius (°C)", "Delisle (°De)")
@@ -0,0 +1,68 @@
+"""HTTP status handling of the WSGI API, called in-process."""
+import io
+import json
+
+import pytest
+
+import api
+
+LENGTH = {"category": "Length", "from": "Meters (m)", "to": "Feet (ft)"}
+
+
+def request(method, path, body=b"", content_length=None):
+    """Calls ``api.app``; returns ``(status code, decoded JSON body)``."""
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "CONTENT_LENGTH": str(len(body) if content_length is None else content_length),
+        "wsgi.input": io.BytesIO(body),
+    }
+    status = []
+    chunks = api.app(environ, lambda line, headers: status.append(line))
+    return int(status[0].split()[0]), json.loads(b"".join(chunks))
+
+
+def test_convert():
+    code, body = request("POST", "/convert", {**LENGTH, "values": [1, 2]})
+    assert code == 200
+    assert body["values"] == pytest.approx([3.280839895, 6.56167979])
+
+
+def test_health():
+    assert request("GET", "/health") == (200, {"status": "ok"})
+
+
+@pytest.mark.parametrize("method, path", [("GET", "/nowhere"), ("GET", "/convert"), ("POST", "/health")])
+def test_unknown_endpoint_is_404(method, path):
+    code, body = request(method, path)
+    assert code == 404
+    assert "error" in body
+
+
+@pytest.mark.parametrize("body", [
+    b"{not json",
+    b"[1, 2]",
+    {"category": "Length", "from": "Meters (m)", "values": [1]},
+    {**LENGTH, "to": "Parsecs (pc)", "values": [1]},
+    {**LENGTH, "values": ["one"]},
+    {**LENGTH},
+    b'{"category": "Length", "from": "Meters (m)", "to": "Feet (ft)", "values": [1' + b"0" * 400 + b"]}",
+])
+def test_client_errors_are_400(body):
+    code, reply = request("POST", "/convert", body)
+    assert code == 400
+    assert reply["error"]
+
+
+def test_non_object_units_is_400():
+    code, reply = request("POST", "/formula", {"discipline": "Electrical", "section": "x", "kind": "Laws",
+                                               "name": "x", "units": [], "values": {}})
+    assert code == 400
+    assert "units" in reply["error"]
+
+
+def test_oversized_body_is_413():
+    code, _ = request("POST", "/convert", b"{}", content_length=api.MAX_BODY_BYTES + 1)
+    assert code == 413
@@ -0,0 +1,35 @@
+"""The streaming CLI, run in-process over string buffers."""
+import io
+
+import cli
+
+
+def convert(argv, text):
+    stdout = io.StringIO()
+    cli.run(cli.parse_args(argv), io.StringIO(text), stdout)
+    return stdout.getvalue()
+
+
+def test_plain_values():
+    assert convert(["expr", "km", "m"], "1\n2.5\n") == "1000.0\n2500.0\n"
+
+
+def test_bad_value_becomes_nan():
+    assert convert(["expr", "km", "m"], "oops\n") == "nan\n"
+
+
+def test_field_converts_only_that_field():
+    lines = "2024-01-01,tank,1,ok\n2024-01-02,tank,2.5,ok\n"
+    assert convert(["expr", "km", "m", "--field", "3"], lines) == (
+        "2024-01-01,tank,1000.0,ok\n2024-01-02,tank,2500.0,ok\n")
+
+
+def test_field_passes_unparseable_lines_through():
+    lines = "a,b,not-a-number\nshort\n"
+    assert convert(["expr", "km", "m", "--field", "3"], lines) == lines
+
+
+def test_field_with_delimiter_format_and_header():
+    lines = "time;temp\n1;100\n2;0\n"
+    argv = ["temp", "C", "F", "--field", "2", "--delimiter", ";", "--format", ".1f", "--skip-header"]
+    assert convert(argv, lines) == "time;temp\n1;212.0\n2;32.0\n"
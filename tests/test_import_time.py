@@ -0,0 +1,43 @@
+"""What ``import hub_core`` loads (the timing budget itself is ``benchmarks/check_import_time.py``).
+
+Wall-clock limits are too noisy for shared CI, so these tests check the
+modules each import pulls in, which is what the budget depends on.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import hub_core
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("streamlit", "sympy", "numpy", "pandas", "pyarrow")
+# Stdlib modules that made up most of the import time before hub_core went lazy.
+SLOW_STDLIB = ("dataclasses", "inspect", "tempfile")
+COLD_PATH = ("convert", "convert_temperature")
+
+
+def modules_after(*names):
+    """``sys.modules`` of a fresh interpreter after ``import hub_core`` and touching ``names``."""
+    code = "\n".join(["import json, sys", "import hub_core", *(f"hub_core.{name}" for name in names),
+                      "print(json.dumps(sorted(sys.modules)))"])
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True)
+    return set(json.loads(result.stdout))
+
+
+def test_import_loads_no_submodule():
+    loaded = modules_after()
+    assert not {name for name in loaded if name.startswith("hub_core.")}
+    assert not loaded & set(HEAVY_MODULES + SLOW_STDLIB)
+
+
+def test_conversion_path_stays_light():
+    loaded = modules_after(*COLD_PATH)
+    assert not loaded & set(HEAVY_MODULES + SLOW_STDLIB)
+    assert not loaded & {"hub_core.search", "hub_core.worksheet", "hub_core.formulas", "hub_core.sandbox"}
+
+
+def test_every_public_name_resolves():
+    for name in hub_core.__all__:
+        assert getattr(hub_core, name) is not None
+    assert set(hub_core.__all__) <= set(dir(hub_core))
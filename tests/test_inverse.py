@@ -0,0 +1,26 @@
+"""InverseFormula reports whether its closed form or the numeric solver produced a value."""
+from hub_core.formulas import CompiledFormula
+from hub_core.inverse import InverseFormula
+
+
+def cooling_for_h():
+    """Newton's Law of Cooling, ``q = h * A * (Ts - T_inf)``, solved for ``h``."""
+    variables = ("h", "A", "Ts", "T_inf")
+    forward = CompiledFormula("Newton's Law of Cooling", "q = h * A * (Ts - T_inf)", "q", variables,
+                              lambda h, A, Ts, T_inf: h * A * (Ts - T_inf), None)
+    branches = (lambda q, A, Ts, T_inf: q / (A * (Ts - T_inf)),)
+    return InverseFormula(forward=forward, target="h", inputs=("q", "A", "Ts", "T_inf"), branches=branches)
+
+
+def test_solve_reports_the_closed_form():
+    value, closed_form = cooling_for_h().solve({"q": 500.0, "A": 2.0, "Ts": 80.0, "T_inf": 30.0})
+    assert value == 5.0
+    assert closed_form
+
+
+def test_solve_reports_the_numeric_fallback():
+    # Ts == T_inf divides the branch by zero; any h satisfies q = 0, found by the root search.
+    inverse = cooling_for_h()
+    value, closed_form = inverse.solve({"q": 0.0, "A": 2.0, "Ts": 30.0, "T_inf": 30.0})
+    assert not closed_form
+    assert inverse.evaluate({"q": 0.0, "A": 2.0, "Ts": 30.0, "T_inf": 30.0}) == value
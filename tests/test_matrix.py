@@ -0,0 +1,51 @@
+"""Conversion matrices: unit diagonal, reciprocity and agreement with the scalar converters."""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from hub_core.conversion import conversion_factor, quantity_factor  # noqa: E402
+from hub_core.data import QUANTITY_NAMES, UNIT_CATEGORIES  # noqa: E402
+from hub_core.matrix import category_matrix, export_table, quantity_matrix  # noqa: E402
+
+QUANTITIES = [(discipline, section, quantity)
+              for discipline, sections in QUANTITY_NAMES.items()
+              for section, quantities in sections.items()
+              for quantity in quantities]
+
+
+def check_matrix(matrix):
+    factors = matrix.factors
+    assert factors.shape == (len(matrix.units),) * 2
+    assert np.allclose(np.diag(factors), 1.0, rtol=1e-12)
+    assert np.allclose(factors * factors.T, 1.0, rtol=1e-12)
+
+
+@pytest.mark.parametrize("category", UNIT_CATEGORIES.names)
+def test_category_matrix(category):
+    matrix = category_matrix(category)
+    check_matrix(matrix)
+    first, last = matrix.units[0], matrix.units[-1]
+    assert matrix.factor(first, last) == pytest.approx(conversion_factor(category, first, last), rel=1e-12)
+
+
+@pytest.mark.parametrize("discipline, section, quantity", QUANTITIES)
+def test_quantity_matrix(discipline, section, quantity):
+    matrix = quantity_matrix(discipline, section, quantity)
+    check_matrix(matrix)
+    first, last = matrix.units[0], matrix.units[-1]
+    assert matrix.factor(first, last) == pytest.approx(
+        quantity_factor(discipline, section, quantity, first, last), rel=1e-12)
+
+
+def test_matrix_is_read_only():
+    with pytest.raises(ValueError):
+        category_matrix(UNIT_CATEGORIES.names[0]).factors[0, 0] = 2.0
+
+
+def test_table_converts_into_every_unit():
+    matrix = category_matrix("Length")
+    table = matrix.table([1.0, 2.0], "Meters (m)")
+    assert list(table.columns) == list(matrix.units)
+    assert table["Feet (ft)"].tolist() == pytest.approx([3.280839895, 6.56167979])
+    assert export_table(table, "CSV", index=False).decode().splitlines()[0].startswith("Meters (m)")
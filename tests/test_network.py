@@ -0,0 +1,72 @@
+"""Zone detection and base kV propagation of PerUnitNetwork."""
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from hub_core.network import PerUnitNetwork  # noqa: E402
+
+NAN = float("nan")
+
+
+def feeder():
+    """138 kV buses 1-2, a 138/13.8 kV transformer 2-3, 13.8 kV line 3-4, a 13.8/0.48 kV transformer 4-5."""
+    return PerUnitNetwork(
+        bus_ids=[1, 2, 3, 4, 5],
+        from_bus=[1, 2, 3, 4],
+        to_bus=[2, 3, 4, 5],
+        base_mva=100.0,
+        bases={1: 138.0},
+        from_kv=[NAN, 138.0, NAN, 13.8],
+        to_kv=[NAN, 13.8, NAN, 0.48],
+    )
+
+
+def test_lines_share_a_zone_and_transformers_split_them():
+    network = feeder()
+    zones = network.bus_zone
+    assert network.n_zones == 3
+    assert zones[0] == zones[1] and zones[2] == zones[3]
+    assert len({zones[0], zones[2], zones[4]}) == 3
+
+
+def test_base_kv_follows_transformer_ratios():
+    network = feeder()
+    bus_kv = network.zone_base_kv[network.bus_zone]
+    assert bus_kv == pytest.approx([138.0, 138.0, 13.8, 13.8, 0.48])
+
+
+def test_per_unit_round_trip_on_the_zone_bases():
+    network = feeder()
+    ohms = np.array([1.0, 2.0, 3.0, 4.0])
+    pu = network.to_per_unit(ohms, "branch", "Impedance")
+    # Branch values are on the from-bus side: zones of buses 1, 2, 3 and 4.
+    assert pu == pytest.approx(ohms / (np.array([138.0, 138.0, 13.8, 13.8]) ** 2 / 100.0))
+    assert network.from_per_unit(pu, "branch", "Impedance") == pytest.approx(ohms)
+
+
+def test_zone_base_change_reaches_only_downstream_zones():
+    network = feeder()
+    network.base_values("bus", "Current")
+    middle = network.bus_zone[2]
+    changed = network.set_zone_base(middle, 12.47)
+    assert sorted(changed) == sorted({middle, network.bus_zone[4]})
+    bus_kv = network.zone_base_kv[network.bus_zone]
+    assert bus_kv == pytest.approx([138.0, 138.0, 12.47, 12.47, 0.48 * 12.47 / 13.8])
+    expected_current = 100.0 * 1000 / (math.sqrt(3) * bus_kv)
+    assert network.base_values("bus", "Current") == pytest.approx(expected_current)
+
+
+def test_base_mva_change_rescales_cached_bases():
+    network = feeder()
+    network.base_values("branch", "Impedance")
+    network.set_base_mva(50.0)
+    assert network.base_values("branch", "Impedance") == pytest.approx(
+        np.array([138.0, 138.0, 13.8, 13.8]) ** 2 / 50.0)
+
+
+def test_island_without_a_base_raises():
+    with pytest.raises(ValueError, match="No base kV"):
+        PerUnitNetwork([1, 2, 3], [1], [2], 100.0, {1: 138.0})
@@ -0,0 +1,24 @@
+"""FormulaSandbox across os.fork, as in the pre-forked API server."""
+import os
+
+import pytest
+
+from hub_core.sandbox import get_sandbox
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_gets_a_working_sandbox():
+    assert get_sandbox().call(abs, -3) == 3
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.write(write, str(get_sandbox().call(abs, -4, timeout=5)).encode())
+        finally:
+            os._exit(0)
+    os.close(write)
+    with os.fdopen(read, "rb") as reply:
+        answer = reply.read()
+    os.waitpid(pid, 0)
+    assert answer == b"4"
+    assert get_sandbox().call(abs, -5) == 5
@@ -0,0 +1,93 @@
+"""Stress test: slow formulas in the sandbox must not starve other sessions.
+
+Runs a few "sessions" that keep submitting a call which never finishes (a
+CPU-bound loop, standing in for a pathological formula) next to sessions
+submitting quick calls, all on one :class:`hub_core.sandbox.FormulaSandbox`,
+while a heartbeat thread checks that the submitting process itself stays
+responsive. Every slow call must be stopped with ``FormulaTimeout`` shortly
+after its timeout, every fast call must succeed within the latency bound,
+and the heartbeat must never be held up.
+"""
+import math
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from hub_core.sandbox import FormulaSandbox, FormulaTimeout
+
+WORKERS = 4
+SLOW_SESSIONS = 3
+FAST_SESSIONS = 8
+TIMEOUT = 0.5
+DURATION = 5.0
+HEARTBEAT = 0.01
+SLACK = 0.5
+
+
+def slow_session(sandbox, deadline, overruns, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            sandbox.call(sum, range(10 ** 15))
+            errors.append("a slow call finished instead of timing out")
+        except FormulaTimeout:
+            overruns.append(time.perf_counter() - start - sandbox.timeout)
+        except Exception as e:
+            errors.append(f"slow call: {type(e).__name__}: {e}")
+
+
+def fast_session(sandbox, deadline, latencies, errors, seed):
+    values = [math.sin(seed + i) for i in range(100)]
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            sandbox.call(math.fsum, values)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(f"fast call: {type(e).__name__}: {e}")
+
+
+def heartbeat(deadline, delays):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        time.sleep(HEARTBEAT)
+        delays.append(time.perf_counter() - start - HEARTBEAT)
+
+
+@pytest.fixture
+def sandbox():
+    sandbox = FormulaSandbox(max_workers=WORKERS, timeout=TIMEOUT, queue_timeout=TIMEOUT + SLACK)
+    sandbox.call(math.fsum, [1.0])  # start a worker before timing anything
+    yield sandbox
+    sandbox.shutdown()
+
+
+def test_slow_formulas_do_not_starve_fast_ones(sandbox):
+    deadline = time.perf_counter() + DURATION
+    overruns, latencies, delays, errors = [], [], [], []
+    threads = [threading.Thread(target=slow_session, args=(sandbox, deadline, overruns, errors))
+               for _ in range(SLOW_SESSIONS)]
+    threads += [threading.Thread(target=fast_session, args=(sandbox, deadline, latencies, errors, i))
+                for i in range(FAST_SESSIONS)]
+    threads.append(threading.Thread(target=heartbeat, args=(deadline, delays)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not sorted(set(errors))
+    assert overruns, "no slow call was stopped"
+    assert max(overruns) <= SLACK, f"a slow call ran {max(overruns) * 1000:.0f} ms past its timeout"
+    assert latencies, "no fast call completed"
+    assert max(latencies) <= TIMEOUT + SLACK, f"a fast call waited {max(latencies) * 1000:.0f} ms"
+    assert max(delays, default=0) <= SLACK, f"the submitting process stalled for {max(delays) * 1000:.0f} ms"
+
+
+def test_cancel_stops_a_running_call(sandbox):
+    future = sandbox.submit(sum, range(10 ** 15), timeout=30)
+    time.sleep(0.2)
+    assert sandbox.cancel(future)
+    with pytest.raises(CancelledError):
+        future.result(timeout=TIMEOUT + SLACK)
@@ -0,0 +1,20 @@
+"""The search index covers every engineering quantity without loading any discipline."""
+from hub_core.data import ENGINEERING_DATA, QUANTITY_NAMES
+from hub_core.registry import read_quantity_names
+from hub_core.search import get_search_index, search_units
+
+
+def test_names_manifest_matches_the_discipline_files():
+    # Regenerate hub_core/tables/names.json with ``python -m hub_core.registry``.
+    manifest = {discipline: {section: {quantity: list(units) for quantity, units in quantities.items()}
+                             for section, quantities in sections.items()}
+                for discipline, sections in QUANTITY_NAMES.items()}
+    assert manifest == read_quantity_names()
+
+
+def test_building_the_index_loads_no_discipline():
+    get_search_index.cache_clear()
+    loaded = ENGINEERING_DATA.loaded
+    hits = search_units("Heat Flux")
+    assert ENGINEERING_DATA.loaded == loaded
+    assert hits[0].path == ("Chemical", "Heat Transfer", "Heat Flux")
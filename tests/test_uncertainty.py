@@ -0,0 +1,41 @@
+"""Monte Carlo and linearized uncertainty propagation agree on a linear formula."""
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("sympy")
+
+from hub_core.formulas import compile_formula  # noqa: E402
+from hub_core.uncertainty import Distribution, linearized, monte_carlo  # noqa: E402
+
+INPUTS = {"a": Distribution("Normal", 10.0, 0.5), "b": Distribution("Uniform", 0.0, 6.0)}
+# Var(y) = (2 * 0.5)² + (3 * 6 / √12)² = 1 + 27.
+EXPECTED_STD = math.sqrt(28.0)
+
+
+@pytest.fixture(scope="module")
+def linear():
+    return compile_formula("Linear", {"formula": "y = 2*a + 3*b", "variables": ["a", "b"]})
+
+
+def test_linearized_is_exact_for_a_linear_formula(linear):
+    result = linearized(linear, INPUTS)
+    assert result.value == pytest.approx(29.0)
+    assert result.std == pytest.approx(EXPECTED_STD)
+    assert result.sensitivities == pytest.approx({"a": 2.0, "b": 3.0})
+    assert sum(result.contributions.values()) == pytest.approx(1.0)
+
+
+def test_monte_carlo_agrees_with_linearized(linear):
+    estimate = linearized(linear, INPUTS)
+    result = monte_carlo(linear, INPUTS, samples=200_000, chunk_size=50_000, seed=7)
+    assert result.invalid == 0
+    assert result.mean == pytest.approx(estimate.value, rel=2e-3)
+    assert result.std == pytest.approx(estimate.std, rel=1e-2)
+    assert result.counts.sum() == result.samples
+
+
+def test_fixed_inputs_have_no_spread(linear):
+    result = linearized(linear, {"a": 1.0, "b": 2.0})
+    assert (result.value, result.std) == (8.0, 0.0)
@@ -0,0 +1,33 @@
+"""Unit expression parsing: factors, the ``/`` grammar and dimension checks."""
+import math
+
+import pytest
+
+from hub_core.units import convert_units, parse_unit, unit_factor, validate_unit_tables
+
+
+def test_compound_factors():
+    assert math.isclose(unit_factor("km/h", "m/s"), 1 / 3.6)
+    assert unit_factor("kg·m/s²", "N") == pytest.approx(1.0)
+    assert convert_units(1.0, "psi", "Pa") == pytest.approx(6894.757293168)
+    assert unit_factor("W/m²·K", "Btu/(ft²·h·°F)") == pytest.approx(0.17611018, rel=1e-6)
+
+
+def test_slash_divides_by_the_whole_product():
+    assert parse_unit("W/m·K").dimension is parse_unit("W/(m·K)").dimension
+
+
+@pytest.mark.parametrize("source, target", [("m", "s"), ("J", "W"), ("Pa", "N")])
+def test_dimension_mismatch_raises(source, target):
+    with pytest.raises(ValueError, match="Cannot convert"):
+        unit_factor(source, target)
+
+
+@pytest.mark.parametrize("text", ["furlong", "m//s"])
+def test_bad_expressions_raise(text):
+    with pytest.raises(ValueError):
+        parse_unit(text)
+
+
+def test_table_factors_match_the_parser():
+    assert validate_unit_tables() == []
@@ -0,0 +1,28 @@
+"""Worksheet ordering over long chains of linked nodes."""
+import sys
+
+from hub_core.worksheet import Link, Worksheet, WorksheetNode
+
+
+def chain(length):
+    """A worksheet of ``length`` nodes, each reading the next one's output, added sinks first."""
+    worksheet = Worksheet()
+    for index in range(length):
+        inputs = {"x": Link(f"n{index + 1}")} if index + 1 < length else {"x": 1.0}
+        worksheet.nodes[f"n{index}"] = WorksheetNode(f"n{index}", "d", "s", "Laws", "f", "y", inputs)
+    return worksheet
+
+
+def test_order_handles_chains_past_the_recursion_limit():
+    length = sys.getrecursionlimit() * 3
+    order = chain(length).order()
+    assert order == [f"n{index}" for index in reversed(range(length))]
+
+
+def test_order_puts_sources_before_readers():
+    worksheet = chain(4)
+    worksheet.nodes["m"] = WorksheetNode("m", "d", "s", "Laws", "f", "y", {"a": Link("n3"), "b": Link("n0")})
+    order = worksheet.order()
+    assert sorted(order) == sorted(worksheet.nodes)
+    assert order.index("m") > order.index("n0")
+    assert worksheet._readers["n0"] == ["m"]